@@ -0,0 +1,85 @@
+##
+# alias.py
+# Date: 18/10/2026
+# Author: Ryan Gordon
+# Contains weighted random choice in constant time for the dental RPG
+
+import random
+
+
+class AliasTable:
+    """
+    Chooses items at random in proportion to their weights.
+
+    Built once with Vose's alias method, so each choice afterwards takes one
+    random number and a lookup however many items there are. Tables whose
+    weights are all equal choose with rng.choice(), so the same seed makes
+    the same choices as choosing from a list.
+    """
+
+    __slots__ = ("items", "weights", "probability", "alias", "uniform")
+
+    def __init__(self, items, weights=None):
+        """
+        param items (sequence): the items to choose from.
+        param weights (sequence): how likely each item is relative to the
+            others, all equally likely if not specified.
+        """
+        self.items = tuple(items)
+        if not self.items:
+            raise ValueError("nothing to choose from")
+        if weights is None:
+            weights = (1,) * len(self.items)
+        if len(weights) != len(self.items) or min(weights) <= 0:
+            raise ValueError("every item needs a weight above 0")
+        self.weights = tuple(weights)
+        self.uniform = len(set(self.weights)) == 1
+
+        # Each column holds one item with the given probability, topped up
+        # with its alias so every column is full
+        count, total = len(self.items), sum(self.weights)
+        scaled = [weight * count / total for weight in self.weights]
+        self.probability, self.alias = [1.0] * count, list(range(count))
+        small = [index for index in range(count) if scaled[index] < 1]
+        large = [index for index in range(count) if scaled[index] >= 1]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.probability[less], self.alias[less] = scaled[less], more
+            scaled[more] += scaled[less] - 1
+            (small if scaled[more] < 1 else large).append(more)
+        # Whatever is left is full up to rounding errors
+
+    def __len__(self):
+        return len(self.items)
+
+    def draw(self, rng=random):
+        """
+        Chooses an item.
+
+        param rng (random.Random): source of the random choice.
+        """
+        if self.uniform:
+            return rng.choice(self.items)
+        column = rng.random() * len(self.items)
+        index = int(column)
+        if column - index >= self.probability[index]:
+            index = self.alias[index]
+        return self.items[index]
+
+    def draw_indices(self, generator, size):
+        """
+        Chooses many items at once.
+
+        param generator (numpy.random.Generator): source of the choices.
+        param size (int): number of items to choose.
+
+        return (array): the index in items of each item chosen.
+        """
+        # Only imported here, nothing else in a battle needs it
+        import numpy as np
+        if self.uniform:
+            return generator.integers(len(self.items), size=size)
+        column = generator.random(size) * len(self.items)
+        index = column.astype(np.int64)
+        return np.where(column - index < np.asarray(self.probability)[index],
+                        index, np.asarray(self.alias)[index])
@@ -4,17 +4,20 @@
 # Author: Ryan Gordon
 # Contains functions used to play out a battle for the dental hygiene RPG
 
-import random
-from math import ceil
-from time import sleep
 from opponent import Opponent
 from boss import Boss
-from print_options import print_slow, print_red
-from constants import STRENGTHS, BATTLE_END_MESSAGES, BASE_DAMAGE as BASE, \
-     WEAKNESSES, ATTACK_MESSAGES, RANDOM_EVENTS
+from print_options import print_slow, print_red, print_line, pause
+from battle_functions import EVENT_MESSAGES
+from tracing import get_tracer, span, traced
+from policy import get_enemy_policy, get_hint, finisher_policy
+from engine import BattleContext, fight, EVENT, TURN, CHOOSE, ATTACK, DAMAGE
+from text import battle_end_message, attack_message
+from content import NEUTRAL, EFFECTIVE, WEAK
 
 
-def battle(plr, lvl=None, strt=None, msg=None, end=None, nam=False, bos=False):
+@traced("battle")
+async def battle(plr, lvl=None, strt=None, msg=None, end=None, nam=False,
+                 bos=False, rng=None, log=None):
     """
     Plays out a battle between the user and a computer opponent.
 
@@ -26,160 +29,91 @@ def battle(plr, lvl=None, strt=None, msg=None, end=None, nam=False, bos=False):
     param end (list): message printed after the battle if the user wins.
     param nam (bool): returns the name of the enemy if set to True.
     param bos (str): if set, fight a boss with the specified name.
+    param rng (random.Random): source of every random choice in the battle,
+        the user's if not specified.
+    param log (LogWriter): if set, the battle is recorded to it.
 
     return name (str): name of the defeated enemy (only if requested).
     """
-    # Variables used in random events are declared global
-    global user, enemy, turn
     # Set up user, enemy and print starting message if applicable
     user = plr
+    if rng is None:
+        rng = user.rng
     if not bos:
-        enemy, random_events = Opponent(lvl), RANDOM_EVENTS
+        enemy = Opponent(lvl, rng=rng)
     else:
-        enemy = Boss(bos)
-        random_events = RANDOM_EVENTS + enemy.start_events
+        enemy = Boss(bos, rng)
+    enemy.encounter_message()
     if strt is None:
-        turn = random.choice(["user", "computer"])
+        turn = rng.choice(["user", "computer"])
     else:
         turn = strt
     if msg is not None:
         print_slow(f"\nThe {enemy.name} is saying something...")
-        print()
+        print_line()
         for line in msg:
             print_slow(line[0], line[1])
-        sleep(2)
-    random_event = False
-    # Loop until one or the other of the combatants is defeated
-    while enemy.get_status() and user.get_status():
-        # If a random event takes place, print the event and apply its effect
-        if random_event:
-            print("\n--EVENT--")
-            sleep(1)
-            random.choice(random_events)(user, enemy, turn)
-            print("---------")
-        print(f"\nEnemy health: {enemy.health}")
-        # Print user health in red if it's low
-        if user.health < 10 or (user.health < 15 and bos):
-            print_red(f"Your health: {user.health}\n")
-        else:
-            print(f"Your health: {user.health}\n")
-        if turn == "user":
-            # User turn
-            print_slow("Your turn...", '\n\n')
-            attack = user.get_attack(enemy.name)
-            print_slow(ATTACK_MESSAGES[attack])
-            # Determine relative effectiveness and with it damage
-            if attack in enemy.weaknesses:
-                # If the attack is effective against the enemy
-                base = ceil(BASE * 1.5) + user.extra_damage
-                damage = random.randint(base - 1, base + 4)
-                damage = ceil(damage / user.damage_adjust) - enemy.defence
-                damage = 0 if damage < 0 else damage
-                # 10% chance for critical if sensible attack
-                critical = random.randint(0, 100) > 90
-                if damage == 0:
-                    print_slow("\nMissed!")
-                elif critical:
-                    damage *= 2
-                    print_slow(f"""
-CRITICAL [{damage} damage]!""")
-                else:
-                    print_slow(f"""
-It's super effective [{damage} damage]!""")
-            elif attack in enemy.strengths:
-                # If the attack is weak against the enemy
-                base = ceil(BASE / 1.5) + user.extra_damage
-                damage = random.randint(base - 4, base + 1)
-                damage = ceil(damage / user.damage_adjust) - enemy.defence
-                damage = 0 if damage < 0 else damage
-                if damage == 0:
-                    print_slow("\nMissed!")
-                else:
-                    print_slow(f"""
-It isn't very effective [{damage} damage]... maybe not the right attack..?""")
+        pause(2)
+    # The engine plays out the battle, each of its events is printed here
+    if log is not None:
+        log.start(user, enemy)
+    ctx = BattleContext(user, enemy, turn, rng=rng,
+                        enemy_policy=get_enemy_policy(),
+                        schedule=enemy.schedule)
+    events = fight(ctx)
+    tracer = get_tracer()
+    if tracer is not None:
+        events = trace_turns(events, tracer)
+    reply = None
+    while True:
+        try:
+            event = events.send(reply)
+        except StopIteration as finished:
+            if log is not None:
+                log.end(user.get_status(), finished.value)
+            break
+        reply = None
+        if log is not None:
+            log.event(event)
+        if event[0] == EVENT:
+            print_line("\n--EVENT--")
+            pause(1)
+            with span(f"event:{event[1].__name__}"):
+                EVENT_MESSAGES[event[1]](event[2], ctx)
+            print_line("---------")
+        elif event[0] == TURN:
+            print_line(f"\nEnemy health: {enemy.health}")
+            # Print user health in red if it's low
+            if user.health < 10 or (user.health < 15 and bos):
+                print_red(f"Your health: {user.health}\n")
             else:
-                # If the enemy is neutral to the attack
-                base = BASE + user.extra_damage
-                damage = random.randint(base - 2, base + 2)
-                damage = ceil(damage / user.damage_adjust) - enemy.defence
-                damage = 0 if damage < 0 else damage
-                if damage == 0:
-                    print_slow("\nMissed!")
-                else:
-                    print_slow(f"""
-The {enemy.name} manages to shake it off [{damage} damage]. Hmmm...""")
-            enemy.take_damage(damage)
-            # Reset temporary effects from random events
-            user.uncompromise_all_attacks()
-            user.reset_damage_adjust()
-            # Add any boss specific random events that have to occur later
-            if bos:
-                # The set avoids duplicates
-                random_events = set(random_events)
-                random_events.update(enemy.later_events)
-                random_events = list(random_events)
-        else:
-            # Opponent turn
-            print_slow(f"{enemy.name}'s turn...")
-            attack = enemy.get_attack()
-            print_slow(f"\n{enemy.name} uses ", '')
-            print_slow(attack + ".")
-            print_slow(ATTACK_MESSAGES[attack])
-            # Determine relative effectiveness and with it damage
-            effect = user.affected_by[attack]
-            if effect is None:
-                # If user is neutral to the attack
-                base = BASE + enemy.extra_damage
-                damage = random.randint(base - 2, base + 2)
-                damage = ceil(damage / enemy.damage_adjust) - user.defence
-                damage = 0 if damage < 0 else damage
-                if damage == 0:
-                    print_slow("\nMissed!")
-                else:
-                    print_slow(f"""
-You manage to shake it off [{damage} damage].""")
-            elif effect is True:
-                # If the attack is effective against the user
-                base = ceil(BASE * 1.5) + enemy.extra_damage
-                damage = random.randint(base - 1, base + 4)
-                damage = ceil(damage / enemy.damage_adjust) - user.defence
-                damage = 0 if damage < 0 else damage
-                if damage == 0:
-                    print_slow("\nMissed!")
-                else:
-                    print_slow(f"""
-It's super effective [{damage} damage]! Ouch ouch ouch...""")
+                print_line(f"Your health: {user.health}\n")
+            if event[1] == "user":
+                print_slow("Your turn...", '\n\n')
             else:
-                # If the attack is weak against the user
-                base = ceil(BASE / 1.5) + enemy.extra_damage
-                damage = random.randint(base - 4, base + 1)
-                damage = ceil(damage / enemy.damage_adjust) - user.defence
-                damage = 0 if damage < 0 else damage
-                if damage == 0:
-                    print_slow("\nMissed!")
-                else:
-                    print_slow(f"""
-It isn't very effective [{damage} damage]. Take that, {enemy.name}!""")
-            user.take_damage(damage)
-            # Reset temporary effects from random events
-            enemy.reset_damage_adjust()
-        # Alternate the attacks and check for random event next round
-        turn = "user" if turn == "computer" else "computer"
-        if not bos:
-            random_event = random.randint(0, 100) > 60
-        else:
-            random_event = random.randint(0, 100) > 40
+                print_slow(f"{enemy.name}'s turn...")
+        elif event[0] == CHOOSE:
+            # Users who run out of time play the attack a bot would
+            reply = await user.get_attack(enemy.name, get_hint(ctx),
+                                          lambda: finisher_policy(ctx))
+        elif event[0] == ATTACK:
+            if event[1] == "computer":
+                print_slow(f"\n{enemy.name} uses ", '')
+                print_slow(event[2] + ".")
+            print_slow(attack_message(event[2]))
+        elif event[0] == DAMAGE:
+            print_damage(enemy, *event[1:])
     # Print success/death message
-    print()
+    print_line()
     if user.get_status():
         print_slow("Victory!")
         if not bos:
-            print_slow(BATTLE_END_MESSAGES[enemy.name])
+            print_slow(battle_end_message(enemy.name))
         else:
-            print()
+            print_line()
             enemy.death_message()
         if end is not None:
-            print()
+            print_line()
             for line in end:
                 print_slow(line[0], line[1])
         user.heal_full()
@@ -190,3 +124,58 @@ thoroughly cleaning your teeth (restoration to max health).""")
         print_slow("You died...")
     if nam:
         return enemy.name
+
+
+def trace_turns(events, tracer):
+    """
+    Passes on the events of a battle, timing the engine and each turn.
+
+    Time spent working out each event is recorded as the engine, and each
+    turn runs from one TURN event to the next.
+    """
+    reply, turn = None, None
+    try:
+        while True:
+            token = tracer.start("engine")
+            try:
+                event = events.send(reply)
+            except StopIteration as finished:
+                return finished.value
+            finally:
+                tracer.stop(token)
+            if event[0] == TURN:
+                if turn is not None:
+                    tracer.stop(turn)
+                turn = tracer.start("turn")
+            reply = yield event
+    finally:
+        if turn is not None:
+            tracer.stop(turn)
+
+
+def print_damage(enemy, turn, effect, damage, critical):
+    """Prints the outcome of an attack by either the user or the opponent."""
+    if damage == 0:
+        print_slow("\nMissed!")
+    elif turn == "user":
+        if critical:
+            print_slow(f"""
+CRITICAL [{damage} damage]!""")
+        elif effect == EFFECTIVE:
+            print_slow(f"""
+It's super effective [{damage} damage]!""")
+        elif effect == WEAK:
+            print_slow(f"""
+It isn't very effective [{damage} damage]... maybe not the right attack..?""")
+        else:
+            print_slow(f"""
+The {enemy.name} manages to shake it off [{damage} damage]. Hmmm...""")
+    elif effect == NEUTRAL:
+        print_slow(f"""
+You manage to shake it off [{damage} damage].""")
+    elif effect == EFFECTIVE:
+        print_slow(f"""
+It's super effective [{damage} damage]! Ouch ouch ouch...""")
+    else:
+        print_slow(f"""
+It isn't very effective [{damage} damage]. Take that, {enemy.name}!""")
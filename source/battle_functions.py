@@ -4,75 +4,93 @@
 # Author: Ryan Gordon
 # Contains functions used during the battle sequence
 
-import random
-from time import sleep
-from print_options import print_slow
+from print_options import print_slow, print_line, pause
 
 
-def evolve_monster(user, enemy, turn):
+def evolve_monster(ctx):
     """
-    Adds an attack to the monsters arsenal and prints context.
+    Adds an attack to the monsters arsenal.
 
-    Random event.
+    Random event, returns the added attack (False if none was added).
     """
-    attack = enemy.evolve()
-    print_slow(f"Something's happening to the {enemy.name}... ", '')
+    return ctx.enemy.evolve()
+
+
+def evolve_monster_message(attack, ctx):
+    """Prints context for the evolve monster random event."""
+    print_slow(f"Something's happening to the {ctx.enemy.name}... ", '')
     print_slow("it appears to be evolving!")
-    print()
+    print_line()
     if attack:
         print_slow(f"It's developed another attack: {attack}...")
     else:
         print_slow("The incoming attack looks deadlier to your trained eye...")
-    sleep(2)
+    pause(2)
 
 
-def compromise_attack(user, enemy, turn):
+def compromise_attack(ctx):
     """
-    Compromises a users attack and prints context.
+    Compromises a users attack.
 
-    Random event.
+    Random event, returns the compromised attack.
     """
-    attack = user.compromise()
+    return ctx.user.compromise()
+
+
+def compromise_attack_message(attack, ctx):
+    """Prints context for the compromise attack random event."""
     print_slow(f"Plaque have taken down your {attack}!")
-    print()
+    print_line()
     print_slow("You quickly cleanse it - should be working again next time...")
-    sleep(2)
+    pause(2)
 
 
-def find_toothbrush(user, enemy, turn):
+def find_toothbrush(ctx):
     """
-    Heals user slightly and prints context.
+    Heals user slightly, increases attack damage instead if at max health.
 
-    Random event.
+    Random event, returns the amount healed (None if at max health).
     """
-    amount = user.heal(random.randint(5, 8))
+    amount = ctx.user.heal(ctx.rng.randint(5, 8))
+    if amount is None:
+        ctx.user.increase_attack_damage(1)
+    return amount
+
+
+def find_toothbrush_message(amount, ctx):
+    """Prints context for the find toothbrush random event."""
     print_slow("There's something in your pocket... ", '')
     print_slow("it's a manual toothbrush!")
     if amount is not None:
         print_slow(f"\nYou give your teeth a quick clean (healed {amount}hp).")
     else:
-        user.increase_attack_damage(1)
         print_slow("""
 You're feeling stronger than ever after giving your teeth a quick clean (attack
 damage increased by 1).""")
-    sleep(2)
+    pause(2)
 
 
-def gust(user, enemy, turn):
+def gust(ctx):
     """
     Reduce damage for the next attack by half.
 
     Random event.
     """
-    if turn == "user":
-        user.adjust_damage(1)
+    if ctx.turn == "user":
+        ctx.user.adjust_damage(1)
+    else:
+        ctx.enemy.adjust_damage(1)
+
+
+def gust_message(outcome, ctx):
+    """Prints context for the gust random event."""
+    if ctx.turn == "user":
         print_slow("A gust of wind buffets you around!")
         print_slow("\nDamage of your next attack reduced by half...")
     else:
-        enemy.adjust_damage(1)
-        print_slow(f"A gust of wind buffets the {enemy.name} around!")
+        print_slow(f"A gust of wind buffets the {ctx.enemy.name} around!")
         print_slow("\nDamage of their next attack reduced by half...")
-    sleep(2)
+    pause(2)
 
 
 def coke_start():
@@ -93,14 +111,19 @@ def coke_end():
     print_slow("\n'I...' *blerrr*")
 
 
-def fizz(user, enemy, turn):
+def fizz(ctx):
     """
     Permanently decreases user attack damage by 1.
 
-    Coke boss specific random event.
+    Coke boss specific random event, returns False if the damage of the next
+    attack was halved instead.
     """
+    return ctx.user.decrease_attack_damage(1)
+
+
+def fizz_message(decreased, ctx):
+    """Prints context for the fizz random event."""
     print_slow("A pressure build-up has caused coke to spray everywhere!")
-    decreased = user.decrease_attack_damage(1)
     if decreased:
         print_slow("""
 You can feel it affecting you... (attack damage decreased by 1).""")
@@ -108,37 +131,61 @@ You can feel it affecting you... (attack damage decreased by 1).""")
         print_slow("""
 Your movements become sluggish while confronted by all the coke (damage of your
 next attack reduced by half).""")
-    sleep(2)
+    pause(2)
 
 
-def pressure_release(user, enemy, turn):
+def pressure_release(ctx):
     """
     Permanently decreases coke attack damage by 1.
 
-    Coke boss specific random event.
+    Coke boss specific random event, returns False if the damage of the next
+    attack was halved instead.
     """
+    return ctx.enemy.decrease_attack_damage(1)
+
+
+def pressure_release_message(decreased, ctx):
+    """Prints context for the pressure release random event."""
     print_slow("Your last attack was even more successful than you thought!")
-    decreased = enemy.decrease_attack_damage(1)
     if decreased:
         print_slow("""
 It released some pressure from the bottle (enemy damage decreased by 1).""")
     else:
         print_slow("\nYou stunned your opponent! ", '')
         print_slow("Damage of their next attack significantly reduced!")
-    sleep(2)
+    pause(2)
 
 
-def dissolve_weapon(user, enemy, turn):
+def dissolve_weapon(ctx):
     """
     Permanently removes one of the users weapons (determined randomly).
 
-    Coke boss specific random event.
+    Coke boss specific random event, returns the removed weapon (False if the
+    user only has one).
     """
+    return ctx.user.delete_attack()
+
+
+def dissolve_weapon_message(weapon, ctx):
+    """Prints context for the dissolve weapon random event."""
     print_slow("The coke has gotten onto your weapons...")
-    weapon = user.delete_attack()
     if weapon:
         print_slow(f"\nIt's dissolved your {weapon}!")
     else:
         print_slow(f"""
-Nooo! Not your {user.attacks[0]} too! You frantically wipe it down...""")
-    sleep(2)
+Nooo! Not your {ctx.user.attacks[0]} too! You frantically wipe it down...""")
+    pause(2)
+
+
+# Messages printed after each random event has taken place
+EVENT_MESSAGES = {evolve_monster: evolve_monster_message,
+                  compromise_attack: compromise_attack_message,
+                  find_toothbrush: find_toothbrush_message,
+                  gust: gust_message,
+                  fizz: fizz_message,
+                  pressure_release: pressure_release_message,
+                  dissolve_weapon: dissolve_weapon_message}
+
+# Messages bosses can be given in content packs, the first printed on meeting
+# them and the second after defeating them
+BOSS_MESSAGES = (coke_start, coke_end)
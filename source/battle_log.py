@@ -0,0 +1,164 @@
+##
+# battle_log.py
+# Date: 18/10/2026
+# Author: Ryan Gordon
+# Contains a compact binary format for storing battle events
+
+import struct
+from engine import EVENT, TURN, ATTACK, DAMAGE, HEALTH
+from constants import ATTACK_IDS, MONSTER_IDS, EVENT_IDS
+
+# Written at the start of every log file, the last byte is the version
+MAGIC = b"DHRL\x01"
+
+# Every record is: kind, side, code, flag, value, other value
+RECORD = struct.Struct("<BBBBhh")
+
+# Kinds of record, the engine events followed by the start and end of battles
+KINDS = (EVENT, TURN, ATTACK, DAMAGE, HEALTH, "start", "end")
+KIND_IDS = {kind: number for number, kind in enumerate(KINDS)}
+SIDES = ("user", "computer")
+
+# Reverse lookups for decoding
+ATTACKS = tuple(ATTACK_IDS)
+MONSTERS = tuple(MONSTER_IDS)
+EVENTS = tuple(EVENT_IDS)
+
+# How the outcome of a random event is stored in the flag of its record
+OUTCOME_NONE, OUTCOME_FALSE, OUTCOME_TRUE, OUTCOME_NUMBER, OUTCOME_ATTACK = \
+    range(5)
+
+
+def encode_outcome(outcome):
+    """Returns the flag and value a random event outcome is stored as."""
+    if outcome is None:
+        return OUTCOME_NONE, 0
+    elif outcome is False:
+        return OUTCOME_FALSE, 0
+    elif outcome is True:
+        return OUTCOME_TRUE, 0
+    elif isinstance(outcome, str):
+        return OUTCOME_ATTACK, ATTACK_IDS[outcome]
+    return OUTCOME_NUMBER, outcome
+
+
+def decode_outcome(flag, value):
+    """Returns the random event outcome stored as the flag and value."""
+    if flag == OUTCOME_ATTACK:
+        return ATTACKS[value]
+    elif flag == OUTCOME_NUMBER:
+        return value
+    return (None, False, True)[flag]
+
+
+def encode(event):
+    """
+    Packs an event yielded by engine.fight() into a record.
+
+    return (bytes): the record, empty for events that aren't stored.
+    """
+    kind = event[0]
+    if kind == EVENT:
+        flag, value = encode_outcome(event[2])
+        fields = (SIDES.index(event[3]), EVENT_IDS[event[1]], flag, value, 0)
+    elif kind == TURN:
+        fields = (SIDES.index(event[1]), 0, 0, 0, 0)
+    elif kind == ATTACK:
+        fields = (SIDES.index(event[1]), ATTACK_IDS[event[2]], 0, 0, 0)
+    elif kind == DAMAGE:
+        fields = (SIDES.index(event[1]), event[2], event[4], event[3], 0)
+    elif kind == HEALTH:
+        fields = (0, 0, 0, event[1], event[2])
+    else:
+        return b""
+    return RECORD.pack(KIND_IDS[kind], *fields)
+
+
+def decode(record):
+    """
+    Unpacks a record into the event it was encoded from.
+
+    Start records decode to ("start", enemy name, user health, enemy health)
+    and end records to ("end", won, turns).
+    """
+    kind, side, code, flag, value, other = record
+    kind = KINDS[kind]
+    if kind == EVENT:
+        return kind, EVENTS[code], decode_outcome(flag, value), SIDES[side]
+    elif kind == TURN:
+        return kind, SIDES[side]
+    elif kind == ATTACK:
+        return kind, SIDES[side], ATTACKS[code]
+    elif kind == DAMAGE:
+        return kind, SIDES[side], code, value, bool(flag)
+    elif kind == HEALTH:
+        return kind, value, other
+    elif kind == "start":
+        return kind, MONSTERS[code], value, other
+    return kind, bool(flag), value
+
+
+class LogWriter:
+    """Writes battles to a binary log file."""
+
+    def __init__(self, stream, header=True):
+        """
+        param stream (file): binary file the log is written to.
+        param header (bool): writes the file header straight away if set,
+            leave unset when writing part of a log to be joined up later.
+        """
+        self.stream = stream
+        if header:
+            self.stream.write(MAGIC)
+
+    def start(self, user, enemy):
+        """Records the start of a battle."""
+        self.stream.write(RECORD.pack(KIND_IDS["start"], 0, enemy.id, 0,
+                                      user.health, enemy.health))
+
+    def event(self, event):
+        """Records an event yielded by engine.fight()."""
+        self.stream.write(encode(event))
+
+    def end(self, won, turns):
+        """Records the end of a battle."""
+        self.stream.write(RECORD.pack(KIND_IDS["end"], 0, 0, won, turns, 0))
+
+    def events(self, events):
+        """Records many events yielded by engine.fight() at once."""
+        self.stream.write(b"".join(encode(event) for event in events))
+
+
+def read_log(stream, chunk_records=4096):
+    """
+    Lazily yields every event stored in a binary log file.
+
+    Only a chunk of the file is held in memory at a time.
+
+    param stream (file): binary file the log is read from.
+    param chunk_records (int): number of records read at a time.
+    """
+    if stream.read(len(MAGIC)) != MAGIC:
+        raise ValueError("not a battle log (or an unsupported version)")
+    while True:
+        chunk = stream.read(RECORD.size * chunk_records)
+        if len(chunk) % RECORD.size:
+            raise ValueError("battle log is truncated")
+        if not chunk:
+            break
+        for record in RECORD.iter_unpack(chunk):
+            yield decode(record)
+
+
+def read_battles(stream):
+    """
+    Lazily yields the events of each battle in a log file as a list.
+
+    The first event of each list is its start record, the last its end record.
+    """
+    battle = []
+    for event in read_log(stream):
+        battle.append(event)
+        if event[0] == "end":
+            yield battle
+            battle = []
@@ -0,0 +1,167 @@
+##
+# benchmark.py
+# Date: 18/10/2026
+# Author: Ryan Gordon
+# Times the hot paths of the dental RPG and compares them with a baseline
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import sys
+import timeit
+from statistics import median
+from battle import battle
+from engine import resolve
+from player import Player
+from opponent import Opponent
+from boss import Boss
+from print_options import print_slow, set_sink, set_render_mode, NullSink
+from input_options import set_input_provider, PolicyInput
+from constants import STAGES, BOSSES, RANDOM_EVENTS
+
+# Stats used for every scripted character
+STATS = {"self discipline": "good", "agility": "meh", "teeth strength": "bad"}
+
+# A typical line of story text
+LINE = ("The mist stirs ahead of you... and suddenly you can see it - the "
+        "famed door! Your heartrate increases as you knock on it...")
+
+
+def repeated(function, times):
+    """
+    Returns a benchmark calling a function the given number of times.
+
+    The random number generator is reseeded first, so every call of the
+    benchmark does exactly the same work.
+    """
+    def benchmark():
+        RNG.seed(0)
+        for _ in range(times):
+            function()
+    return benchmark, times
+
+
+# Every random choice in the benchmarks, reseeded before each call
+RNG = random.Random(0)
+
+
+def benchmarks():
+    """
+    Returns every benchmark by name.
+
+    return (dict): for each benchmark, a function taking no arguments and
+        the number of operations it does per call.
+    """
+    loop = asyncio.new_event_loop()
+    # Battles are played with the answers chosen at random
+    set_input_provider(PolicyInput(lambda prompt: str(RNG.randint(1, 4))))
+    cases = {}
+    for stage in STAGES:
+        cases[f"opponent_stage_{stage}"] = repeated(
+            lambda stage=stage: Opponent(stage, rng=RNG), 100)
+    for name in BOSSES:
+        cases[f"boss_{name.lower().replace(' ', '_')}"] = repeated(
+            lambda name=name: Boss(name, RNG), 100)
+    cases["player"] = repeated(lambda: Player("Bench", STATS, RNG), 100)
+    for stage in STAGES:
+        cases[f"battle_stage_{stage}"] = repeated(
+            lambda stage=stage: loop.run_until_complete(
+                battle(Player("Bench", STATS, RNG), lvl=stage, rng=RNG)), 50)
+        cases[f"resolve_stage_{stage}"] = repeated(
+            lambda stage=stage: resolve(
+                Player("Bench", STATS, RNG), Opponent(stage, rng=RNG),
+                random_events=RANDOM_EVENTS, rng=RNG), 50)
+    cases["print_slow_instant"] = repeated(lambda: print_slow(LINE), 100)
+    return cases
+
+
+def run(names=None, repeat=5, min_time=0.2):
+    """
+    Runs the benchmarks with game text thrown away and rendered instantly.
+
+    The benchmarks take turns within each repeat, so anything else slowing
+    the machine down for a while affects them all alike.
+
+    param names (str): only benchmarks with this in their name are run if
+        set.
+    param repeat (int): number of times each benchmark is timed.
+    param min_time (float): the number of calls per repeat is chosen so
+        each repeat takes at least this many seconds.
+
+    return (dict): for each benchmark, the fastest and median time per
+        operation in microseconds and the number of calls per repeat.
+    """
+    set_sink(NullSink())
+    set_render_mode("instant")
+    timers = {}
+    for name, (function, ops) in benchmarks().items():
+        if names is None or names in name:
+            timer = timeit.Timer(function)
+            loops, _ = timer.autorange()
+            timers[name] = (timer, max(1, int(loops * min_time / 0.2)), ops)
+    times = {name: [] for name in timers}
+    for _ in range(repeat):
+        for name, (timer, loops, ops) in timers.items():
+            times[name].append(timer.timeit(loops) / loops / ops * 1e6)
+    return {name: {"min": min(times[name]), "median": median(times[name]),
+                   "loops": timers[name][1]} for name in timers}
+
+
+def compare(results, baseline, threshold=0.1):
+    """
+    Prints each result next to the baseline.
+
+    param threshold (float): a benchmark is a regression if its fastest time
+        is slower than the baseline by more than this fraction.
+
+    return (list): names of the benchmarks that regressed.
+    """
+    regressions = []
+    print(f"{'benchmark':<28}{'baseline':>12}{'now':>12}{'change':>9}")
+    for name, result in results.items():
+        if name not in baseline:
+            print(f"{name:<28}{'-':>12}{result['min']:>12.2f}{'new':>9}")
+            continue
+        before = baseline[name]["min"]
+        change = result["min"] / before - 1
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = " !"
+        print(f"{name:<28}{before:>12.2f}{result['min']:>12.2f}"
+              f"{change:>+9.1%}{flag}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark the hot paths of the dental RPG.")
+    parser.add_argument("-k", metavar="NAME",
+                        help="only run benchmarks with this in their name")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2,
+                        help="minimum seconds per repeat")
+    parser.add_argument("--save", metavar="FILE",
+                        help="save the results as JSON")
+    parser.add_argument("--compare", metavar="FILE",
+                        help="compare with results saved earlier")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="slowdown counted as a regression (0.1 = 10%%)")
+    args = parser.parse_args()
+    results = run(args.k, args.repeat, args.min_time)
+    if args.save is not None:
+        with open(args.save, "w", encoding="utf-8") as output:
+            json.dump({"python": platform.python_version(),
+                       "machine": platform.machine(),
+                       "results": results}, output, indent=2)
+    if args.compare is not None:
+        with open(args.compare, encoding="utf-8") as saved:
+            baseline = json.load(saved)["results"]
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+    else:
+        print(f"{'benchmark':<28}{'min (us)':>12}{'median':>12}")
+        for name, result in results.items():
+            print(f"{name:<28}{result['min']:>12.2f}{result['median']:>12.2f}")
@@ -5,51 +5,96 @@
 # Contains the boss class for the dental RPG and relevant functions
 
 import random
-from constants import BOSSES, SPECIFIC_MOB_ATTACKS
+from constants import BOSS_SPAWNS, SPECIFIC_MOB_ATTACKS, \
+     MONSTER_TEMPLATES, ATTACK_IDS
 
 
 class Boss:
-    """Creates a boss object."""
+    """
+    Creates a boss object.
 
-    def __init__(self, name=None):
+    Everything shared by bosses of the same name is kept in a single
+    template, each boss only stores what can change during a battle.
+    """
+
+    __slots__ = ("template", "rng", "max_health", "health", "attacks",
+                 "extra_damage", "damage_adjust", "defence")
+
+    def __init__(self, name=None, rng=random):
         """
         Basic setup and variables for the boss.
 
         param name (str): if specified, determines the boss being faced,
             otherwise randomly chosen.
+        param rng (random.Random): source of every random choice the boss
+            makes.
         """
+        self.rng = rng
 
         # Determine boss based off name parameter, or randomly if nothing there
-        if name is not None:
-            self.name = name
-        else:
-            self.name = random.choice(BOSSES.keys())
+        if name is None:
+            name = BOSS_SPAWNS.draw(rng)
+        self.template = template = MONSTER_TEMPLATES[name]
 
         # Determine health with a random component
-        base_health = BOSSES[self.name][0]
-        self.max_health = random.randint(base_health - 5, base_health + 5)
+        base_health = template.health
+        self.max_health = rng.randint(base_health - 5, base_health + 5)
         self.health = self.max_health
 
-        # Determine available attacks, strengths, and weaknesses
-        self.attacks = list(BOSSES[self.name][3])
-        self.weaknesses = BOSSES[self.name][4]
-        self.strengths = BOSSES[self.name][5]
-
-        self.start_events = BOSSES[self.name][7]
-        self.later_events = BOSSES[self.name][8]
+        # Shared with the template until the boss evolves
+        self.attacks = template.attacks
 
-        self.extra_damage = 1
+        self.extra_damage = template.extra_damage
         self.damage_adjust = 1
-        self.defence = BOSSES[self.name][2]
-
-        self.level = BOSSES[self.name][1]
-
-        # Print encounter message
-        BOSSES[self.name][6][0]()
+        self.defence = template.defence
+
+    @property
+    def name(self):
+        """Name of the boss."""
+        return self.template.name
+
+    @property
+    def id(self):
+        """Monster ID of the boss."""
+        return self.template.id
+
+    @property
+    def level(self):
+        """Level of the boss."""
+        return self.template.level
+
+    @property
+    def schedule(self):
+        """Random events that can take place in battles with the boss."""
+        return self.template.schedule
+
+    @property
+    def weaknesses(self):
+        """User attacks that are effective against the boss."""
+        return self.template.weaknesses
+
+    @property
+    def strengths(self):
+        """User attacks that aren't very effective against the boss."""
+        return self.template.strengths
+
+    @property
+    def start_events(self):
+        """Boss specific random events that can occur from the start."""
+        return self.template.start_events
+
+    @property
+    def later_events(self):
+        """Boss specific random events added after the first user turn."""
+        return self.template.later_events
+
+    def effectiveness(self, attack):
+        """Returns the effectiveness class of a user attack."""
+        return self.template.effectiveness[ATTACK_IDS[attack]]
 
     def add_attack(self, attack):
         """Adds a new attack to the boss' arsenal."""
-        self.attacks.append(attack)
+        self.attacks += (attack,)
 
     def increase_attack_damage(self, amount):
         """Increases attack damage by specified amount."""
@@ -81,12 +126,12 @@ class Boss:
             available = list(SPECIFIC_MOB_ATTACKS.keys())
             for attack in self.attacks:
                 available.remove(attack)
-            self.add_attack(random.choice(available))
+            self.add_attack(self.rng.choice(available))
             return self.attacks[-1]
 
     def get_attack(self):
         """Chooses a random attack and returns it."""
-        return random.choice(self.attacks)
+        return self.rng.choice(self.attacks)
 
     def adjust_damage(self, amount):
         """Adjust boss damage by specified factor."""
@@ -123,6 +168,10 @@ class Boss:
         """Increases defence by specified amount."""
         self.defence += amount
 
+    def encounter_message(self):
+        """Prints dialogue when the user encounters the boss."""
+        self.template.messages[0]()
+
     def death_message(self):
         """Prints success dialogue if the user kills the boss."""
-        BOSSES[self.name][6][1]()
+        self.template.messages[1]()
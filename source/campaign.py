@@ -0,0 +1,259 @@
+##
+# campaign.py
+# Date: 18/10/2026
+# Author: Ryan Gordon
+# Simulates whole campaigns of the dental RPG headless, prologue to epilogue
+
+import json
+import random
+from collections import Counter
+from itertools import product
+from multiprocessing import Pool
+from engine import resolve, random_policy
+from policy import hard_enemy_policy, POLICIES
+from player import Player
+from opponent import Opponent
+from boss import Boss
+from simulate import stat_loadouts
+from constants import FOREST_ROUTES
+
+# The boss fought at the end of every campaign
+FINAL_BOSS = "Bottle of Coke"
+
+# Order the character stats are listed in summaries
+STAT_NAMES = ("self discipline", "agility", "teeth strength")
+
+# Items that can be found after the battle in the heart of the forest
+LOOT = ("toothpaste", "dental floss")
+
+# Last part of the story, a campaign reaching its end has been completed
+LAST_PART = 5
+
+
+def campaign_battle(user, rng, policy, enemy_policy=None, stage=None,
+                    turn=None, boss=None):
+    """
+    Plays out one battle of a campaign, as battle() does without the text.
+
+    param policy, enemy_policy (function): as for resolve().
+    param stage (int): stage of the opponent, if not fighting a boss.
+    param turn (str): who strikes first, chosen randomly if not specified.
+    param boss (str): if set, fight the boss with this name.
+
+    return (str, BattleResult): name of the enemy and how the battle went.
+    """
+    if boss is None:
+        enemy = Opponent(stage, rng=rng)
+    else:
+        enemy = Boss(boss, rng)
+    result = resolve(user, enemy, policy, turn, rng=rng,
+                     enemy_policy=enemy_policy, schedule=enemy.schedule)
+    if result.won:
+        user.heal_full()
+    return enemy.name, result
+
+
+def play_campaign(stats, route, local, seed, policy=random_policy,
+                  enemy_policy=None):
+    """
+    Plays a whole campaign headless.
+
+    The user is changed between battles exactly as in main.play(), and the
+    random choices are made in the same order.
+
+    param stats (dict): character stats of the user.
+    param route (str): route taken to the forest, one of FOREST_ROUTES.
+    param local (bool): whether the user goes over to the local in the
+        forest township, who gives them a scaler and a level.
+    param seed (int): seeds every random choice in the campaign.
+    param policy (function): chooses the user's attacks, as for resolve().
+    param enemy_policy (function): chooses the enemies' attacks, as for
+        resolve().
+
+    return (dict): summary of the campaign, ready to be saved as JSON. Part
+        is the part the user died in, or the last part if completed.
+    """
+    rng = random.Random(seed)
+    user = Player("Simulated", stats, rng)
+    summary = {"seed": seed, "stats": [stats[stat] for stat in STAT_NAMES],
+               "route": route, "local": local, "loot": None, "part": 2,
+               "completed": False, "battles": []}
+
+    def fight(**battle):
+        """Plays out a battle, returns whether the user won."""
+        name, result = campaign_battle(user, rng, policy, enemy_policy,
+                                       **battle)
+        summary["battles"].append([name, result.turns, result.won])
+        return result.won
+
+    # Part two, the user strikes first in the first battle
+    if not fight(stage=1, turn="user"):
+        return summary
+    user.increase_defence(2)
+
+    # Part three, the route taken only changes the story
+    summary["part"] = 3
+    if not fight(stage=1):
+        return summary
+    if local:
+        user.add_attack("scaler")
+        user.gain_level()
+    if not fight(stage=3):
+        return summary
+    summary["loot"] = rng.choice(list(LOOT))
+    user.add_attack(summary["loot"])
+
+    # Part four, the watchtower
+    summary["part"] = 4
+    if not fight(stage=4):
+        return summary
+    user.gain_level()
+
+    # Part five, the boss strikes first
+    summary["part"] = LAST_PART
+    if fight(turn="computer", boss=FINAL_BOSS):
+        summary["completed"] = True
+    return summary
+
+
+def choice_paths():
+    """
+    Returns every set of choices that changes how a campaign goes.
+
+    return (list): index into stat_loadouts(), route and whether the user
+        goes over to the local, for each path.
+    """
+    return list(product(range(len(stat_loadouts())), FOREST_ROUTES.values(),
+                        (True, False)))
+
+
+def run_shard(task):
+    """
+    Plays out a number of campaigns along one choice path.
+
+    Run in a worker process, each campaign is seeded from the shard seed so
+    the results are repeatable.
+
+    param task (tuple): index of the stats, route, whether the user goes
+        over to the local, number of campaigns, shard seed, name of the
+        policy the user plays with and whether enemies play on hard.
+
+    return (list): summary of each campaign.
+    """
+    loadout, route, local, count, seed, policy, hard = task
+    shard_rng, stats = random.Random(seed), stat_loadouts()[loadout]
+    enemy_policy = hard_enemy_policy if hard else None
+    return [play_campaign(stats, route, local, shard_rng.getrandbits(64),
+                          POLICIES[policy], enemy_policy)
+            for _ in range(count)]
+
+
+def simulate_campaigns(campaigns, seed=0, processes=None, shard_size=100,
+                       output=None, policy="random", hard=False):
+    """
+    Plays campaigns along every choice path across a pool of worker
+    processes.
+
+    param campaigns (int): number of campaigns per choice path.
+    param seed (int): base seed each shard seed is derived from.
+    param processes (int): number of worker processes, one per core if None.
+    param shard_size (int): number of campaigns given to a worker at a time.
+    param output (file): if set, the summary of every campaign is written to
+        it as a line of JSON as soon as it's done.
+    param policy (str): name of the policy the user plays with, one of
+        policy.POLICIES.
+    param hard (bool): whether enemies choose their attacks as on hard.
+
+    return (Counter): number of campaigns by route, whether the user went
+        over to the local, loot found, stats, the part reached and whether
+        they completed it.
+    """
+    tasks = []
+    for loadout, route, local in choice_paths():
+        for first in range(0, campaigns, shard_size):
+            shard_seed = f"{seed}:{loadout}:{route}:{local}:{first}"
+            tasks.append((loadout, route, local,
+                          min(shard_size, campaigns - first), shard_seed,
+                          policy, hard))
+    outcomes = Counter()
+    with Pool(processes) as pool:
+        for summaries in pool.imap_unordered(run_shard, tasks):
+            for summary in summaries:
+                if output is not None:
+                    output.write(json.dumps(summary, separators=(",", ":"))
+                                 + "\n")
+                outcomes[summary["route"], summary["local"],
+                         summary["loot"], tuple(summary["stats"]),
+                         summary["part"], summary["completed"]] += 1
+    return outcomes
+
+
+def branch_rates(outcomes, branch):
+    """
+    Adds up the outcomes of every campaign along each branch.
+
+    param outcomes (Counter): as returned by simulate_campaigns().
+    param branch (function): given the route, local, loot and stats of a
+        campaign, returns the branch it took.
+
+    return (dict): for each branch, number of campaigns, number completed
+        and the number that died in each part.
+    """
+    branches = {}
+    for (route, local, loot, stats, part, completed), count in \
+            outcomes.items():
+        totals = branches.setdefault(branch(route, local, loot, stats),
+                                     [0, 0, Counter()])
+        totals[0] += count
+        if completed:
+            totals[1] += count
+        else:
+            totals[2][part] += count
+    return branches
+
+
+def print_report(outcomes):
+    """Prints completion and death rates along each branch of the story."""
+    parts = range(2, LAST_PART + 1)
+    for title, branch in (
+            ("route, local, loot", lambda route, local, loot, stats: (
+                route, "local" if local else "ignored", loot or "-")),
+            ("stats", lambda route, local, loot, stats: stats)):
+        print(f"{title:<44}{'runs':>7}{'done %':>8}"
+              + "".join(f"{f'died {part}':>8}" for part in parts))
+        for key, (runs, completed, died) in sorted(
+                branch_rates(outcomes, branch).items()):
+            print(f"{', '.join(key):<44}{runs:>7}"
+                  f"{100 * completed / runs:>8.1f}"
+                  + "".join(f"{100 * died[part] / runs:>8.1f}"
+                            for part in parts))
+        print()
+
+
+if __name__ == "__main__":
+    # Only needed to run from the command line, not in worker processes
+    import argparse
+    parser = argparse.ArgumentParser(
+        description="Simulate whole campaigns of the dental RPG along every "
+                    "path of choices.")
+    parser.add_argument("-n", "--campaigns", type=int, default=100,
+                        help="campaigns per choice path")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--shard-size", type=int, default=100)
+    parser.add_argument("--output", metavar="FILE",
+                        help="write a JSON line summarising every campaign")
+    parser.add_argument("--policy", choices=POLICIES, default="random",
+                        help="how the user chooses attacks")
+    parser.add_argument("--hard", action="store_true",
+                        help="enemies choose their attacks as on hard")
+    args = parser.parse_args()
+    output = open(args.output, "w", encoding="utf-8") \
+        if args.output is not None else None
+    try:
+        print_report(simulate_campaigns(args.campaigns, args.seed,
+                                        args.processes, args.shard_size,
+                                        output, args.policy, args.hard))
+    finally:
+        if output is not None:
+            output.close()
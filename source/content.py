@@ -0,0 +1,391 @@
+##
+# content.py
+# Date: 18/10/2026
+# Author: Ryan Gordon
+# Loads the monsters, attacks and stages of the dental RPG from a content pack
+
+import hashlib
+import marshal
+import os
+import struct
+import sys
+from collections import namedtuple
+from functools import lru_cache
+from alias import AliasTable
+from events import EventSchedule
+import battle_functions as fn
+
+# The content pack the game ships with
+CONTENT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            "content.json")
+
+# Written at the start of every compiled pack, the last byte is the version
+MAGIC = b"DHRC\x04"
+
+# Modification time and size of the pack a compiled pack was made from
+SOURCE = struct.Struct("<qQ")
+
+# Effectiveness classes of an attack against its target
+NEUTRAL, EFFECTIVE, WEAK = 0, 1, 2
+
+# Everything that is the same for every monster of a kind, shared by all of
+# the opponents and bosses of that kind rather than copied into each one
+MonsterTemplate = namedtuple("MonsterTemplate", [
+    "id", "name", "health", "level", "defence", "extra_damage", "attacks",
+    "weaknesses", "strengths", "effectiveness", "messages", "start_events",
+    "later_events", "spawn_weight", "schedule"])
+
+# Sections of a content pack and the type of each
+PACK_FIELDS = {"mob attacks": list, "player attacks": list, "opponents": list,
+               "bosses": list, "stages": dict, "random events": list}
+
+# Optional sections of a content pack and their defaults, the chance is as
+# for EventSchedule and applies to battles with opponents. Attack effects are
+# how many mob attacks are effective and weak against each player, the rest
+# do the usual damage
+PACK_DEFAULTS = {"event chance": 60, "event weights": {},
+                 "attack effects": {"effective": 2, "weak": 2}}
+
+# Fields of each monster and their types, with the defaults of those that are
+# optional
+MONSTER_FIELDS = {"name": str, "health": int, "level": int, "defence": int,
+                  "extra damage": int, "spawn weight": int, "attacks": list,
+                  "weaknesses": list, "strengths": list}
+DEFAULTS = {"extra damage": 0, "spawn weight": 1, "event chance": 40}
+
+# Fields only bosses have
+BOSS_FIELDS = {"messages": list, "start events": list, "later events": list,
+               "event chance": int}
+
+# How each type is described when a field has the wrong one
+KINDS = {int: "a whole number", str: "text", list: "a list", dict: "an object"}
+
+# Names of the random events and boss messages content packs can use
+EVENT_NAMES = {event.__name__: event for event in fn.EVENT_MESSAGES}
+MESSAGE_NAMES = {message.__name__: message for message in fn.BOSS_MESSAGES}
+
+
+def check(condition, message):
+    """Raises ValueError with the message if the condition doesn't hold."""
+    if not condition:
+        raise ValueError(f"invalid content pack: {message}")
+
+
+def check_names(names, allowed, where):
+    """
+    Checks a list names nothing twice and only what's allowed.
+
+    return (tuple): the names.
+    """
+    for name in names:
+        check(name in allowed, f"{where} has unknown {name!r}")
+    check(len(set(names)) == len(names), f"{where} repeats a name")
+    return tuple(names)
+
+
+def check_monster(monster, boss, data):
+    """
+    Checks a monster of a content pack.
+
+    param monster (dict): the monster as read from the pack.
+    param boss (bool): whether the monster is a boss.
+    param data (dict): the rest of the pack.
+
+    return (dict): the monster, with lists made tuples and every field set.
+    """
+    fields = {**MONSTER_FIELDS, **BOSS_FIELDS} if boss else MONSTER_FIELDS
+    check(isinstance(monster, dict), "every monster must be an object")
+    where = repr(monster.get("name"))
+    for field in monster:
+        check(field in fields, f"{where} has unknown field {field!r}")
+    checked = {field: default for field, default in DEFAULTS.items()
+               if field in fields}
+    for field, kind in fields.items():
+        if field in monster:
+            # bool is a kind of int, but never meant as one here
+            check(type(monster[field]) is kind,
+                  f"{where} {field} must be {KINDS[kind]}")
+            checked[field] = monster[field]
+        else:
+            check(field in DEFAULTS, f"{where} is missing {field}")
+    check(checked["health"] > 0, f"{where} must have some health")
+    check(checked["level"] > 0, f"{where} level must be at least 1")
+    check(checked["defence"] >= 0 and checked["extra damage"] >= 0,
+          f"{where} defence and extra damage can't be negative")
+    check(checked["spawn weight"] > 0, f"{where} spawn weight must be above 0")
+
+    checked["attacks"] = check_names(checked["attacks"], data["mob attacks"],
+                                     f"{where} attacks")
+    check(checked["attacks"], f"{where} needs at least one attack")
+    for field in ("weaknesses", "strengths"):
+        checked[field] = check_names(checked[field], data["player attacks"],
+                                     f"{where} {field}")
+    check(not set(checked["weaknesses"]) & set(checked["strengths"]),
+          f"{where} can't be both weak and strong against an attack")
+    if boss:
+        checked["messages"] = check_names(checked["messages"],
+                                          MESSAGE_NAMES, f"{where} messages")
+        check(len(checked["messages"]) == 2,
+              f"{where} needs an encounter and a death message")
+        for field in ("start events", "later events"):
+            checked[field] = check_names(checked[field], EVENT_NAMES,
+                                         f"{where} {field}")
+    return checked
+
+
+def validate(data):
+    """
+    Checks everything a content pack refers to exists.
+
+    param data (dict): the content pack as read from JSON.
+
+    return (dict): the content pack, with stages numbered and lists made
+        tuples, as ContentPack takes it.
+
+    Raises ValueError describing the first problem found.
+    """
+    check(isinstance(data, dict), "must be a JSON object")
+    for section, kind in PACK_FIELDS.items():
+        check(type(data.get(section)) is kind,
+              f"{section} must be {KINDS[kind]}")
+    checked = {}
+    attacks = data["mob attacks"] + data["player attacks"]
+    check(all(isinstance(attack, str) for attack in attacks),
+          "attacks must be named")
+    for section in ("mob attacks", "player attacks"):
+        checked[section] = check_names(data[section], attacks, section)
+    check(len(set(attacks)) == len(attacks),
+          "an attack can't be both a mob and a player attack")
+
+    for section in ("opponents", "bosses"):
+        checked[section] = tuple(check_monster(monster, section == "bosses",
+                                               data)
+                                 for monster in data[section])
+    names = [monster["name"] for monster in
+             checked["opponents"] + checked["bosses"]]
+    check(len(set(names)) == len(names), "monster names must be unique")
+    check(checked["bosses"], "there must be at least one boss")
+
+    levels = {monster["level"] for monster in checked["opponents"]}
+    check(1 in levels, "the player's first attacks come from level 1 "
+          "opponents, so there must be one")
+    checked["stages"] = {}
+    for stage, stage_levels in data["stages"].items():
+        check(stage.isdigit() and int(stage) > 0,
+              f"stage {stage!r} must be a number from 1")
+        check(type(stage_levels) is list and stage_levels
+              and set(stage_levels) <= levels,
+              f"stage {stage} needs levels that opponents have")
+        checked["stages"][int(stage)] = tuple(stage_levels)
+    check(sorted(checked["stages"]) == list(range(1, len(data["stages"]) + 1)),
+          "stages must be numbered 1, 2, 3 and so on")
+    checked["random events"] = check_names(data["random events"],
+                                           EVENT_NAMES, "random events")
+
+    for section, default in PACK_DEFAULTS.items():
+        checked[section] = data.get(section, default)
+        check(type(checked[section]) is type(default),
+              f"{section} must be {KINDS[type(default)]}")
+    chances = [checked["event chance"]] + [boss["event chance"]
+                                           for boss in checked["bosses"]]
+    check(all(0 <= chance <= 100 for chance in chances),
+          "event chances must be from 0 to 100")
+    for event, weight in checked["event weights"].items():
+        check(event in EVENT_NAMES, f"event weights has unknown {event!r}")
+        check(type(weight) is int and weight > 0,
+              f"{event} weight must be a whole number above 0")
+    effects = checked["attack effects"]
+    check(set(effects) == {"effective", "weak"}
+          and all(type(count) is int and count >= 0
+                  for count in effects.values()),
+          "attack effects needs whole numbers of effective and weak attacks")
+    check(sum(effects.values()) <= len(checked["mob attacks"]),
+          "attack effects can't add up to more than the mob attacks")
+    return checked
+
+
+class ContentPack:
+    """
+    The monsters, attacks and stages of a content pack.
+
+    Lookups the game makes often are indexed once here: templates by name,
+    opponents by level and stage, and opponents by the attacks they use and
+    are weak or strong against. Spawn tables choose the opponent of each
+    stage and the boss by their spawn weights, and each template has the
+    schedule of random events for battles with it.
+    """
+
+    def __init__(self, data):
+        """param data (dict): a content pack checked by validate()."""
+        self.mob_attacks = data["mob attacks"]
+        self.player_attacks = data["player attacks"]
+        self.attack_ids = {attack: number for number, attack in enumerate(
+            self.mob_attacks + self.player_attacks)}
+        # Effect of each mob attack doled out to every player
+        effective, weak = (data["attack effects"]["effective"],
+                           data["attack effects"]["weak"])
+        self.available_effects = (True,) * effective + (None,) * (
+            len(self.mob_attacks) - effective - weak) + (False,) * weak
+
+        self.random_events = functions(data["random events"])
+        self.event_weights = {EVENT_NAMES[event]: weight for event, weight
+                              in data["event weights"].items()}
+        # Every battle with an opponent has the same random events
+        opponent_schedule = EventSchedule(self.random_events, (),
+                                          data["event chance"],
+                                          self.event_weights)
+
+        monsters = data["opponents"] + data["bosses"]
+        self.monster_ids = {monster["name"]: number
+                            for number, monster in enumerate(monsters)}
+        self.templates = {}
+        for number, monster in enumerate(monsters):
+            boss = "messages" in monster
+            if boss:
+                schedule = EventSchedule(
+                    self.random_events + functions(monster["start events"]),
+                    functions(monster["later events"]),
+                    monster["event chance"], self.event_weights)
+            else:
+                schedule = opponent_schedule
+            self.templates[monster["name"]] = MonsterTemplate(
+                number, monster["name"], monster["health"], monster["level"],
+                monster["defence"], monster["extra damage"],
+                monster["attacks"], monster["weaknesses"],
+                monster["strengths"],
+                bytes(EFFECTIVE if attack in monster["weaknesses"] else
+                      WEAK if attack in monster["strengths"] else NEUTRAL
+                      for attack in self.attack_ids),
+                functions(monster["messages"]) if boss else None,
+                functions(monster["start events"]) if boss else (),
+                functions(monster["later events"]) if boss else (),
+                monster["spawn weight"], schedule)
+        self.opponents = {monster["name"]: self.templates[monster["name"]]
+                          for monster in data["opponents"]}
+        self.bosses = {monster["name"]: self.templates[monster["name"]]
+                       for monster in data["bosses"]}
+        self.stages = data["stages"]
+
+        # Indexes of the opponents, each in the order the pack lists them
+        self.by_level = {}
+        for name, template in self.opponents.items():
+            self.by_level.setdefault(template.level, []).append(name)
+        self.by_level = {level: tuple(names)
+                         for level, names in self.by_level.items()}
+        self.by_stage = {stage: tuple(name for name, template
+                                      in self.opponents.items()
+                                      if template.level in levels)
+                         for stage, levels in self.stages.items()}
+        self.by_attack = self.index("attacks", self.mob_attacks)
+        self.weak_to = self.index("weaknesses", self.player_attacks)
+        self.strong_against = self.index("strengths", self.player_attacks)
+
+        # Weighted choice of the monsters that can be faced
+        self.spawns = {stage: self.spawn_table(names)
+                       for stage, names in self.by_stage.items()}
+        self.boss_spawns = self.spawn_table(self.bosses)
+
+    def index(self, field, attacks):
+        """
+        Returns the opponents listing each attack in a field of theirs.
+
+        param field (str): attacks, weaknesses or strengths.
+        param attacks (tuple): the attacks to index.
+        """
+        return {attack: tuple(name for name, template
+                              in self.opponents.items()
+                              if attack in getattr(template, field))
+                for attack in attacks}
+
+    def spawn_table(self, names):
+        """Returns an AliasTable choosing monsters by their spawn weights."""
+        return AliasTable(names, [self.templates[name].spawn_weight
+                                  for name in names])
+
+
+def functions(names):
+    """Returns the functions in battle_functions.py with the given names."""
+    return tuple(getattr(fn, name) for name in names)
+
+
+def cache_path(path):
+    """Returns where a content pack is compiled to, like Python modules."""
+    folder, name = os.path.split(path)
+    return os.path.join(folder, "__pycache__",
+                        f"{name}.{sys.implementation.cache_tag}.pack")
+
+
+def compile_content(path):
+    """
+    Reads and checks a content pack, or its compiled form if up to date.
+
+    The checked pack is compiled to a file next to it the first time, so
+    it's only parsed and checked again once it changes.
+
+    return (dict): the checked content pack.
+    """
+    status = os.stat(path)
+    header = MAGIC + SOURCE.pack(status.st_mtime_ns, status.st_size)
+    cache = cache_path(path)
+    try:
+        with open(cache, "rb") as compiled:
+            data = compiled.read()
+        if data.startswith(header):
+            return marshal.loads(data[len(header):])
+    except (OSError, EOFError, ValueError, TypeError):
+        # Missing or broken, compiled again below
+        pass
+
+    # Only needed when the pack has changed
+    import json
+    with open(path, encoding="utf-8") as pack:
+        checked = validate(json.load(pack))
+    # Written under a name of its own first, other processes may be loading
+    partial = f"{cache}.{os.getpid()}"
+    try:
+        os.makedirs(os.path.dirname(cache), exist_ok=True)
+        with open(partial, "wb") as compiled:
+            compiled.write(header + marshal.dumps(checked))
+        os.replace(partial, cache)
+    except OSError:
+        # Can't be cached (a read-only install), it's checked every time
+        pass
+    return checked
+
+
+@lru_cache(maxsize=None)
+def pack_digest(path=CONTENT_PATH):
+    """
+    Returns a SHA-256 digest of a content pack file.
+
+    Anything that depends on the pack (saved games, tuning results) can keep
+    it to tell whether the pack has changed since. Worked out once, like the
+    pack itself is only loaded once.
+
+    return (bytes): the 32 byte digest.
+    """
+    with open(path, "rb") as pack:
+        return hashlib.sha256(pack.read()).digest()
+
+
+def load_content(path=CONTENT_PATH):
+    """Returns the ContentPack in a file."""
+    return ContentPack(compile_content(path))
+
+
+if __name__ == "__main__":
+    # Only needed to run from the command line
+    import argparse
+    parser = argparse.ArgumentParser(
+        description="Check a dental RPG content pack.")
+    parser.add_argument("pack", nargs="?", default=CONTENT_PATH)
+    args = parser.parse_args()
+    try:
+        content = load_content(args.pack)
+    except (OSError, ValueError) as error:
+        sys.exit(f"{args.pack}: {error}")
+    print(f"{len(content.opponents)} opponents, {len(content.bosses)} "
+          f"bosses, {len(content.attack_ids)} attacks, "
+          f"{len(content.stages)} stages")
+    for stage, names in content.by_stage.items():
+        print(f"stage {stage}: {', '.join(names)}")
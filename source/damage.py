@@ -0,0 +1,96 @@
+##
+# damage.py
+# Date: 18/10/2026
+# Author: Ryan Gordon
+# Contains the damage formula for the dental RPG, for single and batched rolls
+
+import random
+from math import ceil
+from content import NEUTRAL, EFFECTIVE, WEAK
+from constants import BASE_DAMAGE as BASE
+
+
+def base_damages(base):
+    """Returns the base damage of each effectiveness class."""
+    return base, ceil(base * 1.5), ceil(base / 1.5)
+
+
+# Base damage and the range of the damage roll, indexed by effectiveness class
+BASES = base_damages(BASE)
+LOWS = (-2, -1, -4)
+HIGHS = (2, 4, 1)
+
+# Converts attack effectiveness (as in Player.affected_by) to a class
+EFFECT_CLASSES = {None: NEUTRAL, True: EFFECTIVE, False: WEAK}
+
+
+def apply_damage(roll, damage_adjust, defence, critical):
+    """
+    Turns a damage roll into the damage dealt.
+
+    Works on plain integers as well as NumPy arrays, so single and batched
+    rolls give exactly the same numbers for the same roll.
+
+    param roll (int/array): the rolled damage.
+    param damage_adjust (int/array): damage is divided by this, rounding up.
+    param defence (int/array): defence of the defender.
+    param critical (bool/array): doubles the damage if set.
+    """
+    damage = -(-roll // damage_adjust) - defence
+    damage = damage * (damage > 0)
+    return damage * (1 + critical)
+
+
+def roll_damage(extra_damage, damage_adjust, defence, effect, critical=False,
+                rng=random):
+    """
+    Rolls the damage dealt by a single attack.
+
+    param extra_damage (int): extra damage of the attacker.
+    param damage_adjust (int): damage of the attacker is divided by this.
+    param defence (int): defence of the defender.
+    param effect (int): effectiveness class of the attack.
+    param critical (bool): if set, effective attacks have a 10% chance to do
+        double damage.
+    param rng (random.Random): source of the random rolls.
+
+    return (int, bool): damage dealt and whether it was a critical hit.
+    """
+    base = BASES[effect] + extra_damage
+    roll = rng.randint(base + LOWS[effect], base + HIGHS[effect])
+    # 10% chance for critical if sensible attack
+    critical = critical and effect == EFFECTIVE \
+        and rng.randint(0, 100) > 90
+    return int(apply_damage(roll, damage_adjust, defence, critical)), critical
+
+
+def roll_damages(generator, extra_damage, damage_adjust, defence, effect,
+                 critical=False, bases=BASES):
+    """
+    Rolls the damage dealt by many attacks at once.
+
+    Each parameter is as for roll_damage() but can be an array, arrays are
+    broadcast against each other.
+
+    param generator (numpy.random.Generator): source of the random rolls.
+    param bases (tuple): base damage of each effectiveness class, as
+        base_damages() returns.
+
+    return (array, array): damage dealt and whether each was a critical hit.
+    """
+    # Only imported here, nothing else in a battle needs it
+    try:
+        import numpy as np
+    except ImportError:
+        raise ImportError("batched damage rolls need NumPy installed") \
+            from None
+    effect = np.asarray(effect)
+    base = np.asarray(bases)[effect] + extra_damage
+    low = base + np.asarray(LOWS)[effect]
+    high = base + np.asarray(HIGHS)[effect]
+    low, high = np.broadcast_arrays(low, high, damage_adjust, defence,
+                                    critical)[:2]
+    roll = generator.integers(low, high, endpoint=True)
+    critical = np.asarray(critical) & (effect == EFFECTIVE) \
+        & (generator.integers(0, 100, size=roll.shape, endpoint=True) > 90)
+    return apply_damage(roll, damage_adjust, defence, critical), critical
@@ -0,0 +1,168 @@
+##
+# engine.py
+# Date: 18/10/2026
+# Author: Ryan Gordon
+# Contains the headless battle engine for the dental hygiene RPG
+
+import random
+from collections import namedtuple
+from damage import roll_damage, EFFECT_CLASSES
+from events import compile_schedule, START, LATER
+
+# Types of event yielded by fight(), the rest of each tuple is listed after
+EVENT = "event"  # random event function, outcome, turn
+TURN = "turn"  # turn
+CHOOSE = "choose"  # (the chosen user attack must be sent back)
+ATTACK = "attack"  # turn, attack
+DAMAGE = "damage"  # turn, effectiveness class, damage, critical
+HEALTH = "health"  # user health, enemy health
+
+BattleResult = namedtuple("BattleResult", ["won", "turns", "log"])
+
+
+class BattleContext:
+    """
+    Holds everything about a single battle.
+
+    Passed to the battle loop and every random event instead of keeping any
+    of it in globals, so any number of battles can run at once.
+    """
+
+    def __init__(self, user, enemy, turn, random_events=(), later_events=(),
+                 event_chance=60, rng=random, enemy_policy=None,
+                 schedule=None):
+        """
+        param user (object): contains all information about the user.
+        param enemy (object): the opponent or boss being fought.
+        param turn (str): who strikes first, "user" or "computer".
+        param random_events (tuple): random events that can take place.
+        param later_events (tuple): random events added after the first user
+            turn.
+        param event_chance (int): a random event takes place next round if a
+            roll out of 100 is greater than this.
+        param rng (random.Random): source of every random choice in the
+            battle.
+        param enemy_policy (function): given the BattleContext, returns the
+            attack the enemy chooses, the enemy chooses itself if None.
+        param schedule (EventSchedule): if set, used instead of the random
+            events and event chance, e.g. the enemy template's schedule.
+        """
+        self.user, self.enemy, self.turn = user, enemy, turn
+        if schedule is None:
+            schedule = compile_schedule(tuple(random_events),
+                                        tuple(later_events), event_chance)
+        self.schedule, self.phase = schedule, START
+        self.rng = rng
+        self.enemy_policy = enemy_policy
+        self.turns = 0
+
+    @property
+    def random_events(self):
+        """Random events that can take place at this point in the battle."""
+        return self.schedule.events(self.phase)
+
+    @property
+    def event_chance(self):
+        """A random event takes place if a roll out of 100 beats this."""
+        return self.schedule.chance
+
+    def activate_later_events(self):
+        """Adds any random events that have to occur later to the pool."""
+        self.phase = LATER
+
+
+def random_policy(ctx):
+    """Chooses a random working attack for the user."""
+    user = ctx.user
+    working = [attack for attack in user.attacks
+               if attack not in user.compromised_attacks]
+    return ctx.rng.choice(working or user.attacks)
+
+
+def fight(ctx):
+    """
+    Plays out a battle without any input or output.
+
+    Yields a tuple for each thing that happens (see the event types above).
+    When a CHOOSE event is yielded the user attack has to be sent back.
+
+    param ctx (BattleContext): the battle, updated as it goes.
+
+    return (int): the number of turns taken.
+    """
+    user, enemy, rng, schedule = ctx.user, ctx.enemy, ctx.rng, ctx.schedule
+    random_event = False
+    # Loop until one or the other of the combatants is defeated
+    while enemy.get_status() and user.get_status():
+        turn = ctx.turn
+        events = schedule.phases[ctx.phase]
+        if random_event and events is not None:
+            event = events.draw(rng)
+            yield EVENT, event, event(ctx), turn
+        yield TURN, turn
+        if turn == "user":
+            attack = yield CHOOSE,
+            yield ATTACK, turn, attack
+            effect = enemy.effectiveness(attack)
+            damage, critical = roll_damage(user.extra_damage,
+                                           user.damage_adjust, enemy.defence,
+                                           effect, critical=True, rng=rng)
+            yield DAMAGE, turn, effect, damage, critical
+            enemy.take_damage(damage)
+            yield HEALTH, user.health, enemy.health
+            # Reset temporary effects from random events
+            user.uncompromise_all_attacks()
+            user.reset_damage_adjust()
+            # Add any boss specific random events that have to occur later
+            ctx.activate_later_events()
+        else:
+            if ctx.enemy_policy is None:
+                attack = enemy.get_attack()
+            else:
+                attack = ctx.enemy_policy(ctx)
+            yield ATTACK, turn, attack
+            effect = EFFECT_CLASSES[user.affected_by[attack]]
+            damage, critical = roll_damage(enemy.extra_damage,
+                                           enemy.damage_adjust, user.defence,
+                                           effect, rng=rng)
+            yield DAMAGE, turn, effect, damage, critical
+            user.take_damage(damage)
+            yield HEALTH, user.health, enemy.health
+            # Reset temporary effects from random events
+            enemy.reset_damage_adjust()
+        ctx.turns += 1
+        # Alternate the attacks and check for random event next round
+        ctx.turn = "user" if turn == "computer" else "computer"
+        random_event = rng.randint(0, 100) > schedule.chance
+    return ctx.turns
+
+
+def resolve(user, enemy, policy=random_policy, turn=None, random_events=(),
+            later_events=(), event_chance=60, rng=random, enemy_policy=None,
+            schedule=None):
+    """
+    Plays out a whole battle headlessly.
+
+    param policy (function): given the BattleContext, returns the attack the
+        user chooses.
+
+    The remaining parameters are as for BattleContext, turn is chosen
+    randomly if not specified.
+
+    return (BattleResult): whether the user won, the number of turns taken
+        and every event yielded by the battle.
+    """
+    if turn is None:
+        turn = rng.choice(["user", "computer"])
+    ctx = BattleContext(user, enemy, turn, random_events, later_events,
+                        event_chance, rng, enemy_policy, schedule)
+    events, log, reply = fight(ctx), [], None
+    while True:
+        try:
+            event = events.send(reply)
+        except StopIteration as finished:
+            turns = finished.value
+            break
+        log.append(event)
+        reply = policy(ctx) if event[0] == CHOOSE else None
+    return BattleResult(user.get_status(), turns, log)
@@ -0,0 +1,69 @@
+##
+# events.py
+# Date: 18/10/2026
+# Author: Ryan Gordon
+# Contains the schedule of random events for battles in the dental RPG
+
+from functools import lru_cache
+from alias import AliasTable
+
+# Phases of a battle, the later phase starts after the first user turn
+START, LATER = 0, 1
+
+
+class EventSchedule:
+    """
+    The random events that can take place during a battle.
+
+    Each phase is compiled into an AliasTable once, so choosing an event
+    takes one draw and nothing is built while the battle is played out.
+    Events that would be listed twice are only listed once.
+    """
+
+    __slots__ = ("phases", "chance")
+
+    def __init__(self, start_events=(), later_events=(), chance=60,
+                 weights=None):
+        """
+        param start_events (tuple): random events that can take place from
+            the start of the battle.
+        param later_events (tuple): random events added after the first user
+            turn.
+        param chance (int): a random event takes place next round if a roll
+            out of 100 is greater than this.
+        param weights (dict): how likely each event is to be chosen relative
+            to the others, 1 for any not listed.
+        """
+        weights = weights or {}
+        start = tuple(dict.fromkeys(start_events))
+        later = tuple(dict.fromkeys(start + tuple(later_events)))
+        self.phases = []
+        for events in (start, later):
+            if self.phases and events == start:
+                # Nothing is added later, so the same table (or lack of one)
+                # is used
+                self.phases.append(self.phases[START])
+            elif events:
+                self.phases.append(AliasTable(
+                    events, [weights.get(event, 1) for event in events]))
+            else:
+                self.phases.append(None)
+        self.phases = tuple(self.phases)
+        self.chance = chance
+
+    def events(self, phase):
+        """Returns the random events that can take place in a phase."""
+        table = self.phases[phase]
+        return () if table is None else table.items
+
+
+@lru_cache(maxsize=256)
+def compile_schedule(start_events, later_events, chance, weights=()):
+    """
+    Returns an EventSchedule, reused for identical battles.
+
+    param weights (tuple): (event, weight) pairs.
+
+    The remaining parameters are as for EventSchedule.
+    """
+    return EventSchedule(start_events, later_events, chance, dict(weights))
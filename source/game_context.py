@@ -0,0 +1,28 @@
+##
+# game_context.py
+# Date: 18/10/2026
+# Author: Ryan Gordon
+# Contains the state belonging to a single playthrough of the dental RPG
+
+import random
+
+
+class GameContext:
+    """Carries everything belonging to one game between its parts."""
+
+    def __init__(self, seed=None, save_path=None):
+        """
+        param seed (int): seeds every random choice made during the game, so
+            the same seed and answers replay the same game. Chosen randomly
+            if not specified (and kept so the game can still be replayed).
+        param save_path (str): if set, the game is saved here at the end of
+            every part.
+        """
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(64)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.user = None
+        # The part of the story played next
+        self.part = 1
+        self.save_path = save_path
@@ -0,0 +1,208 @@
+##
+# input_options.py
+# Date: 18/10/2026
+# Author: Ryan Gordon
+# Contains options for where the answers to game prompts come from
+
+import os
+import sys
+from codecs import getincrementaldecoder
+from contextvars import ContextVar
+from time import perf_counter
+from print_options import get_sink, drain_sink
+from tracing import get_tracer
+
+
+class TerminalInput:
+    """
+    Asks the user at the terminal.
+
+    Lines are read as soon as they're typed and queued until a prompt asks
+    for them, so answers typed ahead of a prompt are kept, and a prompt that
+    runs out of time doesn't swallow the next line. The event loop watches
+    the terminal itself where it can, so no thread waits on the user.
+    """
+
+    def __init__(self, stream=None):
+        """param stream (file): where lines are read from, stdin if None."""
+        self.stream = stream
+        self.loop = self.lines = None
+        self.decoder = getincrementaldecoder("utf-8")(errors="replace")
+        self.partial = ""
+
+    def start(self, loop):
+        """Starts queueing lines as they're typed, in an event loop."""
+        # Only needed when reading from the terminal
+        import asyncio
+        self.loop, self.lines = loop, asyncio.Queue()
+        stream = self.stream or sys.stdin
+        try:
+            loop.add_reader(stream.fileno(), self.receive, stream.fileno())
+        except (AttributeError, OSError, ValueError, NotImplementedError):
+            # Files and Windows consoles can't be watched, so a thread reads
+            # them instead
+            from threading import Thread
+            Thread(target=self.read_lines, args=(stream,),
+                   daemon=True).start()
+
+    def receive(self, fd):
+        """Queues the lines that can be read from a file descriptor."""
+        data = os.read(fd, 4096)
+        text = self.partial + self.decoder.decode(data, final=not data)
+        *lines, self.partial = text.split("\n")
+        if not data:
+            # End of input, any unfinished line is still an answer
+            self.loop.remove_reader(fd)
+            lines += [self.partial] if self.partial else []
+            lines.append(None)
+        for line in lines:
+            self.lines.put_nowait(line if line is None else line.rstrip("\r"))
+
+    def read_lines(self, stream):
+        """Queues every line read from a stream, run in its own thread."""
+        try:
+            for line in iter(stream.readline, ""):
+                self.loop.call_soon_threadsafe(self.lines.put_nowait,
+                                               line.rstrip("\r\n"))
+            self.loop.call_soon_threadsafe(self.lines.put_nowait, None)
+        except RuntimeError:
+            # The game finished first
+            pass
+
+    async def read(self, prompt):
+        """
+        Prints the prompt and waits for the user to answer.
+
+        Raises EOFError if there's nothing left to read, same as input().
+        """
+        get_sink().write(prompt)
+        get_sink().flush()
+        import asyncio
+        loop = asyncio.get_running_loop()
+        if loop is not self.loop:
+            self.start(loop)
+        line = await self.lines.get()
+        if line is None:
+            # Every prompt from now on is at the end of input too
+            self.lines.put_nowait(None)
+            raise EOFError("no more input")
+        return line
+
+
+class ScriptedInput:
+    """Answers prompts from a list of answers given in advance."""
+
+    def __init__(self, answers):
+        """param answers (iterable): answers given in order."""
+        self.answers = iter(answers)
+
+    @classmethod
+    def from_file(cls, path):
+        """Reads the answers from a file, one per line."""
+        with open(path, encoding="utf-8") as script:
+            return cls(script.read().splitlines())
+
+    async def read(self, prompt):
+        """
+        Prints the prompt along with the next answer and returns the answer.
+
+        Raises EOFError if there are no answers left, same as input().
+        """
+        try:
+            answer = next(self.answers)
+        except StopIteration:
+            raise EOFError("script ran out of answers") from None
+        get_sink().write(prompt + answer + '\n')
+        return answer
+
+
+class PolicyInput:
+    """Answers prompts by calling a function."""
+
+    def __init__(self, policy):
+        """param policy (function): given the prompt, returns the answer."""
+        self.policy = policy
+
+    async def read(self, prompt):
+        """Prints the prompt along with the answer and returns the answer."""
+        answer = self.policy(prompt)
+        get_sink().write(prompt + answer + '\n')
+        return answer
+
+
+# Every answer to a game prompt comes from this, kept per context so each game
+# session can have its own
+provider = ContextVar("provider", default=TerminalInput())
+
+# Seconds a prompt waits for an answer before giving up, None to wait forever
+deadline = ContextVar("deadline", default=None)
+
+
+def set_input_provider(new_provider):
+    """
+    Changes where the answers to game prompts come from (in the current
+    context).
+
+    return (object): the provider previously in use.
+    """
+    old_provider = provider.get()
+    provider.set(new_provider)
+    return old_provider
+
+
+def set_deadline(seconds):
+    """
+    Changes how long prompts wait for an answer (in the current context).
+
+    param seconds (float): time allowed per prompt, None to wait forever.
+    """
+    deadline.set(seconds)
+
+
+async def read_by_deadline(prompt, default):
+    """
+    Waits for the answer to a prompt until the deadline, if there is one.
+
+    Raises TimeoutError if the deadline passes and there is no default.
+
+    param default (str/function): answer given once the deadline passes, or
+        a function returning it.
+    """
+    seconds = deadline.get()
+    if seconds is None:
+        return await provider.get().read(prompt)
+    # Only needed when there's a deadline
+    import asyncio
+    try:
+        return await asyncio.wait_for(provider.get().read(prompt), seconds)
+    except asyncio.TimeoutError:
+        if default is None:
+            raise TimeoutError("no answer in time") from None
+    answer = default() if callable(default) else default
+    get_sink().write(answer + '\n')
+    return answer
+
+
+async def get_input(prompt, default=None):
+    """
+    Waits for and returns the answer to a prompt.
+
+    The text before the prompt is shown in full before the deadline starts,
+    so the user always gets the whole time to answer.
+
+    param default (str/function): answer given if the deadline passes first,
+        or a function returning it.
+    """
+    tracer = get_tracer()
+    if tracer is None:
+        await drain_sink()
+        return await read_by_deadline(prompt, default)
+    # Time spent showing text counts as pauses, not waiting for input
+    started = perf_counter()
+    if await drain_sink():
+        tracer.wait("pause", perf_counter() - started)
+    started = perf_counter()
+    try:
+        return await read_by_deadline(prompt, default)
+    finally:
+        tracer.wait("input", perf_counter() - started)
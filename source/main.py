@@ -4,29 +4,47 @@
 # Author: Ryan Gordon
 # Plays an PRG game with the user as a dentist, promotes good dental hygiene
 
-import random
-from time import sleep
+import argparse
+import asyncio
+import os
+import sys
 from battle import battle
-from player import Player
-from print_options import print_slow, print_red
-from constants import FOREST_ENCOUNTER_MESSAGE as FOREST_MOB_MSG, \
-     TOWER_ENCOUNTER_MESSAGE as TWR_MOB_MSG, FOREST_OUTSKIRTS_ENCOUNTER, \
-     FOREST_ROUTES
+from player import create_player
+from print_options import print_slow, print_red, print_line, pause, \
+     set_render_mode, get_render_mode, get_sink, set_sink, BatchingSink, \
+     render_scale, RENDER_MODES
+from game_context import GameContext
+from savegame import save_game, load_game_file
+from tracing import Tracer, get_tracer, set_tracer, span
+from input_options import get_input, set_input_provider, set_deadline, \
+     ScriptedInput
+from policy import set_difficulty, set_hints, DIFFICULTIES
+from text import FOREST_ENCOUNTER_MESSAGE as FOREST_MOB_MSG, \
+     TOWER_ENCOUNTER_MESSAGE as TWR_MOB_MSG, FOREST_OUTSKIRTS_ENCOUNTER
+from constants import FOREST_ROUTES
 
 
 def next_part(part, msg=''):
     """Prints a break in the story telling to signal a new 'chapter'."""
-    print("\n-----")
+    print_line("\n-----")
     print_slow(f"End of part {part}.")
     to_print = f"\nPart {part + 1}{':' if msg != '' else ''} {msg} loading"
     print_slow(to_print, '', wait=0.5)
     print_slow(".....", gap=0.5, wait=0)
-    print("-----\n")
+    print_line("-----\n")
+
+
+def finish_part(game):
+    """Ends the part being played and saves the game if asked to."""
+    next_part(game.part, PART_TITLES[game.part])
+    game.part += 1
+    if game.save_path is not None:
+        save_game(game, game.save_path)
 
 
 def prologue():
     """Prints the prologue to the game."""
-    print("Dental Hygiene RPG".center(80))
+    print_line("Dental Hygiene RPG".center(80))
     print_slow("\nYou walk up the empty street and turn left. ", '')
     print_slow("Another dark alleyway.")
     print_slow("\nThe kingdom hasn't been the same lately; ", '')
@@ -38,23 +56,24 @@ the land have been circulating. """, '')
 The mist stirs ahead of you... and suddenly you can see it - """, '')
     print_slow("the famed door!")
     print_slow("\nYour heartrate increases as you knock on it...")
-    print("\n")
+    print_line("\n")
 
 
-def part_two():
+async def part_two(game):
     """Plays out and prints situation for part two."""
+    user = game.user
     print_slow("""
 You step cautiously forwards through the door, unsure what to expect. """, '')
     print_slow("It closes behind you.")
     print_slow("\nAhead, a noise. ", '')
     print_slow("Something stirs as you strike a match... ")
     print_slow("\nSnap -  it's charging! You ready for combat.", wait=3)
-    print("\n\n--BATTLE--")
-    battle(user, lvl=1, strt="user")
-    print("----------\n")
+    print_line("\n\n--BATTLE--")
+    await battle(user, lvl=1, strt="user")
+    print_line("----------\n")
     if not user.get_status():
         raise Dead("player is dead")
-    sleep(3)
+    pause(3)
     print_slow("\nSome test. ", '')
     print_slow("Or was it a test? ", '')
     print_slow("Was it even meant to be there?")
@@ -65,22 +84,25 @@ You step cautiously forwards through the door, unsure what to expect. """, '')
     print_slow("""
 Before you set off you fortify your teeth with all the dental treatments you're
 aware of (defence has increased by 2).""")
-    print()
+    print_line()
 
 
-def part_three():
+async def part_three(game):
     """Plays out and prints situation for part three."""
+    user = game.user
     print_slow("\nYou know of two methods for getting there")
     print_slow("(1) the main road out of town")
     print_slow("(2) out the back and round through the fens")
     route = ""
     while route not in FOREST_ROUTES.values():
-        route = input("Which route will you take? ").strip().lower()
+        route = await get_input("Which route will you take? ", "1")
+        route = route.strip().lower()
         if route not in FOREST_ROUTES.values():
             try:
                 route = FOREST_ROUTES[route]
             except KeyError:
-                print("You set off, but shortly realise it isn't a route...")
+                print_line(
+                    "You set off, but shortly realise it isn't a route...")
     if route == "main road":
         print_slow("\nThe main road it is.")
     else:
@@ -95,31 +117,31 @@ By midafternoon you can see the forest, your destination easily in sight.""")
     print_slow("100m...")
     print_slow("\nWait... what on earth is that obstructing the entrance?!")
     print_slow("Yeurch.", wait=3)
-    print("\n\n--BATTLE--")
-    battle(user, lvl=1, end=FOREST_OUTSKIRTS_ENCOUNTER)
-    print("----------\n")
+    print_line("\n\n--BATTLE--")
+    await battle(user, lvl=1, end=FOREST_OUTSKIRTS_ENCOUNTER)
+    print_line("----------\n")
     if not user.get_status():
         raise Dead("player is dead")
-    sleep(3)
+    pause(3)
     print_slow("\nA little way into the forest you come to a small township.")
     print_slow("\nThe folk about seem restless. ", '')
     print_slow("Understandable given the state of the kingdom.")
     print_slow("\nOne in particular seems to be trying to catch your eye")
     print_slow("(1) go over to them")
     print_slow("(2) ignore them, they are beneath you")
-    choice = input("What do you do? ")
+    choice = await get_input("What do you do? ", "2")
     while choice not in ("1", "2"):
-        print("Alas, that isn't an option (1/2)...")
-        choice = input("What do you do? ")
+        print_line("Alas, that isn't an option (1/2)...")
+        choice = await get_input("What do you do? ", "2")
     if choice == "1":
         print_slow("\nThe local smiles at you gratefully.")
         print_slow("\n'You look like you're trying to achieve something.'")
         print_slow("(1) I am indeed")
         print_slow("(2) Not sure yet...")
-        response = input("What do you reply? ")
+        response = await get_input("What do you reply? ", "2")
         while response not in ("1", "2"):
-            print("You find yourself unable to say that...")
-            response = input("What do you reply? ")
+            print_line("You find yourself unable to say that...")
+            response = await get_input("What do you reply? ", "2")
         if response == "1":
             print_slow("""
 'Epic! Someone needs to. Here, take this, you may find it useful.'""")
@@ -137,21 +159,21 @@ find it useful.'""")
     print_slow("\nAn eerie quiet ensues as you approach the heart... ", '')
     print_slow("like the wildlife is holding its breath...")
     print_slow("\nThen suddenly it isn't at all quiet.", wait=3)
-    print("\n\n--BATTLE--")
-    battle(user, lvl=3, msg=FOREST_MOB_MSG[0], end=FOREST_MOB_MSG[1])
+    print_line("\n\n--BATTLE--")
+    await battle(user, lvl=3, msg=FOREST_MOB_MSG[0], end=FOREST_MOB_MSG[1])
     if not user.get_status():
-        print("----------\n")
+        print_line("----------\n")
         raise Dead("player is dead")
     print_slow("\nA closer inspection of the area reveals a treasure trove.")
-    new_attack = random.choice(["toothpaste", "dental floss"])
+    new_attack = game.rng.choice(["toothpaste", "dental floss"])
     user.add_attack(new_attack)
     print_slow("\nAmong other things, ", '', wait=0.015)
     if new_attack == "dental floss":
         print_slow("you've found a packet of dental floss!")
     else:
         print_slow("you've found a tube of toothpaste!")
-    print("----------\n")
-    sleep(3)
+    print_line("----------\n")
+    pause(3)
     print_slow("\nThe watchtower in the hills..? ", '')
     print_slow("You survey the recent battlefield. ")
     print_slow("""
@@ -163,16 +185,18 @@ However far these tests really extend, these creatures are evil.""")
     print_slow("\nYou turn and head for the watchtower...")
 
 
-def part_four():
+async def part_four(game):
     """Plays out and prints situation for part four."""
+    user = game.user
     print_slow("\nAfter half a day's trek you reach the watchtower. ", '')
     print_slow("I wonder what's inside... ", wait=3)
-    print("\n\n--BATTLE--")
-    mob = battle(user, lvl=4, msg=TWR_MOB_MSG[0], end=TWR_MOB_MSG[1], nam=True)
-    print("----------\n")
+    print_line("\n\n--BATTLE--")
+    mob = await battle(user, lvl=4, msg=TWR_MOB_MSG[0], end=TWR_MOB_MSG[1],
+                       nam=True)
+    print_line("----------\n")
     if not user.get_status():
         raise Dead("player is dead")
-    sleep(3)
+    pause(3)
     print_slow("\nA search of the tower proves far more lucrative!")
     print_slow("\nIn an obscure drawer you uncover a scrap of paper... ")
     print_slow("""
@@ -189,8 +213,9 @@ before setting off.""")
     user.level_up()
 
 
-def part_five():
+async def part_five(game):
     """Plays out and prints situation for part five."""
+    user = game.user
     print_slow("""
 Upon reaching the city you are possessed of one thought only.""")
     print_slow("""
@@ -204,16 +229,16 @@ A door - you feel a strange sense of déjà vu - it reads 'CEO'. """, '')
     print_slow("""
 There's no sign of the CEO, but in their place is a giant bottle of coke...""")
     print_slow("\nIt turns towards you...", wait=3)
-    print("\n\n--BATTLE--")
-    battle(user, strt="computer", bos="Bottle of Coke")
-    print("----------\n")
+    print_line("\n\n--BATTLE--")
+    await battle(user, strt="computer", bos="Bottle of Coke")
+    print_line("----------\n")
     if not user.get_status():
         raise Dead("player is dead")
-    sleep(3)
+    pause(3)
     print_slow("\nYou won!")
 
 
-def epilogue():
+async def epilogue():
     """Prints the epilogue to the game."""
     print_slow("\nBack at the guild you chat with the guildmaster.")
     print_slow("\n'What was that?'")
@@ -246,7 +271,7 @@ all over the place about a great evil, which obviously was external.""")
     print_slow("(1) Join")
     print_slow("(2) You used me! I don't want to join you")
     print_slow("(3) Wait... what others?")
-    join = input("What do you do? ")
+    join = await get_input("What do you do? ", "1")
     if join in ("1", "join"):
         print_slow("\nYou join the guild...")
     elif join == "2":
@@ -258,7 +283,7 @@ all over the place about a great evil, which obviously was external.""")
         print_slow("'Just sign here please...'")
     else:
         print_slow("\nYou do you. No need to conform this time :)")
-    sleep(5)
+    pause(5)
     print_slow("\n\nTHE END", gap=0.2)
     print_slow("\nMoral of the story: ", '')
     print_red("UserDoesntWantAMoralError: look after your teeth")
@@ -271,24 +296,95 @@ class Dead(Exception):
         self.message = message
 
 
-if __name__ == "__main__":
+# Story parts after character creation, by part number
+PARTS = {2: part_two, 3: part_three, 4: part_four, 5: part_five}
+
+# Titles printed at the end of each part, by part number
+PART_TITLES = {1: "what's behind the door?", 2: "the heart of the forest,",
+               3: "the truth,", 4: "cracking it open,", 5: "the guild?"}
+
+
+async def play(game):
+    """
+    Plays the whole game from the prologue to the epilogue.
+
+    A saved game carries on from the part it was saved at.
+
+    param game (GameContext): the game being played.
+    """
     try:
-        # Run all parts (functions) in order
-        close = False
-        prologue()
-        user = Player()
-        print()
-        next_part(1, "what's behind the door?")
-        part_two()
-        next_part(2, "the heart of the forest,")
-        part_three()
-        next_part(3, "the truth,")
-        part_four()
-        next_part(4, "cracking it open,")
-        close = True
-        part_five()
-        next_part(5, "the guild?")
-        epilogue()
+        if game.part == 1:
+            with span("part:prologue"):
+                prologue()
+                game.user = await create_player(game.rng)
+                print_line()
+                finish_part(game)
+        # Run the remaining parts (functions) in order
+        while game.part in PARTS:
+            with span(f"part:{PARTS[game.part].__name__}"):
+                await PARTS[game.part](game)
+                finish_part(game)
+        with span("part:epilogue"):
+            await epilogue()
     except Dead:
         # If the user dies part way through
+        close = game.part == 5
         print_slow(f"\n{'So close, b' if close else 'B'}etter luck next time!")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Play the dental RPG.")
+    render_mode, scale = get_render_mode()
+    parser.add_argument("--render", choices=RENDER_MODES, default=render_mode,
+                        help="how text is printed (default typewriter)")
+    parser.add_argument("--scale", type=render_scale, default=scale,
+                        help="multiplies text delays in scaled mode")
+    parser.add_argument("--script", metavar="FILE",
+                        help="answer prompts from a file, one per line")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed for every random choice in the game")
+    parser.add_argument("--save", metavar="FILE",
+                        help="save the game here after every part, resuming "
+                             "from it if it exists")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="time each part of the game, appending the "
+                             "trace to FILE")
+    parser.add_argument("--difficulty", choices=DIFFICULTIES,
+                        default="normal",
+                        help="on hard, enemies choose their best attacks")
+    parser.add_argument("--hints", action="store_true",
+                        help="suggest the best attack every turn")
+    parser.add_argument("--timeout", type=float, default=None,
+                        metavar="SECONDS",
+                        help="answer for the user if they take longer than "
+                             "this at a prompt")
+    args = parser.parse_args()
+    set_render_mode(args.render, args.scale)
+    if args.render == "instant":
+        # Nothing waits between characters, so text is written in chunks
+        set_sink(BatchingSink())
+    set_difficulty(args.difficulty)
+    set_hints(args.hints)
+    set_deadline(args.timeout)
+    if args.script is not None:
+        set_input_provider(ScriptedInput.from_file(args.script))
+    if args.save is not None and os.path.exists(args.save):
+        try:
+            game = load_game_file(args.save)
+        except ValueError as error:
+            parser.error(f"{args.save}: {error}")
+        game.save_path = args.save
+        if args.seed is not None and args.seed != game.seed:
+            print(f"Resuming {args.save}, which has its own seed "
+                  f"({game.seed}), --seed {args.seed} is ignored",
+                  file=sys.stderr)
+    else:
+        game = GameContext(args.seed, args.save)
+    if args.trace is not None:
+        set_tracer(Tracer(str(game.seed)))
+    try:
+        asyncio.run(play(game))
+    finally:
+        get_sink().flush()
+        if args.trace is not None:
+            get_tracer().save(args.trace)
@@ -7,66 +7,97 @@
 import random
 from math import ceil
 from print_options import print_slow
-from constants import STAGES, OPPONENTS, SPECIFIC_MOB_ATTACKS, WEAKNESSES, \
-     STRENGTHS
+from constants import STAGE_SPAWNS, SPECIFIC_MOB_ATTACKS, \
+     MONSTER_TEMPLATES, ATTACK_IDS
 
 
 class Opponent:
-    """Creates an opponent object."""
+    """
+    Creates an opponent object.
 
-    def __init__(self, stage):
+    Everything shared by opponents of the same name is kept in a single
+    template, each opponent only stores what can change during a battle.
+    """
+
+    __slots__ = ("template", "rng", "max_health", "health", "attacks",
+                 "extra_damage", "damage_adjust", "defence")
+
+    def __init__(self, stage, name=None, rng=random):
         """
         Basic setup and variables for the computer opponent.
 
         param stage (int): battle the player is up to, determines available
         opponents when choosing an opponent and slightly increases opponent
         health with each stage.
+        param name (str): if specified, determines the opponent being faced,
+            otherwise randomly chosen based off the stage.
+        param rng (random.Random): source of every random choice the
+            opponent makes.
         """
+        self.rng = rng
 
         # Determine opponent randomly based off the stage
-        available_levels, available_opponents = STAGES[stage], []
-        for opponent in OPPONENTS:
-            if OPPONENTS[opponent][1] in available_levels:
-                available_opponents.append(opponent)
-        self.name = random.choice(available_opponents)
+        if name is None:
+            name = STAGE_SPAWNS[stage].draw(rng)
+        self.template = template = MONSTER_TEMPLATES[name]
 
         # Determine health with a random component
-        base_health = OPPONENTS[self.name][0]
-        self.max_health = random.randint(base_health - 5, base_health + 5)
+        base_health = template.health
+        self.max_health = rng.randint(base_health - 5, base_health + 5)
         # The more battles the user fights, the higher the health, also random
-        self.max_health += ceil(random.randint(stage - 1, stage + 2) * 1.5)
+        self.max_health += ceil(rng.randint(stage - 1, stage + 2) * 1.5)
 
         self.health = self.max_health
 
-        # Determine available attacks, strengths, and weaknesses
-        self.attacks = []
-        for attack in SPECIFIC_MOB_ATTACKS:
-            if self.name in SPECIFIC_MOB_ATTACKS[attack]:
-                self.attacks.append(attack)
-
-        self.weaknesses = []
-        for attack in WEAKNESSES:
-            if self.name in WEAKNESSES[attack]:
-                self.weaknesses.append(attack)
-
-        self.strengths = []
-        for attack in STRENGTHS:
-            if self.name in STRENGTHS[attack]:
-                self.strengths.append(attack)
+        # Shared with the template until the opponent evolves
+        self.attacks = template.attacks
 
-        self.extra_damage = 0
+        self.extra_damage = template.extra_damage
         self.damage_adjust = 1
-        self.defence = OPPONENTS[self.name][2]
-
-        self.level = OPPONENTS[self.name][1]
-
-        # Print encounter message
+        self.defence = template.defence
+
+    @property
+    def name(self):
+        """Name of the opponent."""
+        return self.template.name
+
+    @property
+    def id(self):
+        """Monster ID of the opponent."""
+        return self.template.id
+
+    @property
+    def level(self):
+        """Level of the opponent."""
+        return self.template.level
+
+    @property
+    def schedule(self):
+        """Random events that can take place in battles with the opponent."""
+        return self.template.schedule
+
+    @property
+    def weaknesses(self):
+        """User attacks that are effective against the opponent."""
+        return self.template.weaknesses
+
+    @property
+    def strengths(self):
+        """User attacks that aren't very effective against the opponent."""
+        return self.template.strengths
+
+    def encounter_message(self):
+        """Prints the message shown when the opponent is encountered."""
         print_slow("You have encountered: ", '')
         print_slow(self.name + "!")
 
+    def effectiveness(self, attack):
+        """Returns the effectiveness class of a user attack."""
+        return self.template.effectiveness[ATTACK_IDS[attack]]
+
     def add_attack(self, attack):
         """Adds a new attack to the opponent's arsenal."""
-        self.attacks.append(attack)
+        self.attacks += (attack,)
 
     def increase_attack_damage(self, amount):
         """Increases attack damage by specified amount."""
@@ -82,23 +113,25 @@ class Opponent:
         return (str/bool): False if arsenal was full before evolution, else the
             newly added attack.
         """
-        if len(self.attacks) == len(SPECIFIC_MOB_ATTACKS.keys()) - 1:
+        available = list(SPECIFIC_MOB_ATTACKS.keys())
+        for attack in self.attacks:
+            available.remove(attack)
+        # Boss specific attacks can't be learnt
+        if not any(SPECIFIC_MOB_ATTACKS[attack] for attack in available):
             self.increase_attack_damage(1)
             return False
         else:
-            available = list(SPECIFIC_MOB_ATTACKS.keys())
-            for attack in self.attacks:
-                available.remove(attack)
-            attack = random.choice(available)
-            # Ensure the chosen attack isn't a boss specific attack
+            attack = self.rng.choice(available)
+            # Redrawn rather than chosen from the learnable attacks, so seeded
+            # games play out as they always have
             while len(SPECIFIC_MOB_ATTACKS[attack]) == 0:
-                attack = random.choice(available)
+                attack = self.rng.choice(available)
             self.add_attack(attack)
             return attack
 
     def get_attack(self):
         """Chooses a random attack and returns it."""
-        return random.choice(self.attacks)
+        return self.rng.choice(self.attacks)
 
     def adjust_damage(self, amount):
         """Adjust opponent damage by specified factor."""
@@ -6,14 +6,15 @@
 
 import random
 from math import ceil
-from time import sleep
-from print_options import print_slow, print_red
+from print_options import print_slow, print_red, print_line, pause
+from input_options import get_input
 from constants import VALID_STATS, NULL_NAMES, AVAILABLE_EFFECTS, OPPONENTS, \
-     SPECIFIC_MOB_ATTACKS, WEAKNESSES, ATTACK_HELP, BASE_DAMAGE
+     SPECIFIC_MOB_ATTACKS, BASE_DAMAGE, OPPONENTS_BY_LEVEL, LEVEL_HEALTH, \
+     LEVEL_DAMAGE
 import sys
 
 
-def get_stat(prompt, stats):
+async def get_stat(prompt, stats):
     """
     Asks user for a character stat and returns the answer.
 
@@ -22,19 +23,20 @@ def get_stat(prompt, stats):
     """
     ans, valid_stats = "", list(VALID_STATS.values())
     while ans not in valid_stats or (stats.count(ans) == 2 and ans != "meh"):
-        ans = input(prompt).strip().lower()
+        ans = (await get_input(prompt, "meh")).strip().lower()
         if ans not in valid_stats:
             try:
                 ans = VALID_STATS[ans]
             except KeyError:
-                print("Does that really look like one of the options to you?")
+                print_line(
+                    "Does that really look like one of the options to you?")
         # Users cannot be either good or bad at everything
         if stats.count(ans) == 2 and ans != "meh":
-            print(f"You can't be {ans} at everything!")
+            print_line(f"You can't be {ans} at everything!")
     return ans
 
 
-def get_effect(available, stat=None):
+def get_effect(available, stat=None, rng=random):
     """
     Randomly determines the effectiveness of an opponent attack.
 
@@ -42,7 +44,7 @@ def get_effect(available, stat=None):
     entered by the user).
     """
     if stat is None:
-        return random.choice(available)
+        return rng.choice(available)
     elif stat == "good" and False in available:
         return False
     elif stat == "bad" and True in available:
@@ -50,55 +52,101 @@ def get_effect(available, stat=None):
     elif None in available:
         return None
     else:
-        return random.choice(available)
+        return rng.choice(available)
 
 
 def print_attacks(attacks, compromised):
     """Prints out available user attacks. Returns number of attacks."""
-    print("Equipment in your backpack:")
+    print_line("Equipment in your backpack:")
     for attack in attacks:
         option = attacks.index(attack)
         # Compromised attacks are printed in red
         if attack not in compromised:
-            print(f"({option + 1}) {attack}")
+            print_line(f"({option + 1}) {attack}")
         else:
             print_red(f"({option + 1}) {attack}")
     # Typing help or the corresponding number gives information on attacks
-    print(f"({option + 2}) help")
+    print_line(f"({option + 2}) help")
     return option
 
 
+async def ask_character(rng=random):
+    """
+    Asks the user for their name and character stats.
+
+    return (str, dict): the name and stats of the character.
+    """
+    # Start of character creation messages
+    print_slow("Greetings applicant", '\n\n')
+    print_slow("We need some information about you.", '\n\n')
+
+    print_line("Guild application form\n")
+
+    # Get player name
+    name = (await get_input("Name: ", "")).strip()
+    if name == "":
+        name = rng.choice(NULL_NAMES)
+        pause(1)
+        print_slow("You need a name to enter.")
+        print_slow("We have decided you shall henceforth be known as ", '')
+        print_slow(f"{name}.")
+
+    # Get self discipline, agility, and teeth strength as good/bad/meh
+    stats = {}
+    prompt = "How good is your self discipline (good/bad/meh)? "
+    stats["self discipline"] = await get_stat(prompt, list(stats.values()))
+    prompt = "How good is your agility (good/bad/meh)? "
+    stats["agility"] = await get_stat(prompt, list(stats.values()))
+    prompt = "Lastly, how healthy are your teeth (good/bad/meh)? "
+    stats["teeth strength"] = await get_stat(prompt, list(stats.values()))
+    return name, stats
+
+
+async def create_player(rng=random):
+    """
+    Asks the user to create their character and introduces the game.
+
+    param rng (random.Random): source of every random choice made for the
+        player.
+
+    return (Player): the user's character.
+    """
+    name, stats = await ask_character(rng)
+    user = Player(name, stats, rng)
+
+    # Print game situation and stats of resultant character
+    user.print_stats()
+
+    print_slow("\nThank you. ", '')
+    print_slow("But this is just writing. ", '')
+    print_slow("Prior to joining you must undergo a series of tests.")
+    print_line()
+    print_slow("The assessor shows you another door and steps back. ", '')
+    print_slow("You open it...")
+    return user
+
+
 class Player:
     """Creates an object that contains all the player's information."""
 
-    def __init__(self):
-        """Initial setup of character."""
-        # Start of character creation messages
-        print_slow("Greetings applicant", '\n\n')
-        print_slow("We need some information about you.", '\n\n')
-
-        print("Guild application form\n")
-
-        # Get player name
-        self.name = input("Name: ").strip()
-        if self.name == "":
-            self.name = random.choice(NULL_NAMES)
-            sleep(1)
-            print_slow("You need a name to enter.")
-            print_slow("We have decided you shall henceforth be known as ", '')
-            print_slow(f"{self.name}.")
-
-        # Get self discipline, agility, and teeth strength as good/bad/meh
-        self.stats = {}
-        prompt = "How good is your self discipline (good/bad/meh)? "
-        self_discipline = get_stat(prompt, list(self.stats.values()))
-        self.stats["self discipline"] = self_discipline
-        prompt = "How good is your agility (good/bad/meh)? "
-        agility = get_stat(prompt, list(self.stats.values()))
-        self.stats["agility"] = agility
-        prompt = "Lastly, how healthy are your teeth (good/bad/meh)? "
-        teeth_strength = get_stat(prompt, list(self.stats.values()))
-        self.stats["teeth strength"] = teeth_strength
+    __slots__ = ("rng", "name", "stats", "affected_by", "max_health",
+                 "health", "attacks", "extra_damage", "damage_adjust",
+                 "defence", "compromised_attacks", "level")
+
+    def __init__(self, name, stats, rng=random):
+        """
+        Initial setup of character, without asking or printing anything.
+
+        Use create_player() to have the user create their character.
+
+        param name (str): name of the character.
+        param stats (dict): self discipline, agility and teeth strength, each
+            either good, bad or meh.
+        param rng (random.Random): source of every random choice made for
+            the player.
+        """
+        self.rng = rng
+        self.name, self.stats = name, stats
 
         # Use the traits to psuedo-randomly determine attack effectiveness
         effects, self.affected_by = list(AVAILABLE_EFFECTS), {}
@@ -109,10 +157,12 @@ class Player:
             try:
                 # The first three are based off character stats
                 stat = list(self.stats.values())[attack]
-                self.affected_by[attacks[attack]] = get_effect(effects, stat)
+                self.affected_by[attacks[attack]] = get_effect(effects, stat,
+                                                               rng)
             except IndexError:
                 # The rest are determined randomly based on what's left
-                self.affected_by[attacks[attack]] = get_effect(effects)
+                self.affected_by[attacks[attack]] = get_effect(effects,
+                                                               rng=rng)
             # Remove the chosen effect from the remaining effects to dole out
             effects.remove(list(self.affected_by.values())[-1])
 
@@ -122,11 +172,8 @@ class Player:
 
         # User starts out with attacks effective against L1 monsters
         self.attacks = []
-        for opponent, stats in OPPONENTS.items():
-            if stats[1] == 1:
-                for weakness in WEAKNESSES:
-                    if opponent in WEAKNESSES[weakness]:
-                        self.attacks.append(weakness)
+        for opponent in OPPONENTS_BY_LEVEL[1]:
+            self.attacks.extend(OPPONENTS[opponent].weaknesses)
 
         self.extra_damage = 0
         self.damage_adjust = 1
@@ -137,42 +184,46 @@ class Player:
 
         self.level = 1
 
-        # Print game situation and stats of resultant character
-        self.print_stats()
-
-        print_slow("\nThank you. ", '')
-        print_slow("But this is just writing. ", '')
-        print_slow("Prior to joining you must undergo a series of tests.")
-        print()
-        print_slow("The assessor shows you another door and steps back. ", '')
-        print_slow("You open it...")
-
     def add_attack(self, attack):
         """Adds a new attack to the player's arsenal."""
         self.attacks.append(attack)
 
-    def get_attack(self, enemy):
-        """Asks user to choose an attack and returns the answer."""
+    async def get_attack(self, enemy, hint=None, default=None):
+        """
+        Asks user to choose an attack and returns the answer.
+
+        param enemy (str): name of the enemy being fought.
+        param hint (str): if set, the attack suggested to the user.
+        param default (function): chooses the attack if the user runs out of
+            time, see input_options.get_input().
+        """
+        # Prose is only loaded once it's needed
+        from text import handbook_entry
         # Print out options
         option = print_attacks(self.attacks, self.compromised_attacks)
+        if hint is not None:
+            print_line(f"(Your handbook suggests the {hint}.)")
         attack = ""
         # Determine the attack, check for validity
         while attack not in self.attacks or attack in self.compromised_attacks:
             # If they asked for help with the attacks, print the attacks again
             if attack in ("help", str(option + 2)):
                 option = print_attacks(self.attacks, self.compromised_attacks)
-            attack = input("How will you tackle your enemy? ").strip().lower()
+            attack = await get_input("How will you tackle your enemy? ",
+                                     default)
+            attack = attack.strip().lower()
             # If the user wants information on an attack or two
             if attack in ("help", str(option + 2)):
                 print_slow("""
 You wave the monster down. 'Just give me a minute to consult my dental handbook
 please...'""")
-                print("\n(Press enter to put the handbook down.)")
+                print_line("\n(Press enter to put the handbook down.)")
                 attack_help = " "
                 # Loop until the user hits enter, means they want to attack
                 while attack_help != "":
                     # Ask for the attack to help with
-                    attack_help = input("What attack do you want to look up? ")
+                    attack_help = await get_input(
+                        "What attack do you want to look up? ", "")
                     attack_help = attack_help.strip().lower()
                     # If the attack was likely entered as a number, convert it
                     if attack_help not in self.attacks and attack_help != "":
@@ -181,28 +232,31 @@ please...'""")
                             if attack_help >= 0:
                                 # If the requirements are satisfied, print help
                                 attack_help = self.attacks[attack_help]
-                                message = ATTACK_HELP[attack_help].split("*")
+                                message = handbook_entry(
+                                    attack_help).split("*")
                                 print_slow(message[0], '')
                                 print_slow(message[1], gap=0.015)
-                                print()
+                                print_line()
                             else:
-                                print("You seem unable to find the entry...")
+                                print_line(
+                                    "You seem unable to find the entry...")
                         except ValueError:
-                            print(f"There's no entry for {attack_help}...")
+                            print_line(
+                                f"There's no entry for {attack_help}...")
                         except IndexError:
-                            print("You seem unable to find the entry...")
+                            print_line("You seem unable to find the entry...")
                     elif attack_help != "":
                         # If the requirements are satisfied, print help
-                        message = ATTACK_HELP[attack_help].split("*")
+                        message = handbook_entry(attack_help).split("*")
                         print_slow(message[0], '')
                         print_slow(message[1], gap=0.015)
-                        print()
+                        print_line()
                     else:
                         # User is exiting the help menu
                         print_slow("""
 You stow your handbook and apologise to the monster. 'Ok I'm ready now...'""")
                         print_slow(f"\nThe {enemy} glares at you.")
-                        print()
+                        print_line()
             # If the attack was likely entered as a number, convert it
             elif attack not in self.attacks:
                 try:
@@ -210,13 +264,13 @@ You stow your handbook and apologise to the monster. 'Ok I'm ready now...'""")
                     if attack >= 0:
                         attack = self.attacks[attack]
                     else:
-                        print("That doesn't correspond to anything...")
+                        print_line("That doesn't correspond to anything...")
                 except ValueError:
-                    print("Not currently in your arsenal.")
+                    print_line("Not currently in your arsenal.")
                 except IndexError:
-                    print("That doesn't correspond to anything...")
+                    print_line("That doesn't correspond to anything...")
             if attack in self.compromised_attacks:
-                print("You reach for it but it isn't working...")
+                print_line("You reach for it but it isn't working...")
         return attack
 
     def delete_attack(self, attack=None):
@@ -224,7 +278,7 @@ You stow your handbook and apologise to the monster. 'Ok I'm ready now...'""")
         if len(self.attacks) == 1:
             return False
         elif attack is None:
-            attack = random.choice(self.attacks)
+            attack = self.rng.choice(self.attacks)
             self.attacks.remove(attack)
             return attack
         else:
@@ -234,7 +288,7 @@ You stow your handbook and apologise to the monster. 'Ok I'm ready now...'""")
         """Adds an attack to the compromised attacks list."""
         # Compromise either a specified or a random attack
         if attack is None:
-            self.compromised_attacks.append(random.choice(self.attacks))
+            self.compromised_attacks.append(self.rng.choice(self.attacks))
         else:
             self.compromised_attacks.append(attack)
         return self.compromised_attacks[-1]
@@ -313,16 +367,21 @@ Attack damage: {BASE_DAMAGE + self.extra_damage}""", wait=0.015)
         print_slow(f"""
 Strong against: {', '.join(strong_against)}""", wait=0.015)
         print_slow(f"Weak against: {', '.join(weak_against)}")
-        print(f"------------{'------' if not level_up else ''}")
+        print_line(f"------------{'------' if not level_up else ''}")
+
+    def gain_level(self):
+        """Levels the user up and gives stats a subsequent boost silently."""
+        self.level += 1
+        self.increase_max_health(LEVEL_HEALTH)
+        self.heal_full()
+        self.increase_attack_damage(LEVEL_DAMAGE)
 
     def level_up(self):
         """Levels the user up and gives stats a subsequent boost."""
-        print("\n--LEVEL UP--")
-        self.level += 1
+        print_line("\n--LEVEL UP--")
+        self.gain_level()
         print_slow(f"You've reached level {self.level}!")
-        self.increase_max_health(15)
-        self.heal_full()
-        self.increase_attack_damage(2)
-        print_slow("Increased attack damage (by 2) and health (by 15).")
-        print()
+        print_slow(f"Increased attack damage (by {LEVEL_DAMAGE}) and health "
+                   f"(by {LEVEL_HEALTH}).")
+        print_line()
         self.print_stats(True)
@@ -0,0 +1,182 @@
+##
+# policy.py
+# Date: 18/10/2026
+# Author: Ryan Gordon
+# Chooses attacks for bots, hard mode enemies and hints in the dental RPG
+
+from contextvars import ContextVar
+from functools import lru_cache
+from engine import random_policy
+from solver import damage_distribution
+from damage import EFFECT_CLASSES
+from constants import EFFECTIVENESS, ATTACK_IDS
+
+# How smart enemies are, on hard they choose their attacks to hurt the most
+DIFFICULTIES = ("normal", "hard")
+
+# Difficulty and whether the user is given hints, kept per context so each
+# game session can have its own
+difficulty = ContextVar("difficulty", default="normal")
+hints = ContextVar("hints", default=False)
+
+
+def rank_attacks(attacks, effects, extra_damage, damage_adjust, defence,
+                 critical):
+    """
+    Ranks attacks by the damage they're expected to do.
+
+    param attacks (tuple): the attacks to choose between.
+    param effects (tuple): effectiveness class of each attack on the target.
+
+    The remaining parameters are as for damage.roll_damage().
+
+    return (tuple): a row for each attack, most expected damage first, of
+        the attack, its expected damage and (damage, chance of doing at
+        least that much) pairs from the most damage down.
+    """
+    rows = []
+    for attack, effect in zip(attacks, effects):
+        distribution = sorted(damage_distribution(
+            extra_damage, damage_adjust, defence, effect, critical),
+            reverse=True)
+        at_least, chance = [], 0.0
+        for damage, damage_chance in distribution:
+            chance += damage_chance
+            at_least.append((damage, chance))
+        rows.append((attack, sum(damage * damage_chance for damage,
+                                 damage_chance in distribution),
+                     tuple(at_least)))
+    # Sorting is stable, so equally good attacks stay in arsenal order
+    return tuple(sorted(rows, key=lambda row: -row[1]))
+
+
+@lru_cache(maxsize=4096)
+def user_table(monster, attacks, extra_damage, damage_adjust, defence):
+    """
+    Returns the decision table of a user attacking a monster.
+
+    Tables are cached per matchup, the least recently used are dropped once
+    the cache is full.
+
+    param monster (int): ID of the monster attacked.
+    param attacks (tuple): the user's attacks.
+    param extra_damage, damage_adjust (int): of the user.
+    param defence (int): of the monster.
+
+    return (tuple): as for rank_attacks().
+    """
+    effects = tuple(EFFECTIVENESS[monster][ATTACK_IDS[attack]]
+                    for attack in attacks)
+    return rank_attacks(attacks, effects, extra_damage, damage_adjust,
+                        defence, True)
+
+
+@lru_cache(maxsize=4096)
+def enemy_table(attacks, affected_by, extra_damage, damage_adjust, defence):
+    """
+    Returns the decision table of a monster attacking a user.
+
+    param attacks (tuple): the monster's attacks.
+    param affected_by (tuple): effectiveness class of each of the attacks
+        against the user.
+    param extra_damage, damage_adjust (int): of the monster.
+    param defence (int): of the user.
+
+    return (tuple): as for rank_attacks().
+    """
+    return rank_attacks(attacks, affected_by, extra_damage, damage_adjust,
+                        defence, False)
+
+
+def kill_chance(at_least, health):
+    """Returns the chance of an attack doing at least the given damage."""
+    chance = 0.0
+    for damage, cumulative in at_least:
+        if damage < health:
+            break
+        chance = cumulative
+    return chance
+
+
+def best_attack(table, compromised=(), health=None):
+    """
+    Chooses the best attack in a decision table.
+
+    param compromised (list): attacks that can't be used, unless they all
+        are.
+    param health (int): if set, the attack most likely to finish off a
+        target with this much health is chosen, if any can.
+
+    return (str): the attack.
+    """
+    working = [row for row in table if row[0] not in compromised] or table
+    if health is not None:
+        best = max(working, key=lambda row: kill_chance(row[2], health))
+        if kill_chance(best[2], health) > 0:
+            return best[0]
+    return working[0][0]
+
+
+def table_for_user(ctx):
+    """Returns the decision table of the user in a battle."""
+    user, enemy = ctx.user, ctx.enemy
+    return user_table(enemy.id, tuple(user.attacks), user.extra_damage,
+                      user.damage_adjust, enemy.defence)
+
+
+def damage_policy(ctx):
+    """Chooses the working user attack expected to do the most damage."""
+    return best_attack(table_for_user(ctx), ctx.user.compromised_attacks)
+
+
+def finisher_policy(ctx):
+    """
+    Chooses the user attack most likely to finish the enemy off this turn if
+    any can, otherwise the one expected to do the most damage.
+
+    Only this turn is looked at, so it isn't always the attack most likely
+    to win the whole battle.
+    """
+    return best_attack(table_for_user(ctx), ctx.user.compromised_attacks,
+                       ctx.enemy.health)
+
+
+def hard_enemy_policy(ctx):
+    """Chooses the enemy attack as finisher_policy() does for the user."""
+    user, enemy = ctx.user, ctx.enemy
+    table = enemy_table(enemy.attacks, tuple(
+        EFFECT_CLASSES[user.affected_by[attack]] for attack in enemy.attacks),
+        enemy.extra_damage, enemy.damage_adjust, user.defence)
+    return best_attack(table, health=user.health)
+
+
+# Policies bots can play with, by name
+POLICIES = {"random": random_policy, "damage": damage_policy,
+            "finisher": finisher_policy}
+
+
+def set_difficulty(mode):
+    """Changes how smart enemies are, in the current context."""
+    if mode not in DIFFICULTIES:
+        raise ValueError(f"unknown difficulty: {mode}")
+    difficulty.set(mode)
+
+
+def get_difficulty():
+    """Returns the current difficulty."""
+    return difficulty.get()
+
+
+def get_enemy_policy():
+    """Returns the policy enemies choose attacks with, None if at random."""
+    return hard_enemy_policy if difficulty.get() == "hard" else None
+
+
+def set_hints(show):
+    """Turns hints on the best attack on or off, in the current context."""
+    hints.set(show)
+
+
+def get_hint(ctx):
+    """Returns the attack to suggest to the user, None if hints are off."""
+    return finisher_policy(ctx) if hints.get() else None
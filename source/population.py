@@ -0,0 +1,460 @@
+##
+# population.py
+# Date: 18/10/2026
+# Author: Ryan Gordon
+# Simulates whole populations of battles at once for the dental RPG
+
+from collections import Counter
+from functools import lru_cache
+from damage import roll_damages, base_damages, EFFECT_CLASSES
+from simulate import matchups, stat_loadouts, print_report
+import battle_functions as fn
+from constants import STAGE_SPAWNS, BOSS_SPAWNS, OPPONENTS_BY_LEVEL, \
+     OPPONENTS, AVAILABLE_EFFECTS, SPECIFIC_MOB_ATTACKS, \
+     ATTACK_IDS, MONSTER_TEMPLATES, VALID_STATS, EFFECTIVENESS, BASE_DAMAGE, \
+     LEVEL_HEALTH, LEVEL_DAMAGE
+from content import NEUTRAL, EFFECTIVE, WEAK
+
+try:
+    import numpy as np
+except ImportError:
+    # Populations can't be simulated without it
+    np = None
+
+# Character stats as codes, in the order VALID_STATS lists them
+GOOD, BAD, MEH = range(3)
+STAT_CODES = {stat: code for code, stat in enumerate(VALID_STATS.values())}
+STAT_NAMES = ("self discipline", "agility", "teeth strength")
+
+# Attacks as bits in a mask, a monster evolves into any attack used by mobs
+# while a boss can evolve into any monster attack
+MAX_ATTACKS = 20
+ATTACK_BITS = 1 << len(ATTACK_IDS)
+MOB_ATTACKS = sum(1 << ATTACK_IDS[attack] for attack, users
+                  in SPECIFIC_MOB_ATTACKS.items() if users)
+MONSTER_ATTACKS = sum(1 << ATTACK_IDS[attack]
+                      for attack in SPECIFIC_MOB_ATTACKS)
+
+
+@lru_cache(maxsize=None)
+def bit_tables():
+    """
+    Returns lookup tables for attack masks.
+
+    There's a row for every possible mask, so the tables double in size with
+    each attack. Content packs with more than MAX_ATTACKS attacks are
+    refused rather than running out of memory.
+
+    return (array, array): the number of attacks in each mask, and the ID of
+        the nth attack in each mask.
+    """
+    if len(ATTACK_IDS) > MAX_ATTACKS:
+        raise ValueError(f"population simulations handle at most "
+                         f"{MAX_ATTACKS} attacks, the content pack has "
+                         f"{len(ATTACK_IDS)}")
+    ids = np.arange(len(ATTACK_IDS), dtype=np.uint8)
+    bits = ((np.arange(ATTACK_BITS, dtype=np.uint32)[:, None] >> ids)
+            & 1).astype(np.uint8)
+    counts = bits.sum(axis=1, dtype=np.int64)
+    # Attacks not in the mask are sorted to the end
+    nth = np.sort(np.where(bits == 1, ids, len(ids)), axis=1)
+    return counts, nth.astype(np.int8)
+
+
+@lru_cache(maxsize=None)
+def effectiveness_table():
+    """Returns EFFECTIVENESS as an array."""
+    return np.array([list(row) for row in EFFECTIVENESS])
+
+
+def mask_of(attacks):
+    """Returns the mask of a list of attacks."""
+    return sum(1 << ATTACK_IDS[attack] for attack in attacks)
+
+
+def choose_attacks(generator, masks):
+    """Chooses an attack from each mask at random, returns their IDs."""
+    counts, nth = bit_tables()
+    picks = (generator.random(len(masks)) * counts[masks]).astype(np.int64)
+    return nth[masks, picks].astype(np.int64)
+
+
+def choose_weighted(generator, counts):
+    """Chooses a column of each row at random, weighted by the counts."""
+    totals = np.cumsum(counts, axis=1)
+    picks = generator.random(len(counts)) * totals[:, -1]
+    return (picks[:, None] >= totals).sum(axis=1)
+
+
+def generate_effects(generator, stats, effects=AVAILABLE_EFFECTS):
+    """
+    Gives each opponent attack an effectiveness against each user.
+
+    Follows the same rules as Player.__init__() and get_effect().
+
+    param stats (array): stat codes of each user, one column per stat.
+    param effects (tuple): effects doled out to each user, as in
+        AVAILABLE_EFFECTS.
+
+    return (array): effectiveness class of each opponent attack against each
+        user, one column per attack.
+    """
+    size = len(stats)
+    counts = np.zeros((size, 3), dtype=np.int64)
+    for effect in effects:
+        counts[:, EFFECT_CLASSES[effect]] += 1
+    affected_by = np.zeros((size, len(effects)), dtype=np.int8)
+    for attack in range(len(effects)):
+        chosen = choose_weighted(generator, counts)
+        if attack < stats.shape[1]:
+            stat = stats[:, attack]
+            chosen = np.where(
+                (stat == GOOD) & (counts[:, WEAK] > 0), WEAK, np.where(
+                    (stat == BAD) & (counts[:, EFFECTIVE] > 0), EFFECTIVE,
+                    np.where(counts[:, NEUTRAL] > 0, NEUTRAL, chosen)))
+        affected_by[:, attack] = chosen
+        counts[np.arange(size), chosen] -= 1
+    return affected_by
+
+
+class Population:
+    """
+    Many battles between users and one kind of enemy, as parallel arrays.
+
+    Each row is a battle. Finished battles are dropped from the arrays as the
+    population advances a turn at a time, rows keeps track of which battle
+    each remaining row was originally.
+    """
+
+    # Arrays with a row per battle
+    COLUMNS = ("rows", "user_health", "user_max_health", "user_extra_damage",
+               "user_damage_adjust", "user_defence", "user_attacks",
+               "compromised", "affected_by", "enemy_health",
+               "enemy_extra_damage", "enemy_damage_adjust", "enemy_defence",
+               "enemy_attacks", "enemy_id", "user_turn", "event_due",
+               "later")
+
+    def __init__(self, generator, size, stage, name=None, stats=None,
+                 level=1, defence=0, turn=None, effects=AVAILABLE_EFFECTS,
+                 templates=MONSTER_TEMPLATES, base_damage=BASE_DAMAGE,
+                 level_health=LEVEL_HEALTH, level_damage=LEVEL_DAMAGE):
+        """
+        param generator (numpy.random.Generator): source of every random
+            choice in the battles.
+        param size (int): number of battles.
+        param stage (int): stage of the opponents, None for a boss.
+        param name (str): name of the opponent or boss, opponents are chosen
+            randomly based off the stage if not specified.
+        param stats (array): stat codes of each user, every loadout is
+            cycled through evenly if not specified.
+        param level (int): level of the users.
+        param defence (int): defence added to the users.
+        param turn (str): who strikes first, equally likely if not specified.
+        param effects (tuple): as for generate_effects().
+        param templates (dict): template of each monster by name.
+        param base_damage (int): as BASE_DAMAGE.
+        param level_health, level_damage (int): as LEVEL_HEALTH and
+            LEVEL_DAMAGE.
+        """
+        # Checks the content pack isn't too big before anything is set up
+        bit_tables()
+        self.generator = generator
+        self.bases = base_damages(base_damage)
+        self.boss = stage is None
+        if self.boss:
+            name = name or BOSS_SPAWNS.items[
+                BOSS_SPAWNS.draw_indices(generator, 1)[0]]
+            self.schedule = templates[name].schedule
+        else:
+            # Every opponent has the same schedule
+            self.schedule = templates[
+                name or STAGE_SPAWNS[stage].items[0]].schedule
+        self.rows = np.arange(size)
+
+        # Users, as set up by Player.__init__() and gain_level()
+        if stats is None:
+            loadouts = np.array([[STAT_CODES[loadout[stat]]
+                                  for stat in STAT_NAMES]
+                                 for loadout in stat_loadouts()])
+            stats = loadouts[self.rows % len(loadouts)]
+        self.affected_by = generate_effects(generator, stats, effects)
+        self.user_max_health = np.full(size,
+                                       35 + level_health * (level - 1))
+        self.user_health = self.user_max_health.copy()
+        self.user_extra_damage = np.full(size, level_damage * (level - 1))
+        self.user_damage_adjust = np.ones(size, dtype=np.int64)
+        self.user_defence = np.full(size, defence)
+        first_attacks = [attack for opponent in OPPONENTS_BY_LEVEL[1]
+                         for attack in OPPONENTS[opponent].weaknesses]
+        self.user_attacks = np.full(size, mask_of(first_attacks))
+        self.compromised = np.zeros(size, dtype=np.int64)
+
+        # Enemies, as set up by Opponent.__init__() or Boss.__init__()
+        if name is not None:
+            available, chosen = [name], np.zeros(size, dtype=np.int64)
+        else:
+            available = STAGE_SPAWNS[stage].items
+            chosen = STAGE_SPAWNS[stage].draw_indices(generator, size)
+        spawned = [templates[name] for name in available]
+
+        def template_column(field):
+            """Returns a field of each enemy's template."""
+            return np.array([field(template) for template in spawned])[
+                chosen]
+
+        base_health = template_column(lambda template: template.health)
+        self.enemy_health = generator.integers(base_health - 5,
+                                               base_health + 5, endpoint=True)
+        if not self.boss:
+            self.enemy_health += np.ceil(generator.integers(
+                stage - 1, stage + 2, size=size, endpoint=True) * 1.5
+            ).astype(np.int64)
+        self.enemy_extra_damage = template_column(
+            lambda template: template.extra_damage)
+        self.enemy_damage_adjust = np.ones(size, dtype=np.int64)
+        self.enemy_defence = template_column(
+            lambda template: template.defence)
+        self.enemy_attacks = template_column(
+            lambda template: mask_of(template.attacks))
+        self.enemy_id = template_column(lambda template: template.id)
+
+        if turn is None:
+            self.user_turn = generator.random(size) < 0.5
+        else:
+            self.user_turn = np.full(size, turn == "user")
+        self.event_due = np.zeros(size, dtype=bool)
+        # Whether the later random events have been added
+        self.later = np.zeros(size, dtype=bool)
+
+    def keep(self, kept):
+        """Drops every battle not in the kept rows."""
+        for column in self.COLUMNS:
+            setattr(self, column, getattr(self, column)[kept])
+
+    def step(self):
+        """
+        Plays out a turn of every battle, as engine.fight() does.
+
+        return (array, array): damage dealt by the user and by the enemy in
+            each battle (zero if it wasn't their turn).
+        """
+        generator, size = self.generator, len(self.rows)
+        everyone = np.arange(size)
+        start, later = self.schedule.phases
+        if later is not None:
+            # Events of the start phase come first in the later phase
+            chosen = later.draw_indices(generator, size)
+            if start is not later:
+                chosen = np.where(self.later, chosen, -1 if start is None else
+                                  start.draw_indices(generator, size))
+            for number, event in enumerate(later.items):
+                rows = np.flatnonzero(self.event_due & (chosen == number))
+                if len(rows):
+                    EVENT_KERNELS[event](self, rows)
+
+        # Choose attacks, the user picks a working attack at random
+        working = self.user_attacks & ~self.compromised
+        working = np.where(working == 0, self.user_attacks, working)
+        user_attack = choose_attacks(generator, working)
+        enemy_attack = choose_attacks(generator, self.enemy_attacks)
+        user_turn = self.user_turn
+        effect = np.where(user_turn,
+                          effectiveness_table()[self.enemy_id, user_attack],
+                          self.affected_by[everyone, enemy_attack])
+        damage, _ = roll_damages(
+            generator,
+            np.where(user_turn, self.user_extra_damage,
+                     self.enemy_extra_damage),
+            np.where(user_turn, self.user_damage_adjust,
+                     self.enemy_damage_adjust),
+            np.where(user_turn, self.enemy_defence, self.user_defence),
+            effect, critical=user_turn, bases=self.bases)
+        dealt, taken = damage * user_turn, damage * ~user_turn
+        self.enemy_health -= dealt
+        self.user_health -= taken
+
+        # Reset temporary effects from random events
+        self.compromised[user_turn] = 0
+        self.user_damage_adjust[user_turn] = 1
+        self.enemy_damage_adjust[~user_turn] = 1
+        self.later |= user_turn
+
+        # Alternate the attacks and check for random event next round
+        self.user_turn = ~user_turn
+        self.event_due = generator.integers(
+            0, 100, size=size, endpoint=True) > self.schedule.chance
+        return dealt, taken
+
+
+def evolve_monster(population, rows):
+    """Vectorised evolve_monster(), see Opponent.evolve() and Boss.evolve()."""
+    possible = MONSTER_ATTACKS if population.boss else MOB_ATTACKS
+    available = possible & ~population.enemy_attacks[rows]
+    full = available == 0
+    population.enemy_extra_damage[rows[full]] += 1
+    rows, available = rows[~full], available[~full]
+    attacks = choose_attacks(population.generator, available)
+    population.enemy_attacks[rows] |= 1 << attacks
+
+
+def compromise_attack(population, rows):
+    """Vectorised compromise_attack(), see Player.compromise()."""
+    attacks = choose_attacks(population.generator,
+                             population.user_attacks[rows])
+    population.compromised[rows] |= 1 << attacks
+
+
+def find_toothbrush(population, rows):
+    """Vectorised find_toothbrush(), see Player.heal()."""
+    healed = population.user_health[rows] + population.generator.integers(
+        5, 8, size=len(rows), endpoint=True)
+    full = healed >= population.user_max_health[rows]
+    population.user_health[rows] = np.where(
+        full, population.user_max_health[rows], healed)
+    population.user_extra_damage[rows] += full
+
+
+def gust(population, rows):
+    """Vectorised gust()."""
+    user_turn = population.user_turn[rows]
+    population.user_damage_adjust[rows[user_turn]] += 1
+    population.enemy_damage_adjust[rows[~user_turn]] += 1
+
+
+def decrease_damage(extra_damage, damage_adjust, rows):
+    """Vectorised decrease_attack_damage(1) of the user or a boss."""
+    halved = extra_damage[rows] < 1
+    damage_adjust[rows[halved]] += 1
+    extra_damage[rows[~halved]] -= 1
+
+
+def fizz(population, rows):
+    """Vectorised fizz()."""
+    decrease_damage(population.user_extra_damage,
+                    population.user_damage_adjust, rows)
+
+
+def pressure_release(population, rows):
+    """Vectorised pressure_release()."""
+    decrease_damage(population.enemy_extra_damage,
+                    population.enemy_damage_adjust, rows)
+
+
+def dissolve_weapon(population, rows):
+    """Vectorised dissolve_weapon(), see Player.delete_attack()."""
+    counts, _ = bit_tables()
+    rows = rows[counts[population.user_attacks[rows]] > 1]
+    attacks = choose_attacks(population.generator,
+                             population.user_attacks[rows])
+    population.user_attacks[rows] &= ~(1 << attacks)
+
+
+# Vectorised version of each random event
+EVENT_KERNELS = {fn.evolve_monster: evolve_monster,
+                 fn.compromise_attack: compromise_attack,
+                 fn.find_toothbrush: find_toothbrush,
+                 fn.gust: gust,
+                 fn.fizz: fizz,
+                 fn.pressure_release: pressure_release,
+                 fn.dissolve_weapon: dissolve_weapon}
+
+
+def add_counts(total, counts):
+    """Adds counts of each value to a running total, returns the total."""
+    if len(counts) > len(total):
+        total = np.pad(total, (0, len(counts) - len(total)))
+    total[:len(counts)] += counts
+    return total
+
+
+def fight_population(population, max_turns=1000):
+    """
+    Plays out every battle in a population.
+
+    param population (Population): the battles, used up by playing them.
+    param max_turns (int): battles still going after this many turns are
+        stopped and counted as lost.
+
+    return (array, array, array, array): whether the user won each battle,
+        the turns each battle took, and the number of times each damage was
+        dealt by users and by enemies.
+    """
+    size = len(population.rows)
+    won, turns = np.zeros(size, dtype=bool), np.zeros(size, dtype=np.int64)
+    dealt = taken = np.zeros(1, dtype=np.int64)
+    for turn in range(1, max_turns + 1):
+        user_damage, enemy_damage = population.step()
+        user_turn = ~population.user_turn
+        dealt = add_counts(dealt, np.bincount(user_damage[user_turn]))
+        taken = add_counts(taken, np.bincount(enemy_damage[~user_turn]))
+        alive = (population.user_health > 0) & (population.enemy_health > 0)
+        finished = population.rows[~alive]
+        won[finished] = population.user_health[~alive] > 0
+        turns[finished] = turn
+        population.keep(alive)
+        if not len(population.rows):
+            break
+    turns[population.rows] = max_turns
+    return won, turns, dealt, taken
+
+
+def counter(counts):
+    """Turns an array of counts into a Counter."""
+    return Counter({value: int(count) for value, count in enumerate(counts)
+                    if count})
+
+
+def simulate_population(fights, seed=0, batch_size=1000000, level=1,
+                        defence=0, effects=AVAILABLE_EFFECTS):
+    """
+    Runs battles for every matchup, a whole batch of battles at a time.
+
+    param fights (int): number of battles per matchup.
+    param seed (int): seeds every random choice, the same seed gives the
+        same results.
+    param batch_size (int): number of battles played out together.
+    param level (int): level of the simulated users.
+    param defence (int): defence added to the simulated users.
+    param effects (tuple): as for generate_effects().
+
+    return (dict): for each matchup, number of wins and counters of the
+        turns taken to win and the damage dealt and taken per hit, as
+        simulate.simulate() returns.
+    """
+    if np is None:
+        raise ImportError("population simulations need NumPy installed")
+    generator, results = np.random.default_rng(seed), {}
+    for stage, name in matchups():
+        wins, turns = 0, np.zeros(1, dtype=np.int64)
+        dealt = taken = np.zeros(1, dtype=np.int64)
+        for first in range(0, fights, batch_size):
+            population = Population(generator, min(batch_size, fights - first),
+                                    stage, name, level=level,
+                                    defence=defence, effects=effects)
+            won, batch_turns, batch_dealt, batch_taken = \
+                fight_population(population)
+            wins += int(won.sum())
+            turns = add_counts(turns, np.bincount(batch_turns[won]))
+            dealt = add_counts(dealt, batch_dealt)
+            taken = add_counts(taken, batch_taken)
+        results[stage, name] = [wins, counter(turns), counter(dealt),
+                                counter(taken)]
+    return results
+
+
+if __name__ == "__main__":
+    # Only needed to run from the command line, not in worker processes
+    import argparse
+    parser = argparse.ArgumentParser(
+        description="Simulate populations of battles for every matchup.")
+    parser.add_argument("-n", "--fights", type=int, default=100000,
+                        help="battles per matchup")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=1000000)
+    parser.add_argument("--level", type=int, default=1,
+                        help="level of the simulated users")
+    parser.add_argument("--defence", type=int, default=0,
+                        help="defence added to the simulated users")
+    args = parser.parse_args()
+    print_report(simulate_population(args.fights, args.seed, args.batch_size,
+                                     args.level, args.defence), args.fights)
@@ -4,9 +4,216 @@
 # Author: Ryan Gordon
 # Contains options for printing lines slowly
 
-from time import sleep
+from contextvars import ContextVar
+from math import isfinite
+from time import sleep, perf_counter
+from tracing import get_tracer
+import os
 import sys
 
+# Ways print_slow can render text: one character at a time, all at once with
+# no delays, or one character at a time with every delay multiplied by a scale
+RENDER_MODES = ("typewriter", "instant", "scaled")
+
+
+def render_scale(text):
+    """
+    Reads a render scale, usable as an argparse type.
+
+    Raises ValueError unless the scale is a positive number.
+    """
+    scale = float(text)
+    if not (isfinite(scale) and scale > 0):
+        raise ValueError(f"render scale must be a positive number: {text}")
+    return scale
+
+
+def render_from_environment():
+    """
+    Returns the render mode and scale chosen through environment variables.
+
+    Anything that isn't a render mode or a positive scale is ignored in
+    favour of typewriter mode and a scale of 1.
+    """
+    mode = os.environ.get("DENTAL_RPG_RENDER", "typewriter")
+    if mode not in RENDER_MODES:
+        mode = "typewriter"
+    try:
+        scale = render_scale(os.environ.get("DENTAL_RPG_RENDER_SCALE", 1))
+    except ValueError:
+        scale = 1.0
+    return mode, scale
+
+
+# The render mode can be chosen in advance through environment variables,
+# it is kept per context so each game session can have its own
+render = ContextVar("render", default=render_from_environment())
+
+
+class TerminalSink:
+    """Writes game text straight to the terminal, red text to stderr."""
+
+    def write(self, text, red=False):
+        """Writes text to the terminal."""
+        if red:
+            sys.stdout.flush()
+            sys.stderr.write(text)
+        else:
+            sys.stdout.write(text)
+
+    def flush(self):
+        """Makes sure everything written so far is shown."""
+        sys.stdout.flush()
+
+    def pause(self, seconds):
+        """Shows everything written so far, then waits."""
+        self.flush()
+        sleep(seconds)
+
+
+class BatchingSink:
+    """Collects game text and writes it to a stream in large chunks."""
+
+    def __init__(self, stream=None, size=65536):
+        """
+        param stream (file): where the text is written, stdout by default.
+        param size (int): number of characters collected before writing.
+        """
+        self.stream = sys.stdout if stream is None else stream
+        self.size = size
+        self.chunks, self.length = [], 0
+
+    def write(self, text, red=False):
+        """Adds text to the next chunk, red text is coloured in place."""
+        if red:
+            text = f"\033[31m{text}\033[0m"
+        self.chunks.append(text)
+        self.length += len(text)
+        if self.length >= self.size:
+            self.flush()
+
+    def flush(self):
+        """Writes the collected text to the stream in one go."""
+        if self.chunks:
+            self.stream.write(''.join(self.chunks))
+            self.chunks, self.length = [], 0
+        self.stream.flush()
+
+    def pause(self, seconds):
+        """Writes the collected text, then waits."""
+        self.flush()
+        sleep(seconds)
+
+
+class MemorySink:
+    """Keeps game text in memory, used for tests."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, text, red=False):
+        """Keeps the text."""
+        self.chunks.append(text)
+
+    def flush(self):
+        """Nothing to do, the text is already kept."""
+
+    def pause(self, seconds):
+        """Nothing to wait for in memory."""
+
+    def getvalue(self):
+        """Returns all of the text written so far."""
+        return ''.join(self.chunks)
+
+
+class NullSink:
+    """Throws game text away, used for simulations."""
+
+    def write(self, text, red=False):
+        """Ignores the text."""
+
+    def flush(self):
+        """Nothing to do."""
+
+    def pause(self, seconds):
+        """Nothing to wait for."""
+
+
+# Every line of game text goes through this, kept per context so each game
+# session can have its own
+sink = ContextVar("sink", default=TerminalSink())
+
+
+def get_sink():
+    """Returns the sink game text is currently written to."""
+    return sink.get()
+
+
+def set_sink(new_sink):
+    """
+    Changes where all game text is written (in the current context).
+
+    return (object): the sink previously in use, flushed.
+    """
+    old_sink = sink.get()
+    old_sink.flush()
+    sink.set(new_sink)
+    return old_sink
+
+
+def get_render_mode():
+    """Returns the current render mode and scale."""
+    return render.get()
+
+
+def set_render_mode(mode, scale=1.0):
+    """
+    Changes how all game text is rendered (in the current context).
+
+    param mode (str): one of RENDER_MODES.
+    param scale (float): delays are multiplied by this in scaled mode.
+    """
+    if mode not in RENDER_MODES:
+        raise ValueError(f"unknown render mode: {mode}")
+    render.set((mode, render_scale(scale)))
+
+
+async def drain_sink():
+    """
+    Waits until the sink has sent everything written to it so far.
+
+    Sinks that send text in the background have a drained() coroutine to
+    wait on, every other sink has sent its text by the time it returns.
+
+    return (bool): whether the sink sends text in the background.
+    """
+    drained = getattr(sink.get(), "drained", None)
+    if drained is None:
+        return False
+    await drained()
+    return True
+
+
+def pause(seconds):
+    """
+    Waits for the specified time, adjusted for the render mode.
+
+    Anything written so far is shown first. The sink does the waiting, so
+    it can wait without blocking other game sessions.
+    """
+    mode, scale = render.get()
+    if mode == "instant":
+        return
+    elif mode == "scaled":
+        seconds *= scale
+    tracer = get_tracer()
+    if tracer is None:
+        sink.get().pause(seconds)
+    else:
+        started = perf_counter()
+        sink.get().pause(seconds)
+        tracer.wait("pause", perf_counter() - started)
+
 
 def print_slow(message, newline='\n', gap=0.015, wait=1.5):
     """
@@ -14,13 +221,27 @@ def print_slow(message, newline='\n', gap=0.015, wait=1.5):
 
     Used to enhance user experience while playing the game.
     """
-    for character in list(message):
-        print(character, end='')
-        sleep(gap)
-    print(end=newline)
-    sleep(wait)
+    tracer = get_tracer()
+    if tracer is not None:
+        token = tracer.start("print_slow")
+    out = sink.get()
+    if render.get()[0] == "instant":
+        out.write(message + newline)
+    else:
+        for character in list(message):
+            out.write(character)
+            pause(gap)
+        out.write(newline)
+        pause(wait)
+    if tracer is not None:
+        tracer.stop(token)
+
+
+def print_line(message=''):
+    """Prints a line all at once."""
+    sink.get().write(message + '\n')
 
 
 def print_red(message):
     """Prints a line of text in red."""
-    sys.stderr.write(message + '\n')
+    sink.get().write(message + '\n', red=True)
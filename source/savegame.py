@@ -0,0 +1,126 @@
+##
+# savegame.py
+# Date: 18/10/2026
+# Author: Ryan Gordon
+# Contains a compact binary format for saving a game between its parts
+
+import os
+import struct
+from game_context import GameContext
+from player import Player
+from content import pack_digest
+from damage import EFFECT_CLASSES
+from constants import ATTACK_IDS, SPECIFIC_MOB_ATTACKS, VALID_STATS
+
+# Written at the start of every save file, the last byte is the version
+MAGIC = b"DHRS\x02"
+
+# Length of the digest of the content pack that follows the magic, attacks
+# are saved by their IDs in the pack so a save only loads with the same one
+DIGEST_SIZE = 32
+
+# Part to resume from, level, max health, health, extra damage, defence,
+# then the length of the seed and of the name which follow
+STATE = struct.Struct("<BBHHhhBH")
+
+# The state of the random number generator: its 624 words and position,
+# and whether a gaussian is stored along with its value
+RNG_STATE = struct.Struct("<625I?d")
+
+# Reverse lookups for loading
+ATTACKS = tuple(ATTACK_IDS)
+STATS = tuple(VALID_STATS.values())
+EFFECTS = tuple(EFFECT_CLASSES)
+STAT_NAMES = ("self discipline", "agility", "teeth strength")
+
+
+def dump_game(game):
+    """
+    Packs a game between two of its parts into bytes.
+
+    Only what lasts between parts is kept, temporary battle effects have
+    always been reset by then.
+
+    param game (GameContext): the game, with its user created.
+
+    return (bytes): the saved game.
+    """
+    user = game.user
+    seed_length = (game.seed.bit_length() + 8) // 8
+    name = user.name.encode()
+    version, words, gauss = game.rng.getstate()
+    return b"".join((
+        MAGIC,
+        pack_digest(),
+        STATE.pack(game.part, user.level, user.max_health, user.health,
+                   user.extra_damage, user.defence, seed_length, len(name)),
+        game.seed.to_bytes(seed_length, "little", signed=True),
+        name,
+        bytes(STATS.index(user.stats[stat]) for stat in STAT_NAMES),
+        bytes(EFFECT_CLASSES[user.affected_by[attack]]
+              for attack in SPECIFIC_MOB_ATTACKS),
+        bytes((len(user.attacks),)),
+        bytes(ATTACK_IDS[attack] for attack in user.attacks),
+        RNG_STATE.pack(*words, gauss is not None, gauss or 0.0)))
+
+
+def load_game(data):
+    """
+    Unpacks a game saved by dump_game().
+
+    return (GameContext): the game, ready to resume from the saved part.
+    """
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError("not a saved game (or an unsupported version)")
+    offset = len(MAGIC) + DIGEST_SIZE
+    if data[len(MAGIC):offset] != pack_digest():
+        raise ValueError("saved with a different content pack")
+    part, level, max_health, health, extra_damage, defence, seed_length, \
+        name_length = STATE.unpack_from(data, offset)
+    offset += STATE.size
+    seed = int.from_bytes(data[offset:offset + seed_length], "little",
+                          signed=True)
+    offset += seed_length
+    name = data[offset:offset + name_length].decode()
+    offset += name_length
+    stats = dict(zip(STAT_NAMES, (STATS[stat] for stat in
+                                  data[offset:offset + len(STAT_NAMES)])))
+    offset += len(STAT_NAMES)
+    affected_by = dict(zip(SPECIFIC_MOB_ATTACKS, (
+        EFFECTS[effect] for effect in
+        data[offset:offset + len(SPECIFIC_MOB_ATTACKS)])))
+    offset += len(SPECIFIC_MOB_ATTACKS)
+    attacks = [ATTACKS[attack] for attack in
+               data[offset + 1:offset + 1 + data[offset]]]
+    offset += 1 + data[offset]
+    state = RNG_STATE.unpack_from(data, offset)
+
+    game = GameContext(seed)
+    game.part = part
+    user = Player(name, stats, game.rng)
+    user.affected_by, user.attacks = affected_by, attacks
+    user.level, user.max_health, user.health = level, max_health, health
+    user.extra_damage, user.defence = extra_damage, defence
+    game.user = user
+    # Restored last, creating the player draws from the generator
+    game.rng.setstate((3, state[:625], state[626] if state[625] else None))
+    return game
+
+
+def save_game(game, path):
+    """
+    Saves a game to a file.
+
+    The file is replaced in one go, so a crash while saving never leaves a
+    broken save behind.
+    """
+    partial = f"{path}.partial"
+    with open(partial, "wb") as save:
+        save.write(dump_game(game))
+    os.replace(partial, path)
+
+
+def load_game_file(path):
+    """Loads a game saved to a file by save_game()."""
+    with open(path, "rb") as save:
+        return load_game(save.read())
@@ -0,0 +1,173 @@
+##
+# server.py
+# Date: 18/10/2026
+# Author: Ryan Gordon
+# Serves the dental RPG to many players at once over TCP or a unix socket
+
+import argparse
+import asyncio
+from contextlib import suppress
+from main import play
+from game_context import GameContext
+from print_options import get_sink, set_sink, set_render_mode, \
+     get_render_mode, render_scale, RENDER_MODES
+from input_options import set_input_provider, set_deadline, get_input
+from tracing import Tracer, set_tracer
+
+
+class StreamSink:
+    """
+    Sends game text to a connected player.
+
+    Text and pauses are queued and played out by a separate task, so a
+    session waiting between characters never holds up the other sessions.
+    """
+
+    def __init__(self, writer):
+        """param writer (asyncio.StreamWriter): connection to the player."""
+        self.writer = writer
+        self.queue = asyncio.Queue()
+        self.task = asyncio.create_task(self.run())
+
+    def write(self, text, red=False):
+        """Queues text to be sent, red text is coloured in place."""
+        if red:
+            text = f"\033[31m{text}\033[0m"
+        self.queue.put_nowait(text)
+
+    def flush(self):
+        """Nothing to do, queued text is sent as soon as possible."""
+
+    def pause(self, seconds):
+        """Queues a wait before any text written afterwards is sent."""
+        self.queue.put_nowait(seconds)
+
+    async def run(self):
+        """Sends the queued text to the player, waiting where asked to."""
+        while True:
+            item = await self.queue.get()
+            if item is None:
+                break
+            elif isinstance(item, str):
+                self.writer.write(item.replace('\n', '\r\n').encode())
+            else:
+                await self.writer.drain()
+                await asyncio.sleep(item)
+            self.queue.task_done()
+        await self.writer.drain()
+
+    async def drained(self):
+        """Waits until everything queued so far has been sent."""
+        await self.queue.join()
+        await self.writer.drain()
+
+    async def close(self):
+        """Waits for everything queued to be sent."""
+        self.queue.put_nowait(None)
+        await self.task
+
+
+class StreamInput:
+    """Answers game prompts with lines sent by a connected player."""
+
+    def __init__(self, reader):
+        """param reader (asyncio.StreamReader): connection to the player."""
+        self.reader = reader
+
+    async def read(self, prompt):
+        """
+        Sends the prompt and waits for the player to answer.
+
+        Raises EOFError if the player disconnects, same as input().
+        """
+        get_sink().write(prompt)
+        line = await self.reader.readline()
+        if not line:
+            raise EOFError("player disconnected")
+        return line.decode(errors="replace").rstrip("\r\n")
+
+
+async def session(reader, writer, mode="typewriter", scale=1.0,
+                  trace=None, timeout=None):
+    """
+    Plays a whole game with one connected player.
+
+    Each connection is handled in its own task, so the sink, render mode and
+    input provider set here only apply to this player's game.
+
+    param mode (str): one of RENDER_MODES.
+    param scale (float): delays are multiplied by this in scaled mode.
+    param trace (str): if set, the game is timed and its trace appended to
+        this file.
+    param timeout (float): seconds the player has to answer each prompt
+        before an answer is chosen for them, None to wait forever.
+    """
+    game = GameContext()
+    if trace is not None:
+        tracer = Tracer(str(game.seed))
+        set_tracer(tracer)
+    out = StreamSink(writer)
+    set_sink(out)
+    set_render_mode(mode, scale)
+    set_input_provider(StreamInput(reader))
+    set_deadline(timeout)
+    try:
+        await play(game)
+        await get_input("\nPress enter to leave.", "")
+    except (EOFError, ConnectionError, TimeoutError):
+        # The player left part way through
+        pass
+    finally:
+        with suppress(ConnectionError):
+            await out.close()
+        writer.close()
+        with suppress(ConnectionError):
+            await writer.wait_closed()
+        if trace is not None:
+            tracer.save(trace)
+
+
+async def serve(host=None, port=8023, unix=None, mode="typewriter",
+                scale=1.0, trace=None, timeout=None):
+    """
+    Accepts players until stopped, each plays their own game.
+
+    param host (str): address to listen on, every address if None.
+    param port (int): TCP port to listen on.
+    param unix (str): if set, listen on a unix socket at this path instead.
+
+    The remaining parameters are as for session().
+    """
+    async def handle(reader, writer):
+        await session(reader, writer, mode, scale, trace, timeout)
+
+    if unix is not None:
+        server = await asyncio.start_unix_server(handle, unix)
+    else:
+        server = await asyncio.start_server(handle, host, port)
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Serve the dental RPG to many players at once.")
+    render_mode, scale = get_render_mode()
+    parser.add_argument("--host", default=None)
+    parser.add_argument("--port", type=int, default=8023)
+    parser.add_argument("--unix", metavar="PATH",
+                        help="listen on a unix socket instead of TCP")
+    parser.add_argument("--render", choices=RENDER_MODES, default=render_mode,
+                        help="how text is printed (default typewriter)")
+    parser.add_argument("--scale", type=render_scale, default=scale,
+                        help="multiplies text delays in scaled mode")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="time each game, appending the traces to FILE")
+    parser.add_argument("--timeout", type=float, default=None,
+                        metavar="SECONDS",
+                        help="answer for players who take longer than this "
+                             "at a prompt")
+    args = parser.parse_args()
+    with suppress(KeyboardInterrupt):
+        asyncio.run(serve(args.host, args.port, args.unix, args.render,
+                          args.scale, args.trace, args.timeout))
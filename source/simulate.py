@@ -0,0 +1,215 @@
+##
+# simulate.py
+# Date: 18/10/2026
+# Author: Ryan Gordon
+# Runs headless battles in bulk to check the balance of the dental RPG
+
+import io
+import random
+from collections import Counter
+from itertools import product
+from multiprocessing import Pool
+from engine import resolve, DAMAGE
+from battle_log import LogWriter
+from player import Player
+from opponent import Opponent
+from boss import Boss
+from constants import STAGE_OPPONENTS, BOSSES, VALID_STATS
+
+
+def stat_loadouts():
+    """
+    Returns every set of character stats Player can be created with.
+
+    Users cannot be either good or bad at everything, so those are left out.
+    """
+    loadouts = []
+    for combination in product(VALID_STATS.values(), repeat=3):
+        if combination.count("good") < 3 and combination.count("bad") < 3:
+            loadouts.append(dict(zip(("self discipline", "agility",
+                                      "teeth strength"), combination)))
+    return loadouts
+
+
+def matchups():
+    """
+    Returns every (stage, enemy name) pairing that can occur in a battle.
+
+    Bosses have a stage of None.
+    """
+    pairings = []
+    for stage, names in STAGE_OPPONENTS.items():
+        for name in names:
+            pairings.append((stage, name))
+    for name in BOSSES:
+        pairings.append((None, name))
+    return pairings
+
+
+def play_fight(stage, name, stats, seed, level=1, defence=0, log=None):
+    """
+    Plays out one headless battle.
+
+    The same arguments always play out the same battle, so any simulated
+    battle can be replayed from its seed.
+
+    param stage (int): stage of the opponent, None for a boss.
+    param name (str): name of the opponent or boss.
+    param stats (dict): character stats of the user.
+    param seed (int): seeds every random choice in the battle.
+    param level (int): level of the user.
+    param defence (int): defence added to the user.
+    param log (LogWriter): if set, the battle is recorded to it.
+
+    return (BattleResult): outcome of the battle.
+    """
+    rng = random.Random(seed)
+    user = Player("Simulated", stats, rng)
+    for _ in range(level - 1):
+        user.gain_level()
+    user.increase_defence(defence)
+    if stage is not None:
+        enemy = Opponent(stage, name, rng)
+    else:
+        enemy = Boss(name, rng)
+    if log is not None:
+        log.start(user, enemy)
+    result = resolve(user, enemy, rng=rng, schedule=enemy.schedule)
+    if log is not None:
+        log.events(result.log)
+        log.end(result.won, result.turns)
+    return result
+
+
+def run_shard(task):
+    """
+    Plays out a number of battles for one matchup.
+
+    Run in a worker process, each battle is seeded from the shard seed so the
+    results are repeatable.
+
+    param task (tuple): stage, enemy name, number of battles, shard seed,
+        first loadout index, user level, user defence and whether to record
+        the battles.
+
+    return (tuple): matchup, number of wins, counters of the turns taken to
+        win, damage dealt per hit and damage taken per hit, and the recorded
+        battles (empty if not recorded).
+    """
+    stage, name, count, seed, first, level, defence, record = task
+    shard_rng, loadouts = random.Random(seed), stat_loadouts()
+    records = io.BytesIO()
+    log = LogWriter(records, header=False) if record else None
+    wins, turns, dealt, taken = 0, Counter(), Counter(), Counter()
+    for fight in range(first, first + count):
+        result = play_fight(stage, name, loadouts[fight % len(loadouts)],
+                            shard_rng.getrandbits(64), level, defence, log)
+        if result.won:
+            wins += 1
+            turns[result.turns] += 1
+        for event in result.log:
+            if event[0] == DAMAGE:
+                (dealt if event[1] == "user" else taken)[event[3]] += 1
+    return (stage, name), wins, turns, dealt, taken, records.getvalue()
+
+
+def percentile(counter, fraction):
+    """Returns the value below which the given fraction of counts fall."""
+    total, seen = sum(counter.values()), 0
+    for value in sorted(counter):
+        seen += counter[value]
+        if seen >= fraction * total:
+            return value
+    return None
+
+
+def mean(counter):
+    """Returns the mean of the counted values."""
+    total = sum(counter.values())
+    if total == 0:
+        return None
+    return sum(value * count for value, count in counter.items()) / total
+
+
+def simulate(fights, seed=0, processes=None, shard_size=1000, level=1,
+             defence=0, log=None):
+    """
+    Runs battles for every matchup across a pool of worker processes.
+
+    param fights (int): number of battles per matchup, loadouts are cycled
+        through evenly.
+    param seed (int): base seed each shard seed is derived from.
+    param processes (int): number of worker processes, one per core if None.
+    param shard_size (int): number of battles given to a worker at a time.
+    param level (int): level of the simulated users.
+    param defence (int): defence added to the simulated users.
+    param log (file): if set, every battle is recorded to this binary file.
+
+    return (dict): for each matchup, number of wins and the counters of turns
+        and damage from run_shard().
+    """
+    tasks = []
+    for stage, name in matchups():
+        for first in range(0, fights, shard_size):
+            shard_seed = f"{seed}:{stage}:{name}:{first}"
+            tasks.append((stage, name, min(shard_size, fights - first),
+                          shard_seed, first, level, defence,
+                          log is not None))
+    if log is not None:
+        LogWriter(log)
+    results = {}
+    with Pool(processes) as pool:
+        for matchup, wins, turns, dealt, taken, records in \
+                pool.imap_unordered(run_shard, tasks):
+            if log is not None:
+                log.write(records)
+            if matchup not in results:
+                results[matchup] = [0, Counter(), Counter(), Counter()]
+            totals = results[matchup]
+            totals[0] += wins
+            totals[1].update(turns)
+            totals[2].update(dealt)
+            totals[3].update(taken)
+    return results
+
+
+def print_report(results, fights):
+    """Prints a table summarising the simulated battles."""
+    print(f"{'stage':<6}{'enemy':<18}{'win %':>7}{'turns':>7}{'p50':>5}"
+          f"{'p90':>5}{'dealt':>7}{'p90':>5}{'taken':>7}{'p90':>5}")
+    for (stage, name), (wins, turns, dealt, taken) in sorted(
+            results.items(), key=lambda item: (item[0][0] or 99, item[0][1])):
+        row = [mean(turns), percentile(turns, 0.5), percentile(turns, 0.9),
+               mean(dealt), percentile(dealt, 0.9), mean(taken),
+               percentile(taken, 0.9)]
+        row = ["-" if value is None else round(value, 1) for value in row]
+        print(f"{stage or 'boss':<6}{name:<18}{100 * wins / fights:>7.1f}"
+              f"{row[0]:>7}{row[1]:>5}{row[2]:>5}{row[3]:>7}{row[4]:>5}"
+              f"{row[5]:>7}{row[6]:>5}")
+
+
+if __name__ == "__main__":
+    # Only needed to run from the command line, not in worker processes
+    import argparse
+    parser = argparse.ArgumentParser(
+        description="Simulate battles for every matchup in the dental RPG.")
+    parser.add_argument("-n", "--fights", type=int, default=1000,
+                        help="battles per matchup")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--shard-size", type=int, default=1000)
+    parser.add_argument("--level", type=int, default=1,
+                        help="level of the simulated users")
+    parser.add_argument("--defence", type=int, default=0,
+                        help="defence added to the simulated users")
+    parser.add_argument("--log", metavar="FILE",
+                        help="record every battle to a binary log file")
+    args = parser.parse_args()
+    log = open(args.log, "wb") if args.log is not None else None
+    try:
+        print_report(simulate(args.fights, args.seed, args.processes,
+                              args.shard_size, args.level, args.defence, log),
+                     args.fights)
+    finally:
+        if log is not None:
+            log.close()
@@ -0,0 +1,318 @@
+##
+# solver.py
+# Date: 18/10/2026
+# Author: Ryan Gordon
+# Works out the exact odds of a battle in the dental RPG
+
+from collections import OrderedDict
+from functools import lru_cache
+from content import EFFECTIVE
+from constants import EVENT_WEIGHTS
+from damage import BASES, LOWS, HIGHS, EFFECT_CLASSES, apply_damage
+import battle_functions as fn
+
+# Random events the solver can model, the rest change the attacks or damage
+# bonuses of the combatants which would make the battle too big to solve
+SOLVABLE_EVENTS = (fn.compromise_attack, fn.gust)
+
+
+@lru_cache(maxsize=None)
+def damage_distribution(extra_damage, damage_adjust, defence, effect,
+                        critical=False):
+    """
+    Returns every damage an attack can do along with its probability.
+
+    Uses the same rolls as damage.roll_damage(), parameters are the same.
+
+    return (tuple): (damage, probability) pairs.
+    """
+    base = BASES[effect] + extra_damage
+    rolls = range(base + LOWS[effect], base + HIGHS[effect] + 1)
+    # A critical hit needs a roll out of 100 greater than 90
+    crit_chance = 10 / 101 if critical and effect == EFFECTIVE else 0
+    distribution = {}
+    for roll in rolls:
+        for is_critical, chance in ((False, 1 - crit_chance),
+                                    (True, crit_chance)):
+            if chance:
+                damage = int(apply_damage(roll, damage_adjust, defence,
+                                          is_critical))
+                distribution[damage] = distribution.get(damage, 0) + \
+                    chance / len(rolls)
+    return tuple(distribution.items())
+
+
+def solve_linear(matrix, vectors):
+    """
+    Solves matrix * x = vector by Gaussian elimination for each vector.
+
+    return (list): x for each vector.
+    """
+    size, width = len(matrix), len(matrix) + len(vectors)
+    rows = [list(matrix[row]) + [vector[row] for vector in vectors]
+            for row in range(size)]
+    for column in range(size):
+        pivot = max(range(column, size),
+                    key=lambda row: abs(rows[row][column]))
+        if abs(rows[pivot][column]) < 1e-12:
+            raise ValueError("the battle can go on forever")
+        rows[column], rows[pivot] = rows[pivot], rows[column]
+        for row in range(size):
+            if row != column and rows[row][column]:
+                factor = rows[row][column] / rows[column][column]
+                for index in range(column, width):
+                    rows[row][index] -= factor * rows[column][index]
+    return [[rows[row][size + vector] / rows[row][row] for row in range(size)]
+            for vector in range(len(vectors))]
+
+
+class MatchupSolver:
+    """
+    Solves a battle between a fixed user and enemy exactly.
+
+    The battle is a Markov process over (user health, enemy health, turn,
+    compromised attack, random event due). Health never goes up, so states
+    are solved one pair of healths at a time, from the lowest up, with the
+    states that keep both healths (missed attacks) solved together.
+
+    Both sides are taken to pick their attacks at random, as
+    engine.random_policy() does, so the odds are those of a user playing
+    that way. Random events are taken to be equally likely, so battles with
+    weighted events are refused rather than given the wrong odds.
+    """
+
+    def __init__(self, user, enemy, random_events=(), event_chance=60,
+                 cache_size=65536, event_weights=None):
+        """
+        param user (tuple): extra damage, defence, attacks and the
+            effectiveness class of each enemy attack against the user.
+        param enemy (tuple): extra damage, defence, attacks and the
+            effectiveness class of each user attack against the enemy.
+        param random_events (tuple): random events that can take place, each
+            has to be in SOLVABLE_EVENTS.
+        param event_chance (int): as for engine.fight().
+        param cache_size (int): most health pairs kept in the cache, those
+            used least recently are dropped first. Solves slow down a lot if
+            it can't hold a few rows of healths as high as the enemy's.
+        param event_weights (dict): how likely each event is to be chosen
+            relative to the others, as for events.EventSchedule.
+        """
+        for event in random_events:
+            if event not in SOLVABLE_EVENTS:
+                raise ValueError(f"can't solve battles with {event.__name__}")
+        event_weights = event_weights or {}
+        if len({event_weights.get(event, 1)
+                for event in random_events}) > 1:
+            raise ValueError("can't solve battles with weighted events")
+        self.user, self.enemy = user, enemy
+        self.random_events = random_events
+        self.event_chance = (100 - event_chance) / 101
+        # Every turn state for a pair of healths, user turns can start with
+        # an attack compromised during the enemy turn
+        self.turn_states = [("computer", None, due) for due in (False, True)]
+        for attack in (None,) + user[2]:
+            self.turn_states += [("user", attack, due)
+                                 for due in (False, True)]
+        self.state_indexes = {state: index for index, state in
+                              enumerate(self.turn_states)}
+        # Outcomes of a turn don't depend on health so are worked out once,
+        # grouped by the damage dealt to each side
+        self.turn_outcomes = []
+        for state in self.turn_states:
+            grouped = {}
+            for chance, user_damage, enemy_damage, next_state in \
+                    self.outcomes(*state):
+                grouped.setdefault((user_damage, enemy_damage), []).append(
+                    (self.state_indexes[next_state], chance))
+            self.turn_outcomes.append(tuple(
+                (user_damage, enemy_damage, tuple(chances),
+                 sum(chance for _, chance in chances))
+                for (user_damage, enemy_damage), chances in grouped.items()))
+        # Solved health pairs, reused by later battles
+        self.cache_size, self.solved = cache_size, OrderedDict()
+
+    def outcomes(self, turn, compromised, event_due):
+        """
+        Returns every outcome of a turn with its probability.
+
+        return (list): (probability, damage to the user, damage to the enemy,
+            next turn state) tuples, outcomes that lead to the same place are
+            combined.
+        """
+        if event_due and self.random_events:
+            starts = []
+            for event in self.random_events:
+                chance = 1 / len(self.random_events)
+                if event is fn.gust:
+                    starts.append((chance, 2, compromised and {compromised}))
+                else:
+                    for attack in self.user[2]:
+                        starts.append((chance / len(self.user[2]), 1,
+                                       {attack} | (compromised and
+                                                   {compromised} or set())))
+        else:
+            starts = [(1, 1, compromised and {compromised})]
+        outcomes = {}
+        for chance, adjust, compromised in starts:
+            compromised = compromised or set()
+            if turn == "user":
+                extra, _, attacks, _ = self.user
+                working = [attack for attack in attacks
+                           if attack not in compromised] or attacks
+                hits = [(attack, self.enemy[3][attack], True, self.enemy[1])
+                        for attack in working]
+                # Compromised attacks are fixed after the user turn
+                follow_on = None
+            else:
+                extra, _, attacks, _ = self.enemy
+                hits = [(attack, self.user[3][attack], False, self.user[1])
+                        for attack in attacks]
+                # Only one attack can be compromised before a user turn
+                follow_on = next(iter(compromised), None)
+            for attack, effect, critical, defence in hits:
+                for damage, damage_chance in damage_distribution(
+                        extra, adjust, defence, effect, critical):
+                    chance_now = chance / len(hits) * damage_chance
+                    next_turn = "computer" if turn == "user" else "user"
+                    for due, due_chance in ((True, self.event_chance),
+                                            (False, 1 - self.event_chance)):
+                        outcome = (0 if turn == "user" else damage,
+                                   damage if turn == "user" else 0,
+                                   (next_turn, follow_on, due))
+                        outcomes[outcome] = outcomes.get(outcome, 0) + \
+                            chance_now * due_chance
+        return [(chance,) + outcome for outcome, chance in outcomes.items()]
+
+    def later_healths(self, user_health, enemy_health):
+        """Returns the pairs of healths a turn can leave both sides on."""
+        return {(user_health - user_damage, enemy_health - enemy_damage)
+                for outcomes in self.turn_outcomes
+                for user_damage, enemy_damage, _, _ in outcomes
+                if enemy_health > enemy_damage and user_health > user_damage
+                and (user_damage or enemy_damage)}
+
+    def solve_healths(self, user_health, enemy_health):
+        """
+        Solves every turn state for a pair of healths.
+
+        The pairs of healths it depends on are found first, then solved from
+        the lowest healths up so the pairs each one reads were solved
+        recently and are still in the cache. Stacks are used rather than
+        recursion so there's no limit on how high healths go.
+
+        return (list, list): win probability and expected remaining turns,
+            indexed the same as the turn states.
+        """
+        solved, needed = self.solved, set()
+        stack = [(user_health, enemy_health)]
+        while stack:
+            healths = stack.pop()
+            if healths not in needed and healths not in solved:
+                needed.add(healths)
+                stack.extend(self.later_healths(*healths))
+        # Lowest healths last, so they're taken off the stack first
+        stack = sorted(needed, reverse=True)
+        while stack:
+            healths = stack[-1]
+            if healths in solved:
+                solved.move_to_end(healths)
+                stack.pop()
+                continue
+            dropped = [later for later in self.later_healths(*healths)
+                       if later not in solved]
+            if dropped:
+                # Dropped from the cache before being read, solved again
+                stack.extend(sorted(dropped, reverse=True))
+            else:
+                solved[healths] = self.solve_pair(*healths)
+                if len(solved) > self.cache_size:
+                    solved.popitem(last=False)
+                stack.pop()
+        return solved[user_health, enemy_health]
+
+    def solve_pair(self, user_health, enemy_health):
+        """
+        Solves every turn state for a pair of healths, once every pair of
+        healths a turn can leave both sides on has been solved.
+
+        return (list, list): as for solve_healths().
+        """
+        size = len(self.turn_states)
+        matrix = [[float(row == column) for column in range(size)]
+                  for row in range(size)]
+        wins, turns, missed = [0.0] * size, [1.0] * size, False
+        for row, outcomes in enumerate(self.turn_outcomes):
+            for user_damage, enemy_damage, chances, total in outcomes:
+                if enemy_health <= enemy_damage:
+                    wins[row] += total
+                elif user_health <= user_damage:
+                    continue
+                elif user_damage == 0 and enemy_damage == 0:
+                    # Missed attack, solved alongside this state
+                    missed = True
+                    for index, chance in chances:
+                        matrix[row][index] -= chance
+                else:
+                    later = (user_health - user_damage,
+                             enemy_health - enemy_damage)
+                    self.solved.move_to_end(later)
+                    later_wins, later_turns = self.solved[later]
+                    for index, chance in chances:
+                        wins[row] += chance * later_wins[index]
+                        turns[row] += chance * later_turns[index]
+        if missed:
+            wins, turns = solve_linear(matrix, (wins, turns))
+        return wins, turns
+
+    def solve(self, user_health, enemy_health, turn=None):
+        """
+        Returns the win probability and expected turns of a fresh battle.
+
+        param turn (str): who strikes first, equally likely if not specified.
+        """
+        wins, turns = self.solve_healths(user_health, enemy_health)
+        firsts = ("user", "computer") if turn is None else (turn,)
+        indexes = [self.state_indexes[(first, None, False)]
+                   for first in firsts]
+        return (sum(wins[index] for index in indexes) / len(indexes),
+                sum(turns[index] for index in indexes) / len(indexes))
+
+
+def snapshot(user, enemy):
+    """Returns the parts of the user and enemy that matter to the solver."""
+    return ((user.extra_damage, user.defence, tuple(user.attacks),
+             {attack: EFFECT_CLASSES[effect]
+              for attack, effect in user.affected_by.items()}),
+            (enemy.extra_damage, enemy.defence, tuple(enemy.attacks),
+             {attack: enemy.effectiveness(attack) for attack in user.attacks}))
+
+
+@lru_cache(maxsize=64)
+def cached_solver(user, enemy, random_events, event_chance):
+    """Returns a solver for the matchup, reused for identical matchups."""
+    return MatchupSolver((user[0], user[1], user[2], dict(user[3])),
+                         (enemy[0], enemy[1], enemy[2], dict(enemy[3])),
+                         random_events, event_chance,
+                         event_weights=EVENT_WEIGHTS)
+
+
+def solve(user, enemy, turn=None, random_events=(), event_chance=60):
+    """
+    Works out the odds of a battle from the current state of both sides.
+
+    param user (Player): the user, at their current health.
+    param enemy (object): the opponent or boss, at its current health.
+    param turn (str): who strikes first, equally likely if not specified.
+    param random_events (tuple): random events that can take place, each has
+        to be in SOLVABLE_EVENTS and equally likely in the content pack.
+    param event_chance (int): as for engine.fight().
+
+    return (float, float): probability of the user winning and the expected
+        number of turns.
+    """
+    user_stats, enemy_stats = snapshot(user, enemy)
+    solver = cached_solver(
+        user_stats[:3] + (tuple(sorted(user_stats[3].items())),),
+        enemy_stats[:3] + (tuple(sorted(enemy_stats[3].items())),),
+        tuple(random_events), event_chance)
+    return solver.solve(user.health, enemy.health, turn)
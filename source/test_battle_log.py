@@ -0,0 +1,49 @@
+##
+# test_battle_log.py
+# Date: 18/10/2026
+# Author: Ryan Gordon
+# Checks battles read back from a binary log match the battles played
+
+import io
+import pytest
+from battle_log import LogWriter, read_battles, read_log, encode, RECORD
+from constants import STAGES, BOSSES
+from simulate import play_fight
+
+STATS = {"self discipline": "meh", "agility": "good", "teeth strength": "bad"}
+
+# A battle with every stage of opponent and every boss, for their events
+MATCHUPS = [(stage, None) for stage in STAGES] + \
+    [(None, name) for name in BOSSES]
+
+
+def record():
+    """Plays and logs a battle of each matchup, returns the log and them."""
+    stream, results = io.BytesIO(), []
+    log = LogWriter(stream)
+    for seed, (stage, name) in enumerate(MATCHUPS):
+        results.append(play_fight(stage, name, STATS, seed, 2, 1, log))
+    return stream.getvalue(), results
+
+
+def test_round_trip():
+    data, results = record()
+    battles = list(read_battles(io.BytesIO(data)))
+    assert len(battles) == len(results)
+    for battle, result in zip(battles, results):
+        assert battle[0][0] == "start"
+        assert battle[-1] == ("end", result.won, result.turns)
+        stored = [event for event in result.log if encode(event)]
+        assert len(battle) == len(stored) + 2
+        assert battle[1:-1] == stored
+    # Random events are stored too
+    assert any(event[0] == "event" for battle in battles
+               for event in battle)
+
+
+def test_bad_logs():
+    data, _ = record()
+    with pytest.raises(ValueError):
+        list(read_log(io.BytesIO(b"DHRL\x00" + data[5:])))
+    with pytest.raises(ValueError):
+        list(read_log(io.BytesIO(data[:-RECORD.size // 2])))
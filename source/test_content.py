@@ -0,0 +1,104 @@
+##
+# test_content.py
+# Date: 18/10/2026
+# Author: Ryan Gordon
+# Checks content packs are validated before the game uses them
+
+import copy
+import json
+import pytest
+from content import CONTENT_PATH, PACK_DEFAULTS, validate
+
+with open(CONTENT_PATH, encoding="utf-8") as pack:
+    PACK = json.load(pack)
+
+
+def opponent(data):
+    """Returns the first opponent of a pack."""
+    return data["opponents"][0]
+
+
+def boss(data):
+    """Returns the first boss of a pack."""
+    return data["bosses"][0]
+
+
+# Each change that breaks a pack, with part of the error it gives
+BAD_PACKS = [
+    (lambda data: data.pop("stages"), "stages must be"),
+    (lambda data: data.update(opponents={}), "opponents must be"),
+    (lambda data: data["mob attacks"].append(3), "attacks must be named"),
+    (lambda data: data["mob attacks"].append(data["mob attacks"][0]),
+     "repeats a name"),
+    (lambda data: data["player attacks"].append(data["mob attacks"][0]),
+     "both a mob and a player attack"),
+    (lambda data: data["opponents"].append([]), "must be an object"),
+    (lambda data: opponent(data).update(colour="red"), "unknown field"),
+    (lambda data: opponent(data).update(messages=[]), "unknown field"),
+    (lambda data: opponent(data).pop("health"), "is missing health"),
+    (lambda data: opponent(data).update(health="lots"), "a whole number"),
+    (lambda data: opponent(data).update(health=True), "a whole number"),
+    (lambda data: opponent(data).update(health=0), "some health"),
+    (lambda data: opponent(data).update(level=0), "at least 1"),
+    (lambda data: opponent(data).update(defence=-1), "can't be negative"),
+    (lambda data: opponent(data).update({"spawn weight": 0}), "above 0"),
+    (lambda data: opponent(data).update(attacks=[]), "at least one attack"),
+    (lambda data: opponent(data).update(attacks=["Hug"]), "unknown 'Hug'"),
+    (lambda data: opponent(data).update(weaknesses=data["mob attacks"][:1]),
+     "unknown"),
+    (lambda data: opponent(data).update(
+        weaknesses=data["player attacks"][:1],
+        strengths=data["player attacks"][:1]), "both weak and strong"),
+    (lambda data: data["opponents"].append(dict(opponent(data))),
+     "names must be unique"),
+    (lambda data: data.update(bosses=[]), "at least one boss"),
+    (lambda data: boss(data).update(messages=["coke_start"]),
+     "an encounter and a death message"),
+    (lambda data: boss(data).update(messages=["shout", "whisper"]),
+     "unknown 'shout'"),
+    (lambda data: boss(data).update({"later events": ["explode"]}),
+     "unknown 'explode'"),
+    (lambda data: [monster.update(level=2) for monster in data["opponents"]],
+     "level 1"),
+    (lambda data: data["stages"].update({"0": [1]}), "a number from 1"),
+    (lambda data: data["stages"].update({"9": [1]}), "numbered 1, 2, 3"),
+    (lambda data: data["stages"].update({"1": []}), "levels that opponents"),
+    (lambda data: data["stages"].update({"1": [99]}),
+     "levels that opponents"),
+    (lambda data: data["random events"].append("explode"), "unknown"),
+    (lambda data: data.update({"event chance": "often"}), "a whole number"),
+    (lambda data: data.update({"event chance": 101}), "from 0 to 100"),
+    (lambda data: boss(data).update({"event chance": -1}), "from 0 to 100"),
+    (lambda data: data.update({"event weights": {"explode": 1}}),
+     "unknown 'explode'"),
+    (lambda data: data.update({"event weights": {
+        data["random events"][0]: 0}}), "above 0"),
+    (lambda data: data.update({"attack effects": {"effective": 1}}),
+     "attack effects needs"),
+    (lambda data: data.update({"attack effects": {"effective": -1,
+                                                  "weak": 0}}),
+     "attack effects needs"),
+    (lambda data: data.update({"attack effects": {
+        "effective": len(data["mob attacks"]), "weak": 1}}),
+     "more than the mob attacks"),
+]
+
+
+def test_shipped_pack():
+    checked = validate(copy.deepcopy(PACK))
+    assert sorted(checked["stages"]) == list(range(1, len(PACK["stages"]) + 1))
+    for section, default in PACK_DEFAULTS.items():
+        assert checked[section] == PACK.get(section, default)
+
+
+def test_not_an_object():
+    with pytest.raises(ValueError, match="JSON object"):
+        validate([])
+
+
+@pytest.mark.parametrize("change, message", BAD_PACKS)
+def test_bad_pack(change, message):
+    data = copy.deepcopy(PACK)
+    change(data)
+    with pytest.raises(ValueError, match=message):
+        validate(data)
@@ -0,0 +1,64 @@
+##
+# test_damage.py
+# Date: 18/10/2026
+# Author: Ryan Gordon
+# Checks single and batched damage rolls agree when given the same rolls
+
+from itertools import product
+import pytest
+from content import NEUTRAL, EFFECTIVE, WEAK
+from damage import BASES, LOWS, HIGHS, roll_damage, roll_damages
+
+# Batched rolls need NumPy
+np = pytest.importorskip("numpy")
+
+
+class FixedRandom:
+    """Stands in for random.Random, giving back the rolls it was made with."""
+
+    def __init__(self, rolls):
+        self.rolls, self.asked = list(rolls), []
+
+    def randint(self, low, high):
+        self.asked.append((low, high))
+        return self.rolls.pop(0)
+
+
+class FixedGenerator:
+    """Stands in for numpy.random.Generator in the same way."""
+
+    def __init__(self, *rolls):
+        self.rolls, self.asked = list(rolls), []
+
+    def integers(self, low, high, size=None, endpoint=False):
+        assert endpoint
+        self.asked.append((np.broadcast_to(low, np.shape(self.rolls[0])),
+                           np.broadcast_to(high, np.shape(self.rolls[0]))))
+        return self.rolls.pop(0)
+
+
+def test_same_rolls_same_damage():
+    cases = []
+    for extra, adjust, defence, effect, critical in product(
+            (0, 3), (1, 2), (0, 5, 40), (NEUTRAL, EFFECTIVE, WEAK),
+            (False, True)):
+        base = BASES[effect] + extra
+        for roll in range(base + LOWS[effect], base + HIGHS[effect] + 1):
+            # Critical hits need more than 90 out of 100
+            for crit_roll in (0, 90, 91, 100):
+                cases.append((extra, adjust, defence, effect, critical, roll,
+                              crit_roll))
+    columns = [np.array(column) for column in zip(*cases)]
+    generator = FixedGenerator(columns[5], columns[6])
+    damages, criticals = roll_damages(generator, *columns[:5])
+    for number, (*stats, roll, crit_roll) in enumerate(cases):
+        rng = FixedRandom((roll, crit_roll))
+        damage, critical = roll_damage(*stats, rng=rng)
+        assert (damage, critical) == (damages[number], criticals[number])
+        # Both ask for rolls from the same ranges
+        assert rng.asked[0] == (generator.asked[0][0][number],
+                                generator.asked[0][1][number])
+        if len(rng.asked) > 1:
+            assert rng.asked[1] == (0, 100)
+    assert criticals.any() and not criticals.all()
+    assert (damages == 0).any()
@@ -0,0 +1,42 @@
+##
+# test_events.py
+# Date: 18/10/2026
+# Author: Ryan Gordon
+# Checks random event schedules cope with missing phases of events
+
+import random
+import battle_functions as fn
+from engine import resolve, random_policy
+from events import EventSchedule, START, LATER
+from player import Player
+from opponent import Opponent
+
+STATS = {"self discipline": "meh", "agility": "meh", "teeth strength": "meh"}
+
+
+def play(**events):
+    """Plays a battle with the given random events, returns the result."""
+    rng = random.Random(1)
+    user = Player("Tester", STATS, rng)
+    return resolve(user, Opponent(1, rng=rng), random_policy, rng=rng,
+                   **events)
+
+
+def test_no_events():
+    schedule = EventSchedule()
+    assert schedule.phases == (None, None)
+    assert schedule.events(LATER) == ()
+    assert play().turns > 0
+
+
+def test_only_later_events():
+    schedule = EventSchedule((), (fn.gust,))
+    assert schedule.phases[START] is None
+    assert schedule.events(LATER) == (fn.gust,)
+    assert play(later_events=(fn.fizz,)).turns > 0
+
+
+def test_later_phase_reuses_start():
+    schedule = EventSchedule((fn.gust, fn.gust), (fn.gust,))
+    assert schedule.phases[LATER] is schedule.phases[START]
+    assert schedule.events(START) == (fn.gust,)
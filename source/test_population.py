@@ -0,0 +1,31 @@
+##
+# test_population.py
+# Date: 18/10/2026
+# Author: Ryan Gordon
+# Checks population simulations play the same game as single battles do
+
+from math import sqrt
+import pytest
+from simulate import simulate, mean
+from population import simulate_population
+
+# Populations need NumPy
+pytest.importorskip("numpy")
+
+FIGHTS = 2000
+
+
+def test_same_odds_as_simulate():
+    single = simulate(FIGHTS, 0, processes=1, level=2, defence=1)
+    batched = simulate_population(FIGHTS, 0, level=2, defence=1)
+    assert single.keys() == batched.keys()
+    for matchup, result in single.items():
+        single_rate = result[0] / FIGHTS
+        batched_rate = batched[matchup][0] / FIGHTS
+        # Different random numbers, so the rates only agree to within a few
+        # standard errors of their difference
+        error = sqrt(2 * single_rate * (1 - single_rate) / FIGHTS)
+        assert abs(single_rate - batched_rate) <= 4 * error + 0.005, matchup
+        if result[0] and batched[matchup][0]:
+            assert mean(batched[matchup][1]) == pytest.approx(
+                mean(result[1]), rel=0.1), matchup
@@ -0,0 +1,36 @@
+##
+# test_print_options.py
+# Date: 18/10/2026
+# Author: Ryan Gordon
+# Checks game text reaches the sinks it's written to
+
+import io
+from print_options import print_slow, print_line, print_red, set_sink, \
+     set_render_mode, get_render_mode, BatchingSink, MemorySink
+
+
+def test_memory_sink_keeps_text():
+    out, mode = MemorySink(), get_render_mode()
+    old_sink = set_sink(out)
+    set_render_mode("instant")
+    try:
+        print_slow("Victory!")
+        print_line("Your health: 10")
+        print_red("Enemy health: 2")
+    finally:
+        set_sink(old_sink)
+        set_render_mode(*mode)
+    assert out.getvalue() == "Victory!\nYour health: 10\nEnemy health: 2\n"
+
+
+def test_batching_sink_writes_in_chunks():
+    stream = io.StringIO()
+    out = BatchingSink(stream, size=10)
+    out.write("abc")
+    out.write("def")
+    assert stream.getvalue() == ""
+    out.write("ghij")
+    assert stream.getvalue() == "abcdefghij"
+    out.write("red", red=True)
+    out.flush()
+    assert stream.getvalue() == "abcdefghij\033[31mred\033[0m"
@@ -0,0 +1,52 @@
+##
+# test_savegame.py
+# Date: 18/10/2026
+# Author: Ryan Gordon
+# Checks saved games load back exactly as they were saved
+
+import pytest
+import savegame
+from game_context import GameContext
+from player import Player
+from savegame import dump_game, load_game, MAGIC
+
+STATS = {"self discipline": "good", "agility": "bad", "teeth strength": "meh"}
+
+
+def saved_game():
+    """Returns a game partway through, with a levelled up user."""
+    game = GameContext(-12345678901234567890)
+    game.user = Player("Tëster", STATS, game.rng)
+    game.user.gain_level()
+    game.user.increase_defence(2)
+    game.user.health -= 7
+    game.user.attacks.pop()
+    game.part = 3
+    # Leaves a gaussian stored in the generator state
+    game.rng.gauss(0, 1)
+    return game
+
+
+def test_round_trip():
+    game = saved_game()
+    loaded = load_game(dump_game(game))
+    assert dump_game(loaded) == dump_game(game)
+    assert (loaded.seed, loaded.part) == (game.seed, game.part)
+    for field in ("name", "stats", "level", "max_health", "health",
+                  "extra_damage", "defence", "attacks", "affected_by"):
+        assert getattr(loaded.user, field) == getattr(game.user, field)
+    # Carries on with the same random choices
+    assert [loaded.rng.gauss(0, 1) for _ in range(3)] == \
+        [game.rng.gauss(0, 1) for _ in range(3)]
+
+
+def test_not_a_save():
+    with pytest.raises(ValueError):
+        load_game(b"DHRS\x01" + dump_game(saved_game())[len(MAGIC):])
+
+
+def test_other_content_pack(monkeypatch):
+    data = dump_game(saved_game())
+    monkeypatch.setattr(savegame, "pack_digest", lambda: bytes(32))
+    with pytest.raises(ValueError, match="content pack"):
+        load_game(data)
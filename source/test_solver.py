@@ -0,0 +1,47 @@
+##
+# test_solver.py
+# Date: 18/10/2026
+# Author: Ryan Gordon
+# Checks the battle solver against matchups small enough to work out by hand
+
+import pytest
+import battle_functions as fn
+from content import NEUTRAL
+from solver import MatchupSolver
+
+# Neutral attacks roll 8 to 12, so against a defence of 11 only a roll of 12
+# does any damage: 1 in 5 attacks hit, for 1 damage
+CHIP = (0, 11, ("brush",), {"bite": NEUTRAL})
+ARMOURED = (0, 40, ("brush",), {"bite": NEUTRAL})
+ENEMY = (0, 11, ("bite",), {"brush": NEUTRAL})
+
+
+def test_only_the_user_can_hurt():
+    solver = MatchupSolver(ARMOURED, ENEMY)
+    # The user hits on their 5th turn on average, with enemy turns between
+    assert solver.solve(1, 1, "user") == pytest.approx((1, 9))
+    assert solver.solve(1, 1, "computer") == pytest.approx((1, 10))
+    assert solver.solve(1, 1) == pytest.approx((1, 9.5))
+
+
+def test_both_can_hurt():
+    solver = MatchupSolver(CHIP, ENEMY)
+    # Striking first wins 1/5 + (4/5)^2 / 5 + ... = 5/9 of the time, and
+    # each turn ends the battle 1 in 5 times
+    assert solver.solve(1, 1, "user") == pytest.approx((5 / 9, 5))
+    assert solver.solve(1, 1, "computer") == pytest.approx((4 / 9, 5))
+
+
+def test_small_cache_same_odds():
+    user = (2, 0, ("brush", "floss"), {"bite": NEUTRAL})
+    enemy = (0, 0, ("bite",), {"brush": NEUTRAL, "floss": NEUTRAL})
+    full = MatchupSolver(user, enemy, (fn.gust,))
+    small = MatchupSolver(user, enemy, (fn.gust,), cache_size=1000)
+    assert small.solve(60, 60) == pytest.approx(full.solve(60, 60))
+    assert len(small.solved) <= 1000
+
+
+def test_weighted_events_refused():
+    with pytest.raises(ValueError):
+        MatchupSolver(CHIP, ENEMY, (fn.gust, fn.compromise_attack),
+                      event_weights={fn.gust: 3})
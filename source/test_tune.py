@@ -0,0 +1,53 @@
+##
+# test_tune.py
+# Date: 18/10/2026
+# Author: Ryan Gordon
+# Checks the balance search on the smallest grids
+
+import json
+import pytest
+from tune import tune, evaluate, defaults, matchup_users
+
+# Populations need NumPy
+pytest.importorskip("numpy")
+
+TARGETS = {"1": 0.9, "Bottle of Coke": 0.5}
+
+
+def test_one_candidate(tmp_path):
+    cache = tmp_path / "tuning.jsonl"
+    ranges = {"base damage": [defaults()["base damage"]]}
+    ranked = tune(ranges, TARGETS, fights=40, rounds=3, keep=2, seed=4,
+                  processes=1, cache_path=str(cache))
+    assert len(ranked) == 1
+    total, params, rates = ranked[0]
+    assert params == (("base damage", ranges["base damage"][0]),)
+    assert rates.keys() == matchup_users().keys()
+    assert rates == evaluate((params, 40, 4))[1]
+    assert total == pytest.approx(
+        ((rates["1"] - 0.9) ** 2 / 2
+         + (rates["Bottle of Coke"] - 0.5) ** 2 / 2) ** 0.5)
+    # A lone candidate is done after the first round, and played again
+    # from the cache
+    assert len(cache.read_text().splitlines()) == 1
+    assert tune(ranges, TARGETS, fights=40, rounds=3, keep=2, seed=4,
+                processes=1, cache_path=str(cache)) == ranked
+    assert json.loads(cache.read_text())["rates"] == rates
+
+
+@pytest.mark.parametrize("ranges, targets, options", [
+    ({"base damage": [10]}, TARGETS, {"rounds": 0}),
+    ({"base damage": [10]}, TARGETS, {"keep": 0}),
+    ({"base damage": [10]}, TARGETS, {"fights": 0}),
+    ({"base damage": [10]}, {}, {}),
+    ({"base damage": [10]}, {"stage 9": 0.5}, {}),
+    ({"luck": [1]}, TARGETS, {}),
+    ({"base damage": []}, TARGETS, {}),
+    ({"base damage": [0]}, TARGETS, {}),
+    ({"level health": [-1]}, TARGETS, {}),
+    ({"level health": [1.5]}, TARGETS, {}),
+    ({"effective attacks": [50]}, TARGETS, {}),
+])
+def test_bad_searches(ranges, targets, options):
+    with pytest.raises(ValueError):
+        tune(ranges, targets, processes=1, **options)
@@ -0,0 +1,141 @@
+##
+# text.py
+# Date: 18/10/2026
+# Author: Ryan Gordon
+# Contains the prose of the dental hygiene RPG, only loaded when text is shown
+
+# Information about the effect of certain user attacks, .split() at asterisks
+ATTACK_HELP = {"blended kale": """
+Blended kale (/blɛndɪd keɪl/, noun, pl. blended kale)*
+Food can't get much better for your teeth than this. Way better than candy corn
+that's for sure. Encourage your patients to eat this whenever possible.""",
+               "scaler": """
+Scaler (/skeɪlɑ/, noun, pl. scalers)*
+Your patients probably know this as 'the scrapey tool'. We know it simply can't
+be beaten when it comes to getting rid of plaque buildups.""",
+               "dental floss": """
+Dental floss (/ˈdɛnt(ə)l flɒs/, noun, pl. dental floss)*
+Not many people use this nowadays, but its power isn't to be underestimated all
+the same. Looks like tough green string, very good for clearing stuck food from
+between your teeth. Recommend patients use daily, night is best. A preventative
+measure up there with toothpaste. Rumour has it it's most effective against any
+teeth not yet feeling the consequences of a sugary diet.""",
+               "toothpaste": """
+Toothpaste (/ˈtuːθpeɪst/, noun, pl. toothpastes)*
+Used twice a day, emphasis on night. Brush teeth with it to get rid of constant
+film of plaque that forms on teeth. A preventative measure most useful for foes
+not currently experiencing tooth decay, but about to.""",
+               "drill": """
+Drill (/drɪl/, noun, pl. drills)*
+Used for cutting away part of a tooth prior to filling it. Local anaesthetic is
+recommended, but not necessary.""",
+               "fluoridated water": """
+Fluoridated water (/ˈflʊərɪdeɪtɪd ˈwɔːtə/, noun, pl. fluoridated water)*
+Drinking water laced with fluoride. Present in most towns and cities of NZ with
+exceptions rapidly disappearing. The simplest preventative measure there is for
+tooth decay, people don't even notice it's there. Good for everything.""",
+               "dental pamphlet": """
+Dental pamphlet (/ˈdɛnt(ə)l ˈpamflɪt/, noun, pl. dental pamphlets)*
+Some things are just too hard to cure on the spot. Like broken teeth. Direct to
+a dentist with a studio ASAP."""}
+
+# Messages printed after an attack choice by either the user or opponent
+ATTACK_MESSAGES = {"bad brushing schedule": """
+They appear to be trying to influence your twice-a-day brushing schedule.""",
+                   "bad breath": """
+After weeks of no brushing they've developed an incredibly potent breath weapon
+ - bleurgh.""",
+                   "plaque": """
+Millions of bacteria swarm towards you and attack your teeth.""",
+                   "candy corn": """
+The worst offender - only food by the loosest definition. You can already taste
+the sugar as it flies towards you...""",
+                   "sugar": """
+Aack! The source of all plaque...""",
+                   "gum disease": """
+It looks like your enemy hasn't been brushing for a while and are turning their
+build-up of food on you.""",
+                   "toffee": """
+A spirited attempt to break your teeth with solid food...""",
+                   "coke": """
+Words fail you when you ponder this 'drink'. They used to make it with cocaine.
+It literally rots your innards along with your teeth.""",
+                   "blended kale": """
+You chuck something healthy at them - far better than what they're eating!""",
+                   "scaler": """
+You assail their plaque and try to get rid of it!""",
+                   "dental floss": """
+You clean their teeth of any food build-ups.""",
+                   "toothpaste": """
+A staple in dentistry.""",
+                   "drill": """
+You give your opponent a quick filling. Hopefully that hole should stop growing
+now.""",
+                   "fluoridated water": """
+Much better than whatever they've been drinking... and fortified with fluoride!
+You kind of can't go wrong.""",
+                   "dental pamphlet": """
+The best thing for them is to visit a dentist."""}
+
+# Messages printed after a battle, dependent on opponent
+BATTLE_END_MESSAGES = {"Plaque Monster": """
+Getting rid of the plaque with a scaler proved immensely successful.""",
+                       "Holey Tooth": """
+Good job repairing those fillings with that drill.""",
+                       "Rotten Tooth": """
+Removing their plaque with a scaler and converting them to fluoridated water is
+the way to go!""",
+                       "Chipped Tooth": """
+The best thing for them was to visit a dentist. Only so much you can do without
+the proper equipment...""",
+                       "Sugarholic Teeth": """
+A fearsome enemy - one convinced that sugar is amazing, but not yet feeling the
+consequences... the preventative measures toothpaste and dental floss proved to
+be a success.""",
+                       "Candy Corn": """
+My god that was a lot of sugar. Something healthier would be better...""",
+                       "L&P": """
+Why would anyone need anything more than water and fluoride..?"""}
+
+
+def handbook_entry(attack):
+    """Returns the handbook entry of an attack, .split() at the asterisk."""
+    return ATTACK_HELP.get(attack, f"""
+{attack.capitalize()}*
+The handbook has nothing to say about this one. Use your best judgement.""")
+
+
+def attack_message(attack):
+    """Returns the message printed after an attack is chosen."""
+    return ATTACK_MESSAGES.get(attack, f"\nOut comes the {attack}!")
+
+
+def battle_end_message(name):
+    """Returns the message printed after beating an opponent."""
+    return BATTLE_END_MESSAGES.get(name, f"""
+That's one less {name} to worry about.""")
+
+# Messages printed at the start and end of some specific battles
+FOREST_OUTSKIRTS_ENCOUNTER = (
+    ("It seems the dental theme isn't confined to the town... ", ''),
+    ("interesting...", "\n")
+    )
+
+FOREST_ENCOUNTER_MESSAGE = ((
+    ("'You've done well to get this far. ", ''),
+    ("Pity for you it's pointless.", '\n'),
+    ("\n'Things have been set in motion that you cannot stop.'", '\n')
+    ), (
+    ("'I'm just an underling... I don't know anything...", '\n'),
+    ("\n'Try heading to the watchtower in the hills... heh...'", '\n')
+    ))
+
+TOWER_ENCOUNTER_MESSAGE = ((
+    ("'Who dares approach with fluoridated water?!'", '\n'),
+    ("\n'I've come to find answers. Please could I have them?'", '\n'),
+    ("\n'Answers? HAH! You won't find any here. ", ''),
+    ("I'll deal with you myself, presumptious little upstart.'", '\n')
+    ), (
+    ("Your enemy glares at you even in death. ", ''),
+    ("They refused to divulge anything...", '\n')
+    ))
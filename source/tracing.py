@@ -0,0 +1,185 @@
+##
+# tracing.py
+# Date: 18/10/2026
+# Author: Ryan Gordon
+# Records where the time goes during a playthrough of the dental RPG
+
+import time
+from contextlib import nullcontext
+from contextvars import ContextVar
+from functools import wraps
+
+# Kinds of waiting, the rest of the time spent in a span is compute
+WAITS = ("input", "pause")
+
+
+class Tracer:
+    """
+    Records the wall time and number of calls of each named span of a game.
+
+    Time spent waiting for the user to answer and for text delays is kept
+    apart, for every span as well as in total, so it can be told apart from
+    time spent working.
+    """
+
+    def __init__(self, session=None, clock=time.perf_counter):
+        """
+        param session (str): identifies the game in the trace.
+        param clock (function): returns the current time in seconds.
+        """
+        self.session = session
+        self.clock = clock
+        self.started = time.time()
+        # Count, wall time, input wait and pause wait of each span
+        self.spans = {}
+        self.waited = [0.0] * len(WAITS)
+
+    def start(self, name):
+        """
+        Starts timing a span.
+
+        return (tuple): token to pass to stop() when the span ends.
+        """
+        return name, self.clock(), tuple(self.waited)
+
+    def stop(self, token):
+        """Stops timing a span started by start()."""
+        name, started, waited = token
+        totals = self.spans.setdefault(name, [0, 0.0] + [0.0] * len(WAITS))
+        totals[0] += 1
+        totals[1] += self.clock() - started
+        for kind in range(len(WAITS)):
+            totals[2 + kind] += self.waited[kind] - waited[kind]
+
+    def span(self, name):
+        """Returns a context manager timing a span."""
+        return Span(self, name)
+
+    def wait(self, kind, seconds):
+        """
+        Records time spent waiting.
+
+        param kind (str): one of WAITS.
+        """
+        index = WAITS.index(kind)
+        self.waited[index] += seconds
+        totals = self.spans.setdefault(kind, [0, 0.0] + [0.0] * len(WAITS))
+        totals[0] += 1
+        totals[1] += seconds
+        totals[2 + index] += seconds
+
+    def record(self):
+        """Returns the trace as a dictionary, ready to be saved as JSON."""
+        return {"session": self.session, "started": round(self.started, 3),
+                "spans": {name: [totals[0]] + [round(value, 6) for value
+                                               in totals[1:]]
+                          for name, totals in self.spans.items()}}
+
+    def save(self, path):
+        """Appends the trace to a file as a single line of JSON."""
+        # Only needed once a trace is saved, not by every game
+        import json
+        with open(path, "a", encoding="utf-8") as trace:
+            trace.write(json.dumps(self.record(), separators=(",", ":"))
+                        + "\n")
+
+
+class Span:
+    """Times a span of a Tracer from entering to exiting."""
+
+    __slots__ = ("tracer", "name", "token")
+
+    def __init__(self, tracer, name):
+        self.tracer, self.name = tracer, name
+
+    def __enter__(self):
+        self.token = self.tracer.start(self.name)
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.stop(self.token)
+
+
+# The tracer of the current game, if it's being traced, kept per context so
+# each game session can have its own
+tracer = ContextVar("tracer", default=None)
+
+
+def get_tracer():
+    """Returns the tracer of the current game, None if not being traced."""
+    return tracer.get()
+
+
+def set_tracer(new_tracer):
+    """Starts (or with None, stops) tracing games in the current context."""
+    tracer.set(new_tracer)
+
+
+def span(name):
+    """Returns a context manager timing a span, if the game is traced."""
+    current = tracer.get()
+    if current is None:
+        return nullcontext()
+    return Span(current, name)
+
+
+def traced(name):
+    """Decorates a coroutine function so each call is timed as a span."""
+    def decorate(function):
+        @wraps(function)
+        async def traced_function(*args, **kwargs):
+            with span(name):
+                return await function(*args, **kwargs)
+        return traced_function
+    return decorate
+
+
+def aggregate(lines):
+    """
+    Adds up traces saved by Tracer.save().
+
+    param lines (iterable): lines of a trace file.
+
+    return (int, dict): number of sessions, and the count and times of each
+        span over every session.
+    """
+    import json
+    sessions, spans = 0, {}
+    for line in lines:
+        if not line.strip():
+            continue
+        sessions += 1
+        for name, values in json.loads(line)["spans"].items():
+            totals = spans.setdefault(name, [0] * len(values))
+            for index, value in enumerate(values):
+                totals[index] += value
+    return sessions, spans
+
+
+def print_summary(sessions, spans):
+    """Prints a table of the aggregated spans, slowest compute first."""
+    print(f"{sessions} session{'s' if sessions != 1 else ''}")
+    print(f"{'span':<28}{'calls':>9}{'wall s':>10}{'input s':>10}"
+          f"{'pause s':>10}{'compute s':>11}{'mean ms':>9}")
+    rows = []
+    for name, (count, wall, *waits) in spans.items():
+        compute = 0.0 if name in WAITS else wall - sum(waits)
+        rows.append((compute, name, count, wall, waits))
+    for compute, name, count, wall, waits in sorted(rows, reverse=True):
+        print(f"{name:<28}{count:>9}{wall:>10.3f}{waits[0]:>10.3f}"
+              f"{waits[1]:>10.3f}{compute:>11.3f}"
+              f"{1000 * wall / count:>9.3f}")
+
+
+if __name__ == "__main__":
+    # Only needed to run from the command line
+    import argparse
+    parser = argparse.ArgumentParser(
+        description="Summarise traces of dental RPG games.")
+    parser.add_argument("traces", nargs="+", metavar="FILE")
+    args = parser.parse_args()
+    lines = []
+    for path in args.traces:
+        with open(path, encoding="utf-8") as trace:
+            lines.extend(trace)
+    print_summary(*aggregate(lines))
@@ -0,0 +1,353 @@
+##
+# tune.py
+# Date: 18/10/2026
+# Author: Ryan Gordon
+# Searches for balance constants giving target win rates in the dental RPG
+
+import hashlib
+import json
+import os
+from itertools import product
+from math import ceil, sqrt
+from multiprocessing import Pool
+from population import Population, fight_population, np
+from content import pack_digest
+from constants import BASE_DAMAGE, LEVEL_HEALTH, LEVEL_DAMAGE, \
+     AVAILABLE_EFFECTS, MONSTER_TEMPLATES, STAGES, BOSSES
+
+# Fields of the monster templates that can be tuned, by parameter name
+MONSTER_FIELDS = {"health": "health", "defence": "defence",
+                  "extra damage": "extra_damage"}
+
+# Defence of the user in every matchup, as after the first battle of a
+# campaign
+USER_DEFENCE = 2
+
+# Lowest value each parameter can sensibly take, monster fields go by the
+# field name
+MINIMUMS = {"base damage": 1, "level health": 0, "level damage": 0,
+            "effective attacks": 0, "weak attacks": 0, "health": 1,
+            "defence": 0, "extra damage": 0}
+
+
+def defaults():
+    """
+    Returns the current value of every parameter that can be tuned.
+
+    Effective and weak attacks are the number of each in AVAILABLE_EFFECTS,
+    monster parameters are named "<monster>: <field>".
+    """
+    values = {"base damage": BASE_DAMAGE, "level health": LEVEL_HEALTH,
+              "level damage": LEVEL_DAMAGE,
+              "effective attacks": AVAILABLE_EFFECTS.count(True),
+              "weak attacks": AVAILABLE_EFFECTS.count(False)}
+    for name, template in MONSTER_TEMPLATES.items():
+        for field, attribute in MONSTER_FIELDS.items():
+            values[f"{name}: {field}"] = getattr(template, attribute)
+    return values
+
+
+def matchup_users():
+    """
+    Returns every matchup a win rate is measured for.
+
+    Users face each stage at the level of its weakest opponents, and bosses
+    at the level they reach by the last stage. A user levels up once before
+    the stages with stronger opponents (from the local) and once more before
+    the boss, so in a campaign where they go over to the local that is the
+    level they're at when they get there. simulate.py takes the level as a
+    whole-run option instead, but tuning needs every stage at once.
+
+    return (dict): stage of the opponents (None for a boss), name of the
+        boss, and the level and defence of the user, by the name of the
+        matchup (the stage number, or the name of the boss).
+    """
+    matchups = {str(stage): (stage, None, min(levels), USER_DEFENCE)
+                for stage, levels in STAGES.items()}
+    last_level = max(min(levels) for levels in STAGES.values())
+    for name in BOSSES:
+        matchups[name] = (None, name, last_level, USER_DEFENCE)
+    return matchups
+
+
+def population_options(params):
+    """
+    Turns parameter values into keyword arguments for Population.
+
+    param params (dict): value of each parameter, the current value is used
+        for any not given.
+    """
+    values = {**defaults(), **params}
+    effective, weak = values["effective attacks"], values["weak attacks"]
+    templates = {name: template._replace(**{
+        attribute: values[f"{name}: {field}"]
+        for field, attribute in MONSTER_FIELDS.items()})
+        for name, template in MONSTER_TEMPLATES.items()}
+    return {"effects": (True,) * effective
+            + (None,) * (len(AVAILABLE_EFFECTS) - effective - weak)
+            + (False,) * weak,
+            "templates": templates, "base_damage": values["base damage"],
+            "level_health": values["level health"],
+            "level_damage": values["level damage"]}
+
+
+def evaluate(task):
+    """
+    Measures the win rate of every matchup with one set of parameters.
+
+    Run in a worker process. Every candidate plays from the same seeds, so
+    differences between them come from the parameters more than from luck.
+
+    param task (tuple): (parameter, value) pairs, battles per matchup and
+        the seed.
+
+    return (tuple, dict): the parameters, and the win rate of each matchup.
+    """
+    params, fights, seed = task
+    options, rates = population_options(dict(params)), {}
+    for number, (key, (stage, name, level, defence)) in enumerate(
+            matchup_users().items()):
+        generator = np.random.default_rng([seed, number])
+        won = fight_population(Population(
+            generator, fights, stage, name, level=level, defence=defence,
+            **options))[0]
+        rates[key] = float(won.mean())
+    return params, rates
+
+
+def fingerprint():
+    """Returns a digest of the content pack, results change along with it."""
+    return pack_digest().hex()
+
+
+def cache_key(params, fights, seed, content):
+    """
+    Returns the key the results of an evaluation are cached under.
+
+    Every parameter is included, current values too, so changing a constant
+    or the content pack doesn't reuse stale results.
+    """
+    values = sorted({**defaults(), **dict(params)}.items())
+    text = json.dumps([values, fights, seed, content,
+                       sorted(matchup_users().items())],
+                      separators=(",", ":"))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def load_cache(path):
+    """
+    Reads the win rates cached in a file by previous runs.
+
+    return (dict): win rates by cache key, empty if there's no file.
+    """
+    cache = {}
+    if path is None or not os.path.exists(path):
+        return cache
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # A run stopped partway through writing its last line
+                continue
+            cache[entry["key"]] = entry["rates"]
+    return cache
+
+
+def score(rates, targets):
+    """Returns how far win rates are from their targets, lower is better."""
+    return sqrt(sum((rates[key] - target) ** 2
+                    for key, target in targets.items()) / len(targets))
+
+
+def check_ranges(ranges):
+    """
+    Checks every value to try is one the game can be played with.
+
+    Raises ValueError describing the first that isn't.
+    """
+    current = defaults()
+    for name, values in ranges.items():
+        if name not in current:
+            raise ValueError(f"unknown parameter: {name}")
+        if not values:
+            raise ValueError(f"no values to try for {name}")
+        lowest = MINIMUMS[name.rsplit(": ", 1)[-1]]
+        for value in values:
+            if type(value) is not int or value < lowest:
+                raise ValueError(f"{name} must be a whole number of at "
+                                 f"least {lowest}, not {value!r}")
+
+
+def grid(ranges):
+    """
+    Returns every combination of parameter values.
+
+    Combinations with more effective and weak attacks than there are effects
+    to dole out are left out.
+
+    param ranges (dict): values to try for each parameter.
+
+    return (list): (parameter, value) pairs of each candidate, sorted.
+    """
+    names = sorted(ranges)
+    candidates = []
+    for values in product(*(ranges[name] for name in names)):
+        params = dict(zip(names, values))
+        effects = {**defaults(), **params}
+        if effects["effective attacks"] + effects["weak attacks"] \
+                > len(AVAILABLE_EFFECTS):
+            continue
+        candidates.append(tuple(sorted(params.items())))
+    return candidates
+
+
+def tune(ranges, targets, fights=1000, rounds=4, keep=3, seed=0,
+         processes=None, cache_path=None):
+    """
+    Searches a grid of parameters for those giving the target win rates.
+
+    Uses successive halving: every candidate is played with a few battles,
+    the best fraction of them go through to the next round with more
+    battles, and so on. Poor candidates are dropped before much is spent on
+    them.
+
+    param ranges (dict): values to try for each parameter, as named by
+        defaults().
+    param targets (dict): target win rate of each matchup, as named by
+        matchup_users().
+    param fights (int): battles per matchup in the first round.
+    param rounds (int): most rounds to play, fewer if one candidate is left.
+    param keep (int): one in this many candidates go through to the next
+        round, which plays this many times more battles.
+    param seed (int): seeds every battle.
+    param processes (int): number of worker processes, one per core if None.
+    param cache_path (str): if set, win rates are cached in this file, so
+        candidates already played aren't played again.
+
+    return (list): score, parameters and win rates of the candidates in the
+        last round, best first.
+    """
+    if min(fights, rounds, keep) < 1:
+        raise ValueError("fights, rounds and keep must be at least 1")
+    check_ranges(ranges)
+    if not targets:
+        raise ValueError("at least one target is needed")
+    unknown = set(targets) - set(matchup_users())
+    if unknown:
+        raise ValueError(f"unknown matchups: {', '.join(sorted(unknown))}")
+    content, cache = fingerprint(), load_cache(cache_path)
+    candidates = grid(ranges)
+    if not candidates:
+        raise ValueError("every combination has more effective and weak "
+                         "attacks than there are effects")
+    output = open(cache_path, "a", encoding="utf-8") \
+        if cache_path is not None else None
+    try:
+        with Pool(processes) as pool:
+            for number in range(rounds):
+                results = {}
+                tasks = []
+                for params in candidates:
+                    key = cache_key(params, fights, seed, content)
+                    if key in cache:
+                        results[params] = cache[key]
+                    else:
+                        tasks.append((params, fights, seed))
+                for params, rates in pool.imap_unordered(evaluate, tasks):
+                    results[params] = rates
+                    if output is not None:
+                        output.write(json.dumps({
+                            "key": cache_key(params, fights, seed, content),
+                            "params": dict(params), "fights": fights,
+                            "rates": rates}, separators=(",", ":")) + "\n")
+                        output.flush()
+                ranked = sorted((score(results[params], targets), params,
+                                 results[params]) for params in candidates)
+                if number == rounds - 1 or len(ranked) == 1:
+                    break
+                candidates = [params for _, params, _ in
+                              ranked[:ceil(len(ranked) / keep)]]
+                fights *= keep
+    finally:
+        if output is not None:
+            output.close()
+    return ranked
+
+
+def parse_values(text):
+    """
+    Reads the values to try for a parameter.
+
+    param text (str): values separated by commas, or an inclusive range as
+        start:stop or start:stop:step.
+    """
+    if ":" in text:
+        start, stop, step = (list(map(int, text.split(":"))) + [1])[:3]
+        return list(range(start, stop + 1, step))
+    return [int(value) for value in text.split(",")]
+
+
+def at_least_one(text):
+    """Reads a whole number of at least 1, usable as an argparse type."""
+    number = int(text)
+    if number < 1:
+        raise ValueError(f"must be at least 1: {text}")
+    return number
+
+
+def print_report(ranked, targets, top=5):
+    """Prints the best candidates, their win rates and their changes."""
+    current = defaults()
+    print(f"{'score':>8}" + "".join(f"{key[:14]:>16}" for key in targets))
+    print(f"{'target':>8}" + "".join(f"{target:>16.3f}"
+                                     for target in targets.values()))
+    for total, params, rates in ranked[:top]:
+        print(f"{total:>8.4f}" + "".join(f"{rates[key]:>16.3f}"
+                                         for key in targets))
+        changes = [f"{name} = {value} (was {current[name]})"
+                   for name, value in params if value != current[name]]
+        print("        " + ("; ".join(changes) or "no changes"))
+
+
+if __name__ == "__main__":
+    # Only needed to run from the command line, not in worker processes
+    import argparse
+    parser = argparse.ArgumentParser(
+        description="Search for balance constants giving target win rates.")
+    parser.add_argument("--range", action="append", default=[],
+                        metavar="PARAMETER=VALUES",
+                        help="values to try, as 8,10,12 or 8:12 or 8:12:2")
+    parser.add_argument("--target", action="append", default=[],
+                        metavar="MATCHUP=RATE",
+                        help="target win rate of a stage or boss")
+    parser.add_argument("-n", "--fights", type=at_least_one, default=1000,
+                        help="battles per matchup in the first round")
+    parser.add_argument("--rounds", type=at_least_one, default=4)
+    parser.add_argument("--keep", type=at_least_one, default=3,
+                        help="keep one in this many candidates each round")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--cache", default="tuning.jsonl", metavar="FILE",
+                        help="file win rates are cached in")
+    parser.add_argument("--top", type=int, default=5)
+    parser.add_argument("--list", action="store_true",
+                        help="list the parameters and matchups and exit")
+    args = parser.parse_args()
+    if args.list:
+        for name, value in defaults().items():
+            print(f"{name} = {value}")
+        print("matchups:", ", ".join(matchup_users()))
+        raise SystemExit
+    if not args.target:
+        parser.error("at least one --target is needed")
+    try:
+        ranges = {name: parse_values(values) for name, values in
+                  (text.rsplit("=", 1) for text in args.range)}
+        targets = {name: float(rate) for name, rate in
+                   (text.rsplit("=", 1) for text in args.target)}
+        ranked = tune(ranges, targets, args.fights, args.rounds, args.keep,
+                      args.seed, args.processes, args.cache)
+    except ValueError as error:
+        parser.error(str(error))
+    print_report(ranked, targets, args.top)